@@ -9,6 +9,7 @@ from pathlib import Path
 # === Import Core ===
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 from exploration_core import Colors, header, pause, require_input, spinner, print_success, print_error, print_info, resize_terminal, clear_screen
+from pcapio import search_streams, PcapError
 
 # === Config ===
 PCAP_FILE = "traffic.pcap"
@@ -33,68 +34,25 @@ def check_tshark():
         sys.exit(1)
 
 # === Flag Extraction Phase ===
-def extract_flag_candidates(pcap_path):
-    # We pipe shell commands, so we use shell=True safely here with a controlled path
-    # Strategy: Dump all TCP payloads -> Convert Hex to Bin -> Extract Strings
-    cmd = f"tshark -r '{str(pcap_path)}' -Y tcp -T fields -e tcp.payload | xxd -r -p | strings"
+def scan_flag_matches(pcap_path):
+    # One pass: reassemble every TCP stream in-process and regex-search the payloads
+    # (same result as: tshark -Y tcp -e tcp.payload | xxd -r -p | strings | grep)
     try:
-        result = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, text=True)
-    except Exception as e:
+        return search_streams(pcap_path, FLAG_REGEX)
+    except (OSError, PcapError) as e:
         print_error(f"Error running extraction: {e}")
         return []
 
-    found = set()
-    for line in result.stdout.splitlines():
-        match = FLAG_REGEX.search(line)
-        if match:
-            found.add(match.group(0).strip())
-
-    return list(found)
+def extract_flag_candidates(matches):
+    return list({flag.strip() for _, flag in matches})
 
 # === Flag-to-Stream Mapping ===
-def map_flags_to_streams(pcap_path, flags):
-    stream_map = {}
-    
-    # Get Stream ID and Payload for every packet
-    result = subprocess.run(
-        ["tshark", "-r", str(pcap_path), "-Y", "tcp", "-T", "fields", "-e", "tcp.stream", "-e", "tcp.payload"],
-        stdout=subprocess.PIPE,
-        text=True
-    )
-
-    stream_data = {}
-    for line in result.stdout.strip().splitlines():
-        parts = line.split('\t')
-        if len(parts) != 2: continue
-        stream_id, hex_payload = parts
-        try:
-            stream_id = int(stream_id)
-            stream_data.setdefault(stream_id, []).append(hex_payload)
-        except ValueError:
-            continue
-
-    # Reassemble strings in memory to check which stream owns the flag
+def map_flags_to_streams(matches):
+    # Stream IDs are numbered like tshark's tcp.stream, so they work with "follow,tcp"
     spinner("Mapping streams")
-    for stream_id, chunks in stream_data.items():
-        full_data = '\n'.join(chunks)
-        try:
-            # Reverse hex to ascii
-            proc = subprocess.Popen(
-                ["xxd", "-r", "-p"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.DEVNULL,
-                text=True
-            )
-            stdout, _ = proc.communicate(input=full_data)
-            payload = stdout
-        except Exception:
-            continue
-
-        for flag in flags:
-            if flag in payload:
-                stream_map.setdefault(stream_id, set()).add(flag)
-
+    stream_map = {}
+    for stream_id, flag in matches:
+        stream_map.setdefault(stream_id, set()).add(flag.strip())
     return stream_map
 
 # === Display & Interaction ===
@@ -173,7 +131,8 @@ def main():
     print(f"\n{Colors.CYAN}🔎 Scanning entire PCAP for flag-like patterns...{Colors.END}")
     spinner("Analyzing packets")
 
-    flags_found = extract_flag_candidates(pcap_path)
+    matches = scan_flag_matches(pcap_path)
+    flags_found = extract_flag_candidates(matches)
     if not flags_found:
         print_error("No flag-like patterns found.")
         sys.exit(0)
@@ -190,7 +149,7 @@ def main():
 
     # 5. Phase 2: Map flags to streams
     print(f"\n{Colors.CYAN}🔗 Mapping detected flags to their TCP stream IDs...{Colors.END}")
-    stream_map = map_flags_to_streams(pcap_path, flags_found)
+    stream_map = map_flags_to_streams(matches)
     
     if not stream_map:
         print_error("No streams matched the candidate flags.")
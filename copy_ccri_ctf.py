@@ -26,6 +26,7 @@ include = [
     "coach_core.py",       # ✅ Coach Mode Backend
     "worker_node.py",      # ✅ Coach Mode Worker
     "exploration_core.py", # ✅ Exploration Mode Backend
+    "pcapio.py",           # ✅ PCAP reader for the 18_PcapSearch explorer
     "reset_environment.py" # Reset script
 ]
 
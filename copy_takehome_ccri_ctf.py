@@ -24,6 +24,7 @@ include = [
     "coach_core.py",                # Coach Mode Backend
     "worker_node.py",               # Coach Mode Worker
     "exploration_core.py",
+    "pcapio.py",                    # PCAP reader for the 18_PcapSearch explorer
     "reset_environment.py",
 ]
 
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+In-process JPEG EXIF (APP1) writer and reader.
+
+set_tags() merges any number of tags into a JPEG's EXIF block in one pass over the
+image bytes: existing IFD0 / Exif / GPS / Interop entries are kept, the APP1
+segment is rebuilt, and every other segment (including the steghide-carrying scan
+data) is copied through untouched. No exiftool, no *_original backups.
+read_tags() is the matching reader used by the validators.
+
+The IFD1 thumbnail, if any, is dropped when a block is rewritten.
+"""
+
+import struct
+from pathlib import Path
+
+__all__ = ["ExifError", "TAGS", "set_tags", "set_file_tags", "read_tags", "read_file_tags"]
+
+EXIF_HEADER = b"Exif\x00\x00"
+
+# Named tags this module can write: name -> (IFD, tag id, kind)
+TAGS = {
+    "ImageDescription": ("ifd0", 0x010E, "ascii"),
+    "Make": ("ifd0", 0x010F, "ascii"),
+    "Model": ("ifd0", 0x0110, "ascii"),
+    "Software": ("ifd0", 0x0131, "ascii"),
+    "Artist": ("ifd0", 0x013B, "ascii"),
+    "Copyright": ("ifd0", 0x8298, "ascii"),
+    "XPTitle": ("ifd0", 0x9C9B, "xp"),
+    "XPComment": ("ifd0", 0x9C9C, "xp"),
+    "XPAuthor": ("ifd0", 0x9C9D, "xp"),
+    "XPKeywords": ("ifd0", 0x9C9E, "xp"),
+    "XPSubject": ("ifd0", 0x9C9F, "xp"),
+    "UserComment": ("exif", 0x9286, "comment"),
+}
+TAG_NAMES = {(ifd, tag): name for name, (ifd, tag, _) in TAGS.items()}
+
+# Pointer tags that open a sub-IFD, and the name of that IFD
+SUB_IFDS = {0x8769: "exif", 0x8825: "gps", 0xA005: "interop"}
+
+TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8}
+TYPE_BYTE, TYPE_ASCII, TYPE_LONG, TYPE_UNDEFINED = 1, 2, 4, 7
+
+
+class ExifError(ValueError):
+    """Not a JPEG, or a damaged EXIF block."""
+
+
+# === JPEG segments ===
+def _segments(data):
+    """Yield (marker, start, end) for each header segment up to the first SOS."""
+    if data[:2] != b"\xff\xd8":
+        raise ExifError("not a JPEG file")
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            raise ExifError(f"bad JPEG marker at offset {pos}")
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0xDA:  # start of scan: image data follows, stop here
+            return
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        yield marker, pos, pos + 2 + length
+        pos += 2 + length
+
+
+def _find_exif(data):
+    """Return (start, end) of the EXIF APP1 segment, or None."""
+    for marker, start, end in _segments(data):
+        if marker == 0xE1 and data[start + 4:start + 10] == EXIF_HEADER:
+            return start, end
+    return None
+
+
+# === TIFF structure ===
+def _parse_ifd(tiff, offset, order, depth=0):
+    """Return ({tag: (type, count, raw bytes) | ("ifd", entries)}, next IFD offset)."""
+    if depth > 4 or offset + 2 > len(tiff):
+        raise ExifError("IFD offset out of range")
+    count = struct.unpack(order + "H", tiff[offset:offset + 2])[0]
+    entries = {}
+    for i in range(count):
+        base = offset + 2 + 12 * i
+        if base + 12 > len(tiff):
+            raise ExifError("IFD entry out of range")
+        tag, kind, n, value = struct.unpack(order + "HHI4s", tiff[base:base + 12])
+        if tag in SUB_IFDS:
+            child = struct.unpack(order + "I", value)[0]
+            entries[tag] = ("ifd", _parse_ifd(tiff, child, order, depth + 1)[0])
+            continue
+        size = TYPE_SIZES.get(kind, 1) * n
+        if size <= 4:
+            raw = value[:size]
+        else:
+            start = struct.unpack(order + "I", value)[0]
+            raw = tiff[start:start + size]
+            if len(raw) != size:
+                raise ExifError(f"value of tag 0x{tag:04X} runs past the EXIF block")
+        entries[tag] = (kind, n, raw)
+    end = offset + 2 + 12 * count
+    next_offset = struct.unpack(order + "I", tiff[end:end + 4])[0] if end + 4 <= len(tiff) else 0
+    return entries, next_offset
+
+
+def _parse_tiff(tiff):
+    if tiff[:2] == b"II":
+        order = "<"
+    elif tiff[:2] == b"MM":
+        order = ">"
+    else:
+        raise ExifError("bad TIFF byte order")
+    ifd0_offset = struct.unpack(order + "I", tiff[4:8])[0]
+    return order, _parse_ifd(tiff, ifd0_offset, order)[0]
+
+
+def _serialize_ifd(entries, offset, order):
+    """Bytes for one IFD placed at absolute TIFF offset, followed by its values and sub-IFDs."""
+    tags = sorted(entries)
+    header_size = 2 + 12 * len(tags) + 4
+    data_offset = offset + header_size
+    table, data = [], bytearray()
+
+    for tag in tags:
+        entry = entries[tag]
+        if entry[0] == "ifd":
+            table.append((tag, None))
+            continue
+        kind, n, raw = entry
+        if len(raw) <= 4:
+            table.append((tag, struct.pack(order + "HHI", tag, kind, n) + raw.ljust(4, b"\x00")))
+        else:
+            if len(data) % 2:
+                data.append(0)
+            table.append((tag, struct.pack(order + "HHII", tag, kind, n, data_offset + len(data))))
+            data += raw
+
+    children = bytearray()
+    packed = []
+    for tag, record in table:
+        if record is None:
+            if (len(data) + len(children)) % 2:
+                children.append(0)
+            child_offset = data_offset + len(data) + len(children)
+            children += _serialize_ifd(entries[tag][1], child_offset, order)
+            record = struct.pack(order + "HHII", tag, TYPE_LONG, 1, child_offset)
+        packed.append(record)
+
+    return struct.pack(order + "H", len(tags)) + b"".join(packed) + struct.pack(order + "I", 0) + bytes(data) + bytes(children)
+
+
+def _build_tiff(order, ifd0):
+    head = (b"II" if order == "<" else b"MM") + struct.pack(order + "HI", 42, 8)
+    return head + _serialize_ifd(ifd0, 8, order)
+
+
+# === Value encoding ===
+def _encode(kind, value, order):
+    if kind == "ascii":
+        raw = value.encode("utf-8") + b"\x00"
+        return TYPE_ASCII, len(raw), raw
+    if kind == "xp":
+        raw = value.encode("utf-16-le") + b"\x00\x00"
+        return TYPE_BYTE, len(raw), raw
+    # UserComment: 8-byte character code, then the text (no terminator)
+    if value.isascii():
+        raw = b"ASCII\x00\x00\x00" + value.encode("ascii")
+    else:
+        raw = b"UNICODE\x00" + value.encode("utf-16-le" if order == "<" else "utf-16-be")
+    return TYPE_UNDEFINED, len(raw), raw
+
+
+def _decode(ifd_name, tag, kind, n, raw, order):
+    name = TAG_NAMES.get((ifd_name, tag))
+    spec = TAGS[name][2] if name else None
+    if spec == "xp":
+        return raw.decode("utf-16-le", errors="replace").rstrip("\x00")
+    if spec == "comment":
+        code, text = raw[:8], raw[8:]
+        if code.startswith(b"UNICODE"):
+            return text.decode("utf-16-le" if order == "<" else "utf-16-be", errors="replace").rstrip("\x00")
+        return text.decode("utf-8", errors="replace").rstrip("\x00 ")
+    if kind == TYPE_ASCII:
+        return raw.decode("utf-8", errors="replace").rstrip("\x00")
+    fmt = {3: "H", 4: "I", 8: "h", 9: "i"}.get(kind)
+    if fmt:
+        values = struct.unpack(order + fmt * n, raw)
+        return values[0] if n == 1 else list(values)
+    if kind in (5, 10):
+        values = struct.unpack(order + ("II" if kind == 5 else "ii") * n, raw)
+        pairs = list(zip(values[0::2], values[1::2]))
+        return pairs[0] if n == 1 else pairs
+    return bytes(raw)
+
+
+# === Public API ===
+def set_tags(data: bytes, tags: dict) -> bytes:
+    """
+    Return JPEG bytes with the named TAGS set (e.g. {"Artist": "...", "UserComment": "..."}).
+    Existing EXIF entries are kept; a new block is big-endian like exiftool's.
+    """
+    unknown = set(tags) - set(TAGS)
+    if unknown:
+        raise ExifError(f"unsupported tag(s): {', '.join(sorted(unknown))}")
+
+    location = _find_exif(data)
+    if location:
+        start, end = location
+        order, ifd0 = _parse_tiff(data[start + 10:end])
+    else:
+        order, ifd0 = ">", {}
+        start = end = None
+
+    for name, value in tags.items():
+        ifd_name, tag, kind = TAGS[name]
+        target = ifd0
+        if ifd_name == "exif":
+            if 0x8769 not in ifd0:
+                ifd0[0x8769] = ("ifd", {0x9000: (TYPE_UNDEFINED, 4, b"0232")})  # ExifVersion
+            target = ifd0[0x8769][1]
+        target[tag] = _encode(kind, value, order)
+
+    payload = EXIF_HEADER + _build_tiff(order, ifd0)
+    if len(payload) + 2 > 0xFFFF:
+        raise ExifError("EXIF block is larger than one APP1 segment")
+    segment = b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+    if start is None:
+        # New block goes right after SOI/APP0 (JFIF), where exiftool puts it
+        start = end = 2
+        for marker, seg_start, seg_end in _segments(data):
+            if marker != 0xE0:
+                break
+            start = end = seg_end
+    return data[:start] + segment + data[end:]
+
+
+def set_file_tags(path, tags: dict, source: bytes = None) -> Path:
+    """Write set_tags(source or the file's bytes, tags) to path in a single write."""
+    path = Path(path)
+    path.write_bytes(set_tags(source if source is not None else path.read_bytes(), tags))
+    return path
+
+
+def read_tags(data: bytes) -> dict:
+    """
+    Decode every EXIF entry of a JPEG: {name: value}, where name is the TAGS name
+    or "<ifd>:0xNNNN" for entries this module does not name. {} if there is no EXIF.
+    """
+    location = _find_exif(data)
+    if not location:
+        return {}
+    order, ifd0 = _parse_tiff(data[location[0] + 10:location[1]])
+
+    result = {}
+
+    def walk(ifd_name, entries):
+        for tag, entry in sorted(entries.items()):
+            if entry[0] == "ifd":
+                walk(SUB_IFDS[tag], entry[1])
+                continue
+            name = TAG_NAMES.get((ifd_name, tag), f"{ifd_name}:0x{tag:04X}")
+            result[name] = _decode(ifd_name, tag, *entry, order)
+
+    walk("ifd0", ifd0)
+    return result
+
+
+def read_file_tags(path) -> dict:
+    """read_tags() for a file on disk."""
+    return read_tags(Path(path).read_bytes())
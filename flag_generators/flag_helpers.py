@@ -1,31 +1,51 @@
 import random
 import string
 import re
+import shutil
+import threading
+from pathlib import Path
 
 class FlagUtils:
     """
     Utility class for flag generation and validation.
     """
+    # Seeded runs stamp artifacts (zip entries, pcap records, log lines) relative to this
+    SEEDED_EPOCH = 1735689600  # 2025-01-01 00:00:00 UTC
+
+    @classmethod
+    def artifact_time(cls, seed=None):
+        """
+        Timestamp for generated artifacts: None (use the wall clock) for unseeded runs,
+        else a fixed point within a year of SEEDED_EPOCH derived from the seed alone,
+        so it does not consume the generator's RNG stream.
+        """
+        if seed is None:
+            return None
+        return float(cls.SEEDED_EPOCH + random.Random(f"artifact-time:{seed}").randrange(365 * 86400))
+
     @classmethod
-    def generate_real_flag(cls) -> str:
+    def generate_real_flag(cls, rng=None) -> str:
         """
         Generate a valid CCRI flag: CCRI-ABCD-1234
+        Pass a generator's random.Random as rng to draw from its own stream.
         """
-        letters = ''.join(random.choices(string.ascii_uppercase, k=4))
-        digits = ''.join(random.choices(string.digits, k=4))
+        rng = rng or random
+        letters = ''.join(rng.choices(string.ascii_uppercase, k=4))
+        digits = ''.join(rng.choices(string.digits, k=4))
         return f"CCRI-{letters}-{digits}"
 
     @classmethod
-    def generate_fake_flag(cls) -> str:
+    def generate_fake_flag(cls, rng=None) -> str:
         """
         Generate an invalid flag in one of two strict fake formats.
         **NOTE: Fake flags must NOT begin with CCRI-**
         """
+        rng = rng or random
         while True:
-            letters1 = ''.join(random.choices(string.ascii_uppercase, k=4))
-            letters2 = ''.join(random.choices(string.ascii_uppercase, k=4))
-            digits = ''.join(random.choices(string.digits, k=4))
-            format_choice = random.choice([1, 2])
+            letters1 = ''.join(rng.choices(string.ascii_uppercase, k=4))
+            letters2 = ''.join(rng.choices(string.ascii_uppercase, k=4))
+            digits = ''.join(rng.choices(string.digits, k=4))
+            format_choice = rng.choice([1, 2])
 
             if format_choice == 1:
                 fake = f"{letters1}-{letters2}-{digits}"  # AAAA-BBBB-1111
@@ -41,4 +61,52 @@ class FlagUtils:
         """
         Validate flag format: CCRI-XXXX-1234
         """
-        return bool(re.match(r"^CCRI-[A-Z]{4}-\d{4}$", flag))
\ No newline at end of file
+        return bool(re.match(r"^CCRI-[A-Z]{4}-\d{4}$", flag))
+
+
+class SharedInputs:
+    """
+    Process-wide cache of read-only generator inputs (template images, wordlists)
+    and external tool lookups. generate_all_flags.py preloads it once before starting
+    mode/worker processes, so every forked child reuses the same copies.
+    """
+    TEMPLATE_FILES = ("wordlist.txt", "squirrel.jpg", "capybara.jpg")
+    TOOLS = ("steghide", "gcc")
+
+    _lock = threading.Lock()
+    _files = {}
+    _tools = {}
+
+    @classmethod
+    def read_bytes(cls, path) -> bytes:
+        """Return the contents of a template file, reading it from disk only once."""
+        key = str(Path(path).resolve())
+        with cls._lock:
+            data = cls._files.get(key)
+        if data is None:
+            data = Path(path).read_bytes()
+            with cls._lock:
+                cls._files[key] = data
+        return data
+
+    @classmethod
+    def read_lines(cls, path) -> list:
+        """Return a fresh list of lines from a cached text template (callers may shuffle it)."""
+        return cls.read_bytes(path).decode("utf-8").splitlines()
+
+    @classmethod
+    def which(cls, tool: str):
+        """Cached shutil.which()."""
+        with cls._lock:
+            if tool not in cls._tools:
+                cls._tools[tool] = shutil.which(tool)
+            return cls._tools[tool]
+
+    @classmethod
+    def preload(cls, generator_dir) -> dict:
+        """Load every template and probe every tool once; returns {tool: available}."""
+        for name in cls.TEMPLATE_FILES:
+            path = Path(generator_dir) / name
+            if path.exists():
+                cls.read_bytes(path)
+        return {tool: cls.which(tool) is not None for tool in cls.TOOLS}
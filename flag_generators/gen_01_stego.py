@@ -4,7 +4,8 @@ from pathlib import Path
 import subprocess
 import random
 import sys
-from flag_generators.flag_helpers import FlagUtils
+from flag_generators.flag_helpers import FlagUtils, SharedInputs
+from exifjpeg import set_file_tags, ExifError
 
 
 class StegoFlagGenerator:
@@ -14,11 +15,12 @@ class StegoFlagGenerator:
     Behavior adapts based on 'guided' or 'solo' mode.
     """
 
-    def __init__(self, project_root: Path = None, mode: str = "guided"):
+    def __init__(self, project_root: Path = None, mode: str = "guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.generator_dir = self.project_root / "flag_generators"
         self.source_image = self.generator_dir / "squirrel.jpg"
         self.mode = mode.lower()
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
 
         if self.mode not in ["guided", "solo"]:
             print(f"❌ ERROR: Invalid mode '{self.mode}'. Expected 'guided' or 'solo'.", file=sys.stderr)
@@ -50,7 +52,7 @@ class StegoFlagGenerator:
 
     def write_password_metadata(self, image_path: Path, passphrase: str):
         """
-        Add a mode-specific hint into the JPEG metadata using exiftool.
+        Add a mode-specific hint into the JPEG metadata (EXIF UserComment), in-process.
 
         - guided: very explicit hint with the word 'password'
         - solo: CryptKeeper-themed hint that still contains the actual passphrase
@@ -65,20 +67,10 @@ class StegoFlagGenerator:
             )
 
         try:
-            subprocess.run(
-                [
-                    "exiftool",
-                    "-overwrite_original",
-                    f"-UserComment={comment}",
-                    str(image_path),
-                ],
-                check=True,
-            )
+            set_file_tags(image_path, {"UserComment": comment})
             print("📝 Embedded password hint into JPEG metadata (UserComment).")
-        except FileNotFoundError:
-            print("⚠️ exiftool not found; skipping metadata hint.", file=sys.stderr)
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️ exiftool failed: {e}", file=sys.stderr)
+        except (ExifError, OSError) as e:
+            print(f"⚠️ Could not write metadata hint: {e}", file=sys.stderr)
 
     def embed_flags(self, challenge_folder: Path, real_flag: str, fake_flags: list, passphrase: str):
         dest_image = challenge_folder / "squirrel.jpg"
@@ -90,12 +82,12 @@ class StegoFlagGenerator:
                 raise FileNotFoundError(f"❌ Source image not found: {self.source_image.relative_to(self.project_root)}")
 
             # Copy clean source image
-            dest_image.write_bytes(self.source_image.read_bytes())
+            dest_image.write_bytes(SharedInputs.read_bytes(self.source_image))
             print(f"📂 Copied {self.source_image.name} to {challenge_folder.relative_to(self.project_root)}")
 
             # Build payload of real + fake flags
             all_flags = fake_flags + [real_flag]
-            random.shuffle(all_flags)
+            self.rng.shuffle(all_flags)
             hidden_file.write_text("\n".join(all_flags))
             print(f"📝 Hidden flags saved to temporary file: {hidden_file.name}")
 
@@ -128,8 +120,8 @@ class StegoFlagGenerator:
                     print(f"⚠️ Failed to delete {hidden_file.name}: {e}")
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
 
         self.last_fake_flags = fake_flags
         # 🔑 Different passwords per mode
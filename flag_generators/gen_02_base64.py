@@ -14,9 +14,10 @@ class Base64FlagGenerator:
     Supports Guided and Solo modes. Unlock metadata is exported via self.metadata.
     """
 
-    def __init__(self, project_root: Path = None, mode: str = "guided"):
+    def __init__(self, project_root: Path = None, mode: str = "guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode.lower()
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         if self.mode not in ["guided", "solo"]:
             print(f"❌ ERROR: Invalid mode '{self.mode}'. Expected 'guided' or 'solo'.", file=sys.stderr)
             sys.exit(1)
@@ -52,7 +53,7 @@ class Base64FlagGenerator:
                 )
 
             all_flags = fake_flags + [real_flag]
-            random.shuffle(all_flags)
+            self.rng.shuffle(all_flags)
 
             message = (
                 "Transmission Start\n"
@@ -88,11 +89,11 @@ class Base64FlagGenerator:
             sys.exit(1)
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.embed_flags(challenge_folder, real_flag, fake_flags)
         print("   🎭 Fake flags:", ", ".join(fake_flags))
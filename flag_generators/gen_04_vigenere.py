@@ -16,9 +16,10 @@ class VigenereFlagGenerator:
     DEFAULT_KEY = "login"
     SOLO_KEY = "providence"
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.vigenere_key = (
             self.DEFAULT_KEY.lower() if self.mode == "guided" else self.SOLO_KEY.lower()
         )
@@ -72,7 +73,7 @@ class VigenereFlagGenerator:
                 )
 
             all_flags = fake_flags + [real_flag]
-            random.shuffle(all_flags)
+            self.rng.shuffle(all_flags)
 
             # 🔥 Updated only the lore text inside the message
             message = (
@@ -109,11 +110,11 @@ class VigenereFlagGenerator:
             sys.exit(1)
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.embed_flags(challenge_folder, real_flag, fake_flags)
         print('   🎭 Fake flags:', ', '.join(fake_flags))
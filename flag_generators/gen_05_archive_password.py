@@ -2,10 +2,11 @@
 
 from pathlib import Path
 import random
-import subprocess
 import base64
 import sys
-from flag_generators.flag_helpers import FlagUtils
+import time
+from flag_generators.flag_helpers import FlagUtils, SharedInputs
+from zipcrypto import write_encrypted_zip
 
 
 class ArchivePasswordFlagGenerator:
@@ -15,9 +16,11 @@ class ArchivePasswordFlagGenerator:
     Metadata is collected for master script to handle validation JSON updates.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
+        self.artifact_time = FlagUtils.artifact_time(seed)  # None: wall clock
         self.wordlist_template = self.project_root / "flag_generators" / "wordlist.txt"
         self.metadata = {}  # Will be populated for master script
 
@@ -51,9 +54,9 @@ class ArchivePasswordFlagGenerator:
         Select a password for the ZIP file depending on mode.
         """
         if self.mode == "guided":
-            return random.choice(all_passwords[: len(all_passwords) // 2])
+            return self.rng.choice(all_passwords[: len(all_passwords) // 2])
         else:
-            return random.choice(all_passwords[len(all_passwords) // 2 :])
+            return self.rng.choice(all_passwords[len(all_passwords) // 2 :])
 
     def embed_flags(self, challenge_folder: Path, real_flag: str, fake_flags: list):
         """
@@ -73,7 +76,7 @@ class ArchivePasswordFlagGenerator:
                 )
 
             # Load master wordlist
-            all_passwords = self.wordlist_template.read_text().splitlines()
+            all_passwords = SharedInputs.read_lines(self.wordlist_template)
             if not all_passwords:
                 raise ValueError("❌ Wordlist template is empty!")
 
@@ -86,7 +89,7 @@ class ArchivePasswordFlagGenerator:
 
             # Create message_encoded.txt (base64-encoded flags)
             all_flags = fake_flags + [real_flag]
-            random.shuffle(all_flags)
+            self.rng.shuffle(all_flags)
             message = (
                 "Mission Debrief:\n\n"
                 "Encrypted archive recovered from a CryptKeepers staging machine.\n"
@@ -97,22 +100,12 @@ class ArchivePasswordFlagGenerator:
             )
             message_encoded = base64.b64encode(message.encode("utf-8")).decode("utf-8")
 
-            encoded_file = challenge_folder / "message_encoded.txt"
-            encoded_file.write_text(message_encoded)
-
-            # Create password-protected ZIP (flat)
+            # Create password-protected ZIP (flat, built in memory; no plaintext file on disk)
             zip_file = challenge_folder / "secret.zip"
-            result = subprocess.run(
-                ["zip", "-j", "-P", correct_password, str(zip_file), str(encoded_file.name)],
-                cwd=challenge_folder,
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"❌ Zip failed: {result.stderr.strip()}")
+            date_time = time.gmtime(self.artifact_time) if self.artifact_time is not None else None
+            write_encrypted_zip(zip_file, {"message_encoded.txt": message_encoded}, correct_password,
+                                rng=self.rng, date_time=date_time)
 
-            # Clean up plaintext file
-            encoded_file.unlink()
             print(
                 f"🗝️ {wordlist_file.relative_to(self.project_root)} and 🔒 {zip_file.relative_to(self.project_root)} "
                 f"created with correct password: {correct_password}"
@@ -137,11 +130,11 @@ class ArchivePasswordFlagGenerator:
         Generate and embed real/fake flags for the Archive Password challenge.
         Returns plaintext real flag.
         """
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.embed_flags(challenge_folder, real_flag, fake_flags)
         print("   🎭 Fake flags:", ", ".join(fake_flags))
@@ -2,11 +2,12 @@
 
 from pathlib import Path
 import random
-import subprocess
 import hashlib
 import base64
 import sys
-from flag_generators.flag_helpers import FlagUtils
+import time
+from flag_generators.flag_helpers import FlagUtils, SharedInputs
+from zipcrypto import write_encrypted_zip
 
 
 class HashcatFlagGenerator:
@@ -16,9 +17,11 @@ class HashcatFlagGenerator:
     Metadata is collected for master script to handle validation JSON updates.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
+        self.artifact_time = FlagUtils.artifact_time(seed)  # None: wall clock
         self.metadata = {}
 
     @staticmethod
@@ -66,7 +69,7 @@ class HashcatFlagGenerator:
 
             # Combine and shuffle flags
             all_flags = fake_flags + [real_flag]
-            random.shuffle(all_flags)
+            self.rng.shuffle(all_flags)
 
             # Split flags into 3 segments
             parts = []
@@ -80,38 +83,29 @@ class HashcatFlagGenerator:
             part2 = [p[1] for p in parts]
             part3 = [p[2] for p in parts]
 
-            # Write base64-encoded segment files
-            encoded_files = []
-            for idx, segment in enumerate([part1, part2, part3], start=1):
-                encoded_text = "\n".join(segment)
-                encoded_b64 = self.base64_encode(encoded_text)
-                file_path = challenge_folder / f"encoded_segments{idx}.txt"
-                file_path.write_text(encoded_b64)
-                encoded_files.append(file_path)
+            # Base64-encode each segment in memory: (member name, contents)
+            encoded_segments = [
+                (f"encoded_segments{idx}.txt", self.base64_encode("\n".join(segment)))
+                for idx, segment in enumerate([part1, part2, part3], start=1)
+            ]
 
             # Choose passwords
             wordlist_template = self.project_root / "flag_generators" / "wordlist.txt"
-            all_passwords = wordlist_template.read_text().splitlines()
-            chosen_passwords = random.sample(all_passwords, 3)
+            all_passwords = SharedInputs.read_lines(wordlist_template)
+            chosen_passwords = self.rng.sample(all_passwords, 3)
 
             # Create hashes.txt and zipped segments
             hashes_txt = challenge_folder / "hashes.txt"
             hash_password_zip_map = {}
             hash_lines = []
+            date_time = time.gmtime(self.artifact_time) if self.artifact_time is not None else None
 
-            for idx, (password, file) in enumerate(zip(chosen_passwords, encoded_files), start=1):
+            for idx, (password, member) in enumerate(zip(chosen_passwords, encoded_segments), start=1):
                 hash_val = self.md5_hash(password)
                 hash_lines.append(hash_val)
 
                 zip_file = segments_dir / f"part{idx}.zip"
-                result = subprocess.run(
-                    ["zip", "-j", "-P", password, str(zip_file), str(file)],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode != 0:
-                    raise RuntimeError(f"❌ Zip failed for {file.name}: {result.stderr.strip()}")
-                file.unlink()
+                write_encrypted_zip(zip_file, [member], password, rng=self.rng, date_time=date_time)
 
                 hash_password_zip_map[hash_val] = {
                     "password": password,
@@ -149,11 +143,11 @@ class HashcatFlagGenerator:
             sys.exit(1)
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.embed_flags(challenge_folder, real_flag, fake_flags)
         print("   🎭 Fake flags:", ", ".join(fake_flags))
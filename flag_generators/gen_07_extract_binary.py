@@ -1,22 +1,28 @@
 #!/usr/bin/env python3
 
 from pathlib import Path
+import hashlib
 import random
 import subprocess
 import sys
+import tempfile
 from flag_generators.flag_helpers import FlagUtils
 
 
 class ExtractBinaryFlagGenerator:
     """
     Generator for the Extract Binary challenge.
-    Embeds real and fake flags into a compiled C binary.
+    Embeds real and fake flags into a C binary. By default a slot template is compiled
+    once (flag_generators/hidden_flag_template_<hash>.elf) and each run patches the
+    flags and junk into it; use_template=False compiles fresh source with gcc instead.
     Metadata is collected for the master script to handle unlocks.json.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None, use_template=True):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
+        self.use_template = use_template
         self.metadata = {}
 
     @staticmethod
@@ -40,8 +46,17 @@ class ExtractBinaryFlagGenerator:
                 except Exception as e:
                     print(f"⚠️ Could not delete {target.name}: {e}", file=sys.stderr)
 
-    def generate_c_source(self, real_flag: str, fake_flags: list) -> str:
-        """Generate the C source code embedding all flags and junk data."""
+    # === Source layout (shared by the compiled path and the template) ===
+    JUNK_SIZES = {"junk1": 300, "junk2": 500, "junk3": 400, "junk4": 600, "junk5": 350}
+    FLAG_LEN = 14  # CCRI-ABCD-1234 and both fake formats
+
+    # 14-byte placeholders; each one starts the array it lives in, so it doubles as the slot marker
+    FLAG_SLOTS = ["@@SLOT_FLAG1@@", "@@SLOT_FLAG2@@", "@@SLOT_FLAG3@@", "@@SLOT_FLAG4@@", "@@SLOT_FLAG5@@"]
+    JUNK_SLOTS = {name: f"@@SLOT_{name.upper()}@@" for name in JUNK_SIZES}
+
+    _template_cache = {}  # template path -> (bytes, {slot: offset})
+
+    def junk_texts(self) -> list:
         junk_strings = [
             "ABCD1234XYZ!@#%$^&*()_+=?><~",
             "longgarbage....data...not...readable....random",
@@ -51,27 +66,31 @@ class ExtractBinaryFlagGenerator:
 
         if self.mode == "solo":
             junk_strings = [s[::-1] + "_solo" for s in junk_strings]
+        return junk_strings
 
-        binary_junk = ", ".join(str(random.randint(0, 255)) for _ in range(600))
-
+    def generate_c_source(self, flags: list, junk_strings: list, binary_junk: str) -> str:
+        """
+        C source embedding five flags (slot order: fake, REAL, fake, fake, fake) and junk data.
+        binary_junk is the junk4 initializer: a {...} byte list or a string literal.
+        """
         # Note: __attribute__((used)) is optional but helps if you enable section GC/LTO.
         return f"""
 #include <stdio.h>
 #include <string.h>
 
-__attribute__((used)) char flag1[] = "{fake_flags[0]}";
+__attribute__((used)) char flag1[] = "{flags[0]}";
 char junk1[300] = "{junk_strings[0]}";
 
-__attribute__((used)) char flag2[] = "{real_flag}";
+__attribute__((used)) char flag2[] = "{flags[1]}";
 char junk2[500] = "{junk_strings[1]}";
 
-__attribute__((used)) char flag3[] = "{fake_flags[1]}";
+__attribute__((used)) char flag3[] = "{flags[2]}";
 char junk3[400] = "{junk_strings[2]}";
 
-__attribute__((used)) char flag4[] = "{fake_flags[2]}";
-char junk4[600] = {{{binary_junk}}};
+__attribute__((used)) char flag4[] = "{flags[3]}";
+char junk4[600] = {binary_junk};
 
-__attribute__((used)) char flag5[] = "{fake_flags[3]}";
+__attribute__((used)) char flag5[] = "{flags[4]}";
 char junk5[350] = "{junk_strings[3]}";
 
 void keep_strings_alive() {{
@@ -87,33 +106,103 @@ int main() {{
 }}
 """
 
+    # === Template ELF ===
+    def template_source(self) -> str:
+        text_slots = [self.JUNK_SLOTS[name] for name in ("junk1", "junk2", "junk3", "junk5")]
+        return self.generate_c_source(self.FLAG_SLOTS, text_slots, f'"{self.JUNK_SLOTS["junk4"]}"')
+
+    def template_path(self) -> Path:
+        """Template name carries a hash of its source, so editing the layout forces a rebuild."""
+        digest = hashlib.sha256(self.template_source().encode("utf-8")).hexdigest()[:12]
+        return self.project_root / "flag_generators" / f"hidden_flag_template_{digest}.elf"
+
+    def build_template(self, template: Path):
+        """Compile the slot template once (the only gcc call this generator ever needs)."""
+        with tempfile.TemporaryDirectory(prefix="ccri_gen07_") as tmp:
+            c_file = Path(tmp) / "hidden_flag.c"  # same file symbol as the compiled path
+            c_file.write_text(self.template_source())
+            result = subprocess.run(["gcc", str(c_file), "-o", str(template)], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"❌ GCC failed building the template:\n{result.stderr.strip()}")
+        print(f"🔨 Built binary template: {template.relative_to(self.project_root)}")
+
+    def load_template(self):
+        """Return (template_bytes, {slot_marker: offset}), building and indexing it on first use."""
+        template = self.template_path()
+        cached = self._template_cache.get(template)
+        if cached:
+            return cached
+
+        if not template.exists():
+            self.build_template(template)
+        data = template.read_bytes()
+
+        offsets = {}
+        for marker in self.FLAG_SLOTS + list(self.JUNK_SLOTS.values()):
+            needle = marker.encode("ascii")
+            offset = data.find(needle)
+            if offset < 0 or data.find(needle, offset + 1) >= 0:
+                raise RuntimeError(f"❌ Template slot {marker} missing or not unique in {template.name}")
+            offsets[marker] = offset
+
+        self._template_cache[template] = (data, offsets)
+        return data, offsets
+
+    def patch_template(self, flags: list, junk_strings: list, junk4: bytes) -> bytes:
+        """Copy the template and overwrite every slot in place (same bytes gcc would lay out)."""
+        data, offsets = self.load_template()
+        binary = bytearray(data)
+
+        for marker, flag in zip(self.FLAG_SLOTS, flags):
+            if len(flag) != self.FLAG_LEN:
+                raise ValueError(f"❌ Flag {flag!r} does not fit a {self.FLAG_LEN}-byte slot")
+            start = offsets[marker]
+            binary[start:start + self.FLAG_LEN] = flag.encode("ascii")
+
+        texts = dict(zip(("junk1", "junk2", "junk3", "junk5"), junk_strings))
+        for name, size in self.JUNK_SIZES.items():
+            payload = junk4 if name == "junk4" else texts[name].encode("utf-8")
+            start = offsets[self.JUNK_SLOTS[name]]
+            binary[start:start + size] = payload.ljust(size, b"\0")
+
+        return bytes(binary)
+
     def embed_flags(self, challenge_folder: Path, real_flag: str, fake_flags: list):
-        """Compile the challenge binary with embedded flags and collect metadata."""
+        """Build the challenge binary with embedded flags and collect metadata."""
         self.safe_cleanup(challenge_folder)
 
         try:
-            c_file = challenge_folder / "hidden_flag.c"
             binary_file = challenge_folder / "hidden_flag"
-
-            # Write source
-            c_code = self.generate_c_source(real_flag, fake_flags)
-            c_file.write_text(c_code)
-            print(f"📄 C source created: {c_file.relative_to(self.project_root)}")
-
-            # Compile
-            result = subprocess.run(["gcc", str(c_file), "-o", str(binary_file)],
-                                    capture_output=True, text=True)
-            if result.returncode != 0:
-                raise RuntimeError(f"❌ GCC failed:\n{result.stderr.strip()}")
-
-            print(f"🔨 Compiled binary: {binary_file.relative_to(self.project_root)}")
-
-            # Optional cleanup
-            try:
-                c_file.unlink()
-                print(f"🧹 Cleaned up source file: {c_file.relative_to(self.project_root)}")
-            except Exception as cleanup_err:
-                print(f"⚠️ Warning: Could not remove {c_file.name}: {cleanup_err}")
+            flags = [fake_flags[0], real_flag, fake_flags[1], fake_flags[2], fake_flags[3]]
+            junk_strings = self.junk_texts()
+            junk4 = bytes(self.rng.randint(0, 255) for _ in range(self.JUNK_SIZES["junk4"]))
+
+            if self.use_template:
+                binary_file.write_bytes(self.patch_template(flags, junk_strings, junk4))
+                binary_file.chmod(0o755)
+                print(f"🧩 Patched binary from template: {binary_file.relative_to(self.project_root)}")
+            else:
+                c_file = challenge_folder / "hidden_flag.c"
+
+                # Write source
+                c_code = self.generate_c_source(flags, junk_strings, "{" + ", ".join(str(b) for b in junk4) + "}")
+                c_file.write_text(c_code)
+                print(f"📄 C source created: {c_file.relative_to(self.project_root)}")
+
+                # Compile
+                result = subprocess.run(["gcc", str(c_file), "-o", str(binary_file)],
+                                        capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise RuntimeError(f"❌ GCC failed:\n{result.stderr.strip()}")
+
+                print(f"🔨 Compiled binary: {binary_file.relative_to(self.project_root)}")
+
+                # Optional cleanup
+                try:
+                    c_file.unlink()
+                    print(f"🧹 Cleaned up source file: {c_file.relative_to(self.project_root)}")
+                except Exception as cleanup_err:
+                    print(f"⚠️ Warning: Could not remove {c_file.name}: {cleanup_err}")
 
             # Save metadata
             self.metadata = {
@@ -129,13 +218,13 @@ int main() {{
 
     def generate_flag(self, challenge_folder: Path) -> str:
         """Generate and embed flag. Return real flag."""
-        real_flag = FlagUtils.generate_real_flag()
+        real_flag = FlagUtils.generate_real_flag(self.rng)
 
         # Ensure EXACTLY 4 unique fakes
         fake_set = set()
         while len(fake_set) < 4:
-            fake_set.add(FlagUtils.generate_fake_flag())
-        fake_flags = list(fake_set)
+            fake_set.add(FlagUtils.generate_fake_flag(self.rng))
+        fake_flags = sorted(fake_set)  # sets iterate in hash order; sort for seeded runs
 
         # real != fakes by construction (fakes never start with 'CCRI')
         self.embed_flags(challenge_folder, real_flag, fake_flags)
@@ -14,9 +14,11 @@ class FakeAuthLogFlagGenerator:
     Collects metadata for the master script to handle unlocks.json.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
+        self.artifact_time = FlagUtils.artifact_time(seed)  # None: wall clock
         self.metadata = {}
 
     @staticmethod
@@ -57,30 +59,33 @@ class FakeAuthLogFlagGenerator:
             auth_methods = ["password", "publickey"]
 
             all_flags = fake_flags + [real_flag]
-            random.shuffle(all_flags)
+            self.rng.shuffle(all_flags)
 
             line_count = 400 if self.mode == "solo" else 250
             fail_ratio = 0.6 if self.mode == "solo" else 0.2
 
-            base_time = datetime.datetime.now()
-            flag_insertion_indices = sorted(random.sample(range(50, line_count - 20), len(all_flags)))
+            if self.artifact_time is None:
+                base_time = datetime.datetime.now()
+            else:
+                base_time = datetime.datetime.fromtimestamp(self.artifact_time, datetime.timezone.utc)
+            flag_insertion_indices = sorted(self.rng.sample(range(50, line_count - 20), len(all_flags)))
             flag_index = 0
             lines = []
 
             for i in range(line_count):
-                timestamp = (base_time - datetime.timedelta(seconds=random.randint(0, 7200))).strftime("%b %d %H:%M:%S")
-                user = random.choice(usernames)
-                ip = random.choice(ip_addresses)
-                method = random.choice(auth_methods)
-                result = "Accepted" if random.random() > fail_ratio else "Failed"
+                timestamp = (base_time - datetime.timedelta(seconds=self.rng.randint(0, 7200))).strftime("%b %d %H:%M:%S")
+                user = self.rng.choice(usernames)
+                ip = self.rng.choice(ip_addresses)
+                method = self.rng.choice(auth_methods)
+                result = "Accepted" if self.rng.random() > fail_ratio else "Failed"
 
                 if flag_index < len(flag_insertion_indices) and i == flag_insertion_indices[flag_index]:
                     pid = all_flags[flag_index]
                     flag_index += 1
                 else:
-                    pid = str(random.randint(1000, 99999))
+                    pid = str(self.rng.randint(1000, 99999))
 
-                line = f"{timestamp} myhost sshd[{pid}]: {result} {method} for {user} from {ip} port {random.randint(1000, 65000)} ssh2"
+                line = f"{timestamp} myhost sshd[{pid}]: {result} {method} for {user} from {ip} port {self.rng.randint(1000, 65000)} ssh2"
                 lines.append(line)
 
             log_path.write_text("\n".join(lines))
@@ -104,11 +109,11 @@ class FakeAuthLogFlagGenerator:
 
     def generate_flag(self, challenge_folder: Path) -> str:
         """Generate real and fake flags, embed them, and return the real one."""
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.embed_flags(challenge_folder, real_flag, fake_flags)
         print('   🎭 Fake flags:', ', '.join(fake_flags))
@@ -15,9 +15,10 @@ class FixScriptFlagGenerator:
 
     ALL_OPERATORS = ["+", "-", "*", "/"]
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.metadata = {}
 
     @staticmethod
@@ -45,24 +46,24 @@ class FixScriptFlagGenerator:
         attempt = 0
         while True:
             attempt += 1
-            correct_op = random.choice(self.ALL_OPERATORS)
-            target_value = random.randint(1000, 9999)
+            correct_op = self.rng.choice(self.ALL_OPERATORS)
+            target_value = self.rng.randint(1000, 9999)
 
             try:
                 if correct_op == "+":
-                    part1 = random.randint(100, target_value - 100)
+                    part1 = self.rng.randint(100, target_value - 100)
                     part2 = target_value - part1
                 elif correct_op == "-":
-                    part1 = random.randint(target_value + 100, target_value + 1000)
+                    part1 = self.rng.randint(target_value + 100, target_value + 1000)
                     part2 = part1 - target_value
                 elif correct_op == "*":
                     factors = [i for i in range(2, 50) if target_value % i == 0]
                     if not factors:
                         continue
-                    part2 = random.choice(factors)
+                    part2 = self.rng.choice(factors)
                     part1 = target_value // part2
                 elif correct_op == "/":
-                    part2 = random.randint(2, 25)
+                    part2 = self.rng.randint(2, 25)
                     part1 = target_value * part2
                 else:
                     continue
@@ -96,7 +97,7 @@ class FixScriptFlagGenerator:
 
         try:
             wrong_ops = [op for op in self.ALL_OPERATORS if op != correct_op]
-            wrong_op = random.choice(wrong_ops)
+            wrong_op = self.rng.choice(wrong_ops)
 
             broken_script = f"""#!/usr/bin/env python3
 
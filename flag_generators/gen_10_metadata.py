@@ -2,10 +2,9 @@
 
 from pathlib import Path
 import random
-import subprocess
 import sys
-import shutil
-from flag_generators.flag_helpers import FlagUtils
+from flag_generators.flag_helpers import FlagUtils, SharedInputs
+from exifjpeg import set_file_tags, ExifError
 
 
 class MetadataFlagGenerator:
@@ -15,9 +14,10 @@ class MetadataFlagGenerator:
     Stores unlock metadata but leaves writing to master script.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.generator_dir = Path(__file__).parent.resolve()
         self.source_image = self.generator_dir / "capybara.jpg"
         self.metadata = {}
@@ -33,7 +33,7 @@ class MetadataFlagGenerator:
         sys.exit(1)
 
     def safe_cleanup(self, challenge_folder: Path):
-        """Remove capybara.jpg and exiftool backup if present."""
+        """Remove capybara.jpg and any exiftool backup left by older runs."""
         dest_image = challenge_folder / "capybara.jpg"
         backup_file = dest_image.with_suffix(dest_image.suffix + "_original")
 
@@ -46,26 +46,21 @@ class MetadataFlagGenerator:
                     print(f"⚠️ Could not delete {file.name}: {e}", file=sys.stderr)
 
     def embed_flags(self, challenge_folder: Path, real_flag: str, fake_flags: list):
-        """Copy capybara.jpg and embed flags into EXIF metadata."""
+        """Write capybara.jpg with all flags in its EXIF metadata (one pass, one write)."""
         dest_image = challenge_folder / "capybara.jpg"
 
-        if shutil.which("exiftool") is None:
-            print("❌ exiftool is not installed.", file=sys.stderr)
-            sys.exit(1)
-
         challenge_folder.mkdir(parents=True, exist_ok=True)
         self.safe_cleanup(challenge_folder)
 
         try:
             if not self.source_image.exists():
                 raise FileNotFoundError(f"❌ Source image not found: {self.source_image}")
-            dest_image.write_bytes(self.source_image.read_bytes())
-            print(f"📂 Copied {self.source_image.name} to {challenge_folder.relative_to(self.project_root)}")
+            source_bytes = SharedInputs.read_bytes(self.source_image)
         except Exception as e:
-            print(f"❌ Failed to copy image: {e}", file=sys.stderr)
+            print(f"❌ Failed to read image: {e}", file=sys.stderr)
             sys.exit(1)
 
-        random.shuffle(fake_flags)
+        self.rng.shuffle(fake_flags)
         metadata_tags = {
             "ImageDescription": fake_flags[0],
             "Artist": fake_flags[1],
@@ -76,29 +71,12 @@ class MetadataFlagGenerator:
 
         print("📝 Embedding flags into EXIF metadata...")
         try:
-            for tag, value in metadata_tags.items():
-                subprocess.run(
-                    ["exiftool", f"-{tag}={value}", str(dest_image)],
-                    check=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-        except subprocess.CalledProcessError as e:
-            print(f"❌ exiftool failed: {e.stderr.strip()}", file=sys.stderr)
-            sys.exit(1)
-        except Exception as e:
-            print(f"❌ Unexpected error while embedding metadata: {e}", file=sys.stderr)
+            set_file_tags(dest_image, metadata_tags, source=source_bytes)
+            print(f"📂 Wrote {dest_image.name} to {challenge_folder.relative_to(self.project_root)}")
+        except (ExifError, OSError) as e:
+            print(f"❌ Failed to write EXIF metadata: {e}", file=sys.stderr)
             sys.exit(1)
 
-        backup_file = dest_image.with_suffix(dest_image.suffix + "_original")
-        if backup_file.exists():
-            try:
-                backup_file.unlink()
-                print("🗑️ Cleaned up exiftool backup file.")
-            except Exception as e:
-                print(f"⚠️ Could not remove backup file: {e}", file=sys.stderr)
-
         print(f"🎭 Fake flags: {', '.join(fake_flags)}")
         print(f"✅ Embedded real flag in UserComment: {real_flag}")
 
@@ -112,18 +90,18 @@ class MetadataFlagGenerator:
 
     def generate_flag(self, challenge_folder: Path) -> str:
         """Generate flags, embed them in metadata, and return the real flag."""
-        real_flag = FlagUtils.generate_real_flag()  # No replace here
+        real_flag = FlagUtils.generate_real_flag(self.rng)  # No replace here
 
         fake_flags = set()
         attempts = 0
         while len(fake_flags) < 4:
-            fake = FlagUtils.generate_fake_flag()
+            fake = FlagUtils.generate_fake_flag(self.rng)
             if fake != real_flag:
                 fake_flags.add(fake)
             attempts += 1
             if attempts > 1000:
                raise RuntimeError("❌ Too many attempts generating unique fake flags.")
-        fake_flags = list(fake_flags)
+        fake_flags = sorted(fake_flags)  # sets iterate in hash order; sort for seeded runs
 
         self.embed_flags(challenge_folder, real_flag, fake_flags)
         print(f"✅ {self.mode.capitalize()} flag: {real_flag}")
@@ -77,9 +77,10 @@ class HiddenFlagGenerator:
         ],
     }
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.metadata = {}
 
     @staticmethod
@@ -101,8 +102,8 @@ class HiddenFlagGenerator:
 
     def generate_junk_for_file(self, file_name: str, flag: str = None) -> str:
         snippets = self.FILE_BASED_JUNK.get(file_name, ["# Generic placeholder content"])
-        lines = random.choices(snippets, k=random.randint(3, 7))
-        insert_pos = random.randint(0, len(lines))
+        lines = self.rng.choices(snippets, k=self.rng.randint(3, 7))
+        insert_pos = self.rng.randint(0, len(lines))
         lines.insert(insert_pos, flag if flag else "# [No sensitive data found here]")
         return "\n".join(lines)
 
@@ -123,7 +124,7 @@ class HiddenFlagGenerator:
                 file_path = folder_path / file_name
                 all_files.append(file_path)
 
-        flag_files = random.sample(all_files, 5)
+        flag_files = self.rng.sample(all_files, 5)
         real_flag_file = flag_files[0]
         fake_flag_files = flag_files[1:]
 
@@ -153,11 +154,11 @@ class HiddenFlagGenerator:
         }
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.create_folder_structure(challenge_folder / "junk", real_flag, fake_flags)
         print(f"✅ {self.mode.capitalize()} flag: {real_flag}")
@@ -2,9 +2,9 @@
 
 from pathlib import Path
 import random
-import subprocess
 import sys
 from flag_generators.flag_helpers import FlagUtils
+from qrpng import write_batch, QRError
 
 
 class QRCodeFlagGenerator:
@@ -14,9 +14,10 @@ class QRCodeFlagGenerator:
     Supports guided and solo modes with metadata passed back to the master script.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.metadata = {}
 
     @staticmethod
@@ -29,23 +30,12 @@ class QRCodeFlagGenerator:
         print("❌ ERROR: Could not find .ccri_ctf_root marker.", file=sys.stderr)
         sys.exit(1)
 
-    @staticmethod
-    def check_qrencode_installed():
-        """Verify qrencode is installed, or exit with error."""
-        result = subprocess.run(["which", "qrencode"], capture_output=True)
-        if result.returncode != 0:
-            print("❌ ERROR: qrencode is not installed.")
-            print("👉 To fix, run: sudo apt install qrencode")
-            sys.exit(1)
-        else:
-            print("✅ qrencode is installed.")
-
-    def create_qr_code(self, output_file: Path, text: str):
-        """Use qrencode to generate a QR code PNG."""
+    def create_qr_codes(self, items: list):
+        """Render every (output_file, text) pair as a QR PNG in-process (qrencode defaults)."""
         try:
-            subprocess.run(["qrencode", "-o", str(output_file), text], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to generate QR code: {e}", file=sys.stderr)
+            write_batch(items)
+        except (QRError, OSError) as e:
+            print(f"❌ Failed to generate QR codes: {e}", file=sys.stderr)
             sys.exit(1)
 
     def clean_qr_codes(self, folder: Path):
@@ -68,14 +58,15 @@ class QRCodeFlagGenerator:
         self.clean_qr_codes(challenge_folder)
 
         all_flags = fake_flags + [real_flag]
-        random.shuffle(all_flags)
+        self.rng.shuffle(all_flags)
 
         print(f"🎭 Fake flags: {', '.join(fake_flags)}")
         print(f"🎯 Generating QR codes in: {challenge_folder.relative_to(self.project_root)}")
 
-        for i, flag in enumerate(all_flags, start=1):
-            qr_file = challenge_folder / f"qr_{i:02}.png"
-            self.create_qr_code(qr_file, flag)
+        items = [(challenge_folder / f"qr_{i:02}.png", flag) for i, flag in enumerate(all_flags, start=1)]
+        self.create_qr_codes(items)
+
+        for qr_file, flag in items:
             if flag == real_flag:
                 print(f"✅ {qr_file.name} (REAL flag)")
             else:
@@ -90,13 +81,11 @@ class QRCodeFlagGenerator:
 
     def generate_flag(self, challenge_folder: Path) -> str:
         """Generate QR code PNGs with 1 real and 4 fake flags."""
-        self.check_qrencode_installed()
-
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = list({FlagUtils.generate_fake_flag() for _ in range(4)})
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = list(dict.fromkeys(FlagUtils.generate_fake_flag(self.rng) for _ in range(4)))
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.embed_flags_as_qr(challenge_folder, real_flag, fake_flags)
         print(f"✅ {self.mode.capitalize()} flag: {real_flag}")
@@ -46,9 +46,10 @@ class HTTPHeaderFlagGenerator:
         ""
     ]
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.metadata = {}
 
     @staticmethod
@@ -63,10 +64,10 @@ class HTTPHeaderFlagGenerator:
     def generate_endpoint_data(self, flag: str) -> dict:
         """Creates the headers and body for a single endpoint."""
         headers = {
-            "Server": random.choice(self.SERVERS),
-            "Content-Type": random.choice(self.CONTENT_TYPES),
-            "Cache-Control": random.choice(self.CACHE_CONTROLS),
-            "X-Powered-By": random.choice(self.POWERED_BY),
+            "Server": self.rng.choice(self.SERVERS),
+            "Content-Type": self.rng.choice(self.CONTENT_TYPES),
+            "Cache-Control": self.rng.choice(self.CACHE_CONTROLS),
+            "X-Powered-By": self.rng.choice(self.POWERED_BY),
             "X-Frame-Options": "SAMEORIGIN",
             "X-Content-Type-Options": "nosniff"
         }
@@ -74,11 +75,11 @@ class HTTPHeaderFlagGenerator:
         # Add the flag header
         headers["X-Flag"] = flag
 
-        if random.random() < 0.6:
-            session_id = ''.join(random.choices("abcdef0123456789", k=16))
+        if self.rng.random() < 0.6:
+            session_id = ''.join(self.rng.choices("abcdef0123456789", k=16))
             headers["Set-Cookie"] = f"sessionid={session_id}; HttpOnly; Secure"
 
-        body = random.choice(self.HTML_BODIES) + "\n" + random.choice(self.HTML_COMMENTS)
+        body = self.rng.choice(self.HTML_BODIES) + "\n" + self.rng.choice(self.HTML_COMMENTS)
         
         return {
             "headers": headers,
@@ -100,7 +101,7 @@ class HTTPHeaderFlagGenerator:
             self.clean_previous_data(challenge_folder)
 
             all_flags = fake_flags + [real_flag]
-            random.shuffle(all_flags)
+            self.rng.shuffle(all_flags)
 
             server_data = {}
 
@@ -138,10 +139,10 @@ class HTTPHeaderFlagGenerator:
             sys.exit(1)
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = list({FlagUtils.generate_fake_flag() for _ in range(4)})
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = list(dict.fromkeys(FlagUtils.generate_fake_flag(self.rng) for _ in range(4)))
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.embed_data(challenge_folder, real_flag, fake_flags)
         print(f"✅ {self.mode.capitalize()} flag: {real_flag}")
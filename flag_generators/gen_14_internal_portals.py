@@ -13,9 +13,10 @@ class InternalPortalFlagGenerator:
     Avoids HTML comments to prevent environment-based stripping.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or Path.cwd()
         self.mode = mode
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.metadata = {}
 
     def get_template(self, title, desc, flag, domain):
@@ -37,10 +38,10 @@ class InternalPortalFlagGenerator:
         return html
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fakes = [FlagUtils.generate_fake_flag() for _ in range(4)]
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fakes = [FlagUtils.generate_fake_flag(self.rng) for _ in range(4)]
         all_flags = fakes + [real_flag]
-        random.shuffle(all_flags)
+        self.rng.shuffle(all_flags)
         
         # DISTINCT NAMES for Solo Mode
         if self.mode == "solo":
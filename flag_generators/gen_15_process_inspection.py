@@ -48,9 +48,10 @@ class ProcessInspectionFlagGenerator:
         "/opt/cryptkeepers/bin/siphon --threads 8 --proxy 127.0.0.1:8080"
     ]
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.metadata = {}
 
     @staticmethod
@@ -63,24 +64,24 @@ class ProcessInspectionFlagGenerator:
         sys.exit(1)
 
     def random_stat(self) -> str:
-        return random.choice(["S", "Ss", "Sl", "Ssl", "R", "R+", "Z", "D"])
+        return self.rng.choice(["S", "Ss", "Sl", "Ssl", "R", "R+", "Z", "D"])
 
     def random_start_time(self) -> str:
-        return f"Jul{random.randint(1, 30):02d}"
+        return f"Jul{self.rng.randint(1, 30):02d}"
 
     def random_process(self, user_override=None, cmd_override=None) -> str:
-        user = user_override or random.choice(self.USERS)
-        pid = random.randint(100, 9999)
-        cpu = round(random.uniform(0.1, 1.5), 1)
-        mem = round(random.uniform(0.1, 1.5), 1)
-        vsz = random.randint(15000, 80000)
-        rss = random.randint(3000, 40000)
-        tty = random.choice(["?", "pts/0", "pts/1"])
+        user = user_override or self.rng.choice(self.USERS)
+        pid = self.rng.randint(100, 9999)
+        cpu = round(self.rng.uniform(0.1, 1.5), 1)
+        mem = round(self.rng.uniform(0.1, 1.5), 1)
+        vsz = self.rng.randint(15000, 80000)
+        rss = self.rng.randint(3000, 40000)
+        tty = self.rng.choice(["?", "pts/0", "pts/1"])
         stat = self.random_stat()
         start = self.random_start_time()
-        time = f"{random.randint(0, 2)}:{random.randint(0, 59):02d}"
-        cmd_template = cmd_override or random.choice(self.COMMANDS)
-        cmd = cmd_template.format(random.randint(1, 3))
+        time = f"{self.rng.randint(0, 2)}:{self.rng.randint(0, 59):02d}"
+        cmd_template = cmd_override or self.rng.choice(self.COMMANDS)
+        cmd = cmd_template.format(self.rng.randint(1, 3))
 
         return f"{user:<10}{pid:<6}{cpu:<5}{mem:<5}{vsz:<8}{rss:<7}{tty:<10}{stat:<5}{start:<8}{time:<7}{cmd}"
 
@@ -93,7 +94,7 @@ class ProcessInspectionFlagGenerator:
             "/usr/sbin/backdoor --flag={} --listen --port 4444"
         ]
         flags = [real_flag] + fake_flags
-        random.shuffle(flag_processes)
+        self.rng.shuffle(flag_processes)
         for proc, flag in zip(flag_processes, flags):
             # make the “bad” processes run as the CryptKeepers user
             lines.append(self.random_process("ckeepers", proc.format(flag)))
@@ -111,11 +112,11 @@ class ProcessInspectionFlagGenerator:
 
         try:
             lines = ["USER       PID %CPU %MEM    VSZ   RSS TTY      STAT START   TIME COMMAND"]
-            for _ in range(random.randint(80, 100)):
+            for _ in range(self.rng.randint(80, 100)):
                 lines.append(self.random_process())
 
             self.embed_flags(lines, real_flag, fake_flags)
-            random.shuffle(lines[1:])  # preserve header at index 0
+            self.rng.shuffle(lines[1:])  # preserve header at index 0
 
             dump_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
             print(f"🎭 Fake flags: {', '.join(fake_flags)}")
@@ -133,11 +134,11 @@ class ProcessInspectionFlagGenerator:
             sys.exit(1)
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = list({FlagUtils.generate_fake_flag() for _ in range(4)})
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = list(dict.fromkeys(FlagUtils.generate_fake_flag(self.rng) for _ in range(4)))
 
         while real_flag in fake_flags:
-            real_flag = FlagUtils.generate_real_flag()
+            real_flag = FlagUtils.generate_real_flag(self.rng)
 
         self.generate_ps_dump(challenge_folder, real_flag, fake_flags)
         print(f"✅ {self.mode.capitalize()} flag: {real_flag}")
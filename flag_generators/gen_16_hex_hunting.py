@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import os
 import random
 import sys
 from pathlib import Path
@@ -14,9 +13,10 @@ class HexHuntingFlagGenerator:
     Collects unlock metadata in self.metadata (no file writes).
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.metadata = {}
 
     @staticmethod
@@ -32,6 +32,7 @@ class HexHuntingFlagGenerator:
     def _choose_non_overlapping_offsets(
         bin_size: int,
         spans: List[int],
+        rng: random.Random,
         start_min: int = 100
     ) -> List[int]:
         """
@@ -48,7 +49,7 @@ class HexHuntingFlagGenerator:
         for span in spans:
             # Try many times to find a non-overlapping start
             for _ in range(10_000):
-                s = random.randint(start_min, max_start)
+                s = rng.randint(start_min, max_start)
                 e = s + span - 1
                 # overlap if not (new end < old start or new start > old end)
                 if any(not (e < a or s > b) for a, b in chosen):
@@ -84,11 +85,11 @@ class HexHuntingFlagGenerator:
                 print(f"⚠️ Could not remove {output_path.name}: {e}", file=sys.stderr)
 
         # Size big enough to comfortably place 5 spans with padding
-        binary_size = random.randint(1024, 1536)
-        binary_data = bytearray(os.urandom(binary_size))
+        binary_size = self.rng.randint(1024, 1536)
+        binary_data = bytearray(self.rng.randbytes(binary_size))
 
         # Pre-decide EXACT pads so we know the exact spans before choosing offsets
-        pads = [random.randint(1, 3) for _ in range(1 + len(fake_flags))]
+        pads = [self.rng.randint(1, 3) for _ in range(1 + len(fake_flags))]
         spans = [len(real_flag) + pads[0]] + [len(f) + p for f, p in zip(fake_flags, pads[1:])]
 
         # Sanity check
@@ -97,7 +98,7 @@ class HexHuntingFlagGenerator:
             raise RuntimeError("❌ Binary size too small for safe flag embedding.")
 
         # Choose non-overlapping offsets for [real] + [fakes]
-        offsets = self._choose_non_overlapping_offsets(binary_size, spans, start_min=100)
+        offsets = self._choose_non_overlapping_offsets(binary_size, spans, self.rng, start_min=100)
 
         # Insert: real first, then fakes (order doesn’t matter thanks to non-overlap)
         self.insert_flag(binary_data, real_flag, offsets[0], pads[0])
@@ -118,13 +119,13 @@ class HexHuntingFlagGenerator:
         }
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
+        real_flag = FlagUtils.generate_real_flag(self.rng)
 
         # Ensure EXACTLY 4 unique fakes (set + loop to avoid <4 due to duplicates)
         fake_set = set()
         while len(fake_set) < 4:
-            fake_set.add(FlagUtils.generate_fake_flag())
-        fake_flags = list(fake_set)
+            fake_set.add(FlagUtils.generate_fake_flag(self.rng))
+        fake_flags = sorted(fake_set)  # sets iterate in hash order; sort for seeded runs
 
         # Fakes never start with CCRI by design, so no collision with real prefix
         self.generate_hex_file(challenge_folder, real_flag, fake_flags)
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
+import os
+import fcntl
 import random
-import re
 import sys
 import json
 from pathlib import Path
@@ -11,15 +12,16 @@ from flag_generators.flag_helpers import FlagUtils
 class NmapScanFlagGenerator:
     """
     Generator for the Nmap Scanning challenge.
-    Dynamically patches web_version_admin/fake_services.py with random ports,
-    flags, service names, and junk responses. Stores unlock metadata in memory.
+    Writes random ports, flags, service names, and junk responses for the current
+    mode into web_version_admin/fake_services.json. A running hub watches that
+    catalog and rebinds its ports without a restart. Stores unlock metadata in memory.
     """
 
-    def __init__(self, project_root: Path = None, services_file: Path = None, mode="guided"):
+    def __init__(self, project_root: Path = None, catalog_file: Path = None, mode="guided", seed=None):
         self.project_root = project_root or self.find_project_root()
-        # CHANGED: Now points to fake_services.py instead of server.py
-        self.services_file = services_file or self.project_root / "web_version_admin" / "fake_services.py"
+        self.catalog_file = catalog_file or self.project_root / "web_version_admin" / "fake_services.json"
         self.mode = mode
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
         self.port_range = list(range(8000, 8100)) if self.mode == "guided" else list(range(9000, 9100))
         self.metadata = {}
 
@@ -34,24 +36,12 @@ class NmapScanFlagGenerator:
 
     def random_ports(self, port_range, exclude_ports, count):
         available = set(port_range) - set(exclude_ports)
-        return random.sample(sorted(available), count)
+        return self.rng.sample(sorted(available), count)
 
-    def escape_python_string_literal(self, s: str) -> str:
-        return '"' + s.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') + '"'
-
-    def patch_services_file(self, real_flag: str, fake_flags: dict, real_port: int, junk_ports: dict):
-        services_file = self.services_file.resolve()
-
-        if not services_file.exists():
-            print(f"❌ ERROR: {services_file} not found.", file=sys.stderr)
-            sys.exit(1)
+    def update_catalog(self, real_flag: str, fake_flags: dict, real_port: int, junk_ports: dict):
+        catalog_file = self.catalog_file.resolve()
 
         try:
-            # Determine variable names based on mode
-            flag_var = "GUIDED_FAKE_FLAGS" if self.mode == "guided" else "SOLO_FAKE_FLAGS"
-            junk_var = "GUIDED_JUNK_RESPONSES" if self.mode == "guided" else "SOLO_JUNK_RESPONSES"
-            service_var = "GUIDED_SERVICE_NAMES" if self.mode == "guided" else "SOLO_SERVICE_NAMES"
-
             # Prepare data
             all_ports = [real_port] + list(fake_flags.keys()) + list(junk_ports.keys())
             service_name_pool = [
@@ -59,95 +49,63 @@ class NmapScanFlagGenerator:
                 "theta-daemon", "epsilon-sync", "kappa-node", "zeta-cache", "delta-proxy",
                 "sysmon-api", "configd", "metricsd", "auth-service", "update-agent"
             ]
-            random.shuffle(service_name_pool)
+            self.rng.shuffle(service_name_pool)
             combined_service_names = {
                 port: service_name_pool[i % len(service_name_pool)]
                 for i, port in enumerate(all_ports)
             }
 
-            # Build source code strings for the new dictionaries
-            new_fake_flags = [f"    {real_port}: \"{real_flag}\",       # ✅ REAL FLAG"]
-            for port, flag in fake_flags.items():
-                new_fake_flags.append(f"    {port}: \"{flag}\",       # fake")
-            new_fake_flags_block = f"{flag_var} = {{\n" + "\n".join(new_fake_flags) + "\n}"
-
-            new_junk_responses = []
-            for port in sorted(junk_ports):
-                safe_response = self.escape_python_string_literal(junk_ports[port])
-                new_junk_responses.append(f"    {port}: {safe_response}")
-            new_junk_block = f"{junk_var} = {{\n" + ",\n".join(new_junk_responses) + "\n}"
+            # JSON object keys are strings; fake_services.load_catalog() turns them back into ints
+            section = {
+                "real_port": real_port,
+                "flags": {str(real_port): real_flag, **{str(p): f for p, f in fake_flags.items()}},
+                "junk_responses": {str(p): junk_ports[p] for p in sorted(junk_ports)},
+                "service_names": {str(p): combined_service_names[p] for p in sorted(combined_service_names)},
+            }
 
-            service_name_updates = [
-                f"    {port}: \"{combined_service_names[port]}\"" for port in sorted(combined_service_names)
-            ]
-            new_service_names_block = f"{service_var} = {{\n" + ",\n".join(service_name_updates) + "\n}"
-
-            print(f"📂 Reading {services_file}...")
-            content = services_file.read_text(encoding="utf-8")
-
-            # --- Apply Regex Replacements ---
-            # Replace FAKE_FLAGS dictionary
-            new_content, count_flags = re.subn(
-                rf"{flag_var}\s*=\s*\{{[^}}]*\}}",
-                new_fake_flags_block,
-                content,
-                flags=re.DOTALL
-            )
-            if count_flags == 0:
-                raise RuntimeError(f"No {flag_var} block found in {services_file.name} to replace!")
-
-            # Replace JUNK_RESPONSES dictionary
-            new_content, count_junk = re.subn(
-                rf"{junk_var}\s*=\s*\{{[^}}]*\}}",
-                new_junk_block,
-                new_content,
-                flags=re.DOTALL
-            )
-            if count_junk == 0:
-                raise RuntimeError(f"No {junk_var} block found in {services_file.name} to replace!")
-
-            # Replace SERVICE_NAMES dictionary
-            new_content, count_services = re.subn(
-                rf"{service_var}\s*=\s*\{{[^}}]*\}}",
-                new_service_names_block,
-                new_content,
-                flags=re.DOTALL
-            )
-            if count_services == 0:
-                print(f"⚠️ WARNING: No {service_var} definition found — skipping service name update.")
-
-            # Create backup
-            backup_file = services_file.with_suffix(".bak")
-            if not backup_file.exists():
-                services_file.replace(backup_file)
-                print(f"🗄️ Backup created: {backup_file.name}")
-
-            # Write changes
-            services_file.write_text(new_content, encoding="utf-8")
-            print(f"✅ Updated {services_file.name} with {flag_var}, {junk_var}, and {service_var} data.")
+            # Guided and solo runs may update their sections concurrently; serialize the read-modify-write
+            # (the lock is taken on the catalog's directory so no lock file is left behind)
+            dir_fd = os.open(catalog_file.parent, os.O_RDONLY)
+            try:
+                fcntl.flock(dir_fd, fcntl.LOCK_EX)
+                catalog = {}
+                if catalog_file.exists():
+                    print(f"📂 Reading {catalog_file}...")
+                    with open(catalog_file, "r", encoding="utf-8") as f:
+                        catalog = json.load(f)
+                catalog[self.mode] = section
+
+                # Write to a temp file and swap it in so the hub's watcher never sees a partial file
+                tmp_file = catalog_file.with_suffix(f".{self.mode}.tmp")
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(catalog, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, catalog_file)
+            finally:
+                os.close(dir_fd)  # releases the flock
+            print(f"✅ Updated {catalog_file.name} ({self.mode} section).")
 
             self.metadata = {
                 "real_flag": real_flag,
                 "real_port": real_port,
-                "server_file": str(services_file.relative_to(self.project_root)),
+                "server_file": str(catalog_file.relative_to(self.project_root)),
                 "unlock_method": f"Scan ports {self.port_range[0]}–{self.port_range[-1]} and query HTTP endpoints to locate the real flag (port {real_port})",
                 "hint": f"Use nmap -p{self.port_range[0]}-{self.port_range[-1]} localhost to discover ports and curl to check flags."
             }
 
         except Exception as e:
-            print(f"❌ ERROR during fake_services.py patching: {e}", file=sys.stderr)
+            print(f"❌ ERROR during fake_services.json update: {e}", file=sys.stderr)
             sys.exit(1)
 
     def generate_flag(self, challenge_folder: Path) -> str:
         selected_flag_ports = self.random_ports(self.port_range, [], 5)
         real_port = selected_flag_ports[0]
-        real_flag = FlagUtils.generate_real_flag()
-        fake_flags = {port: FlagUtils.generate_fake_flag() for port in selected_flag_ports[1:]}
+        real_flag = FlagUtils.generate_real_flag(self.rng)
+        fake_flags = {port: FlagUtils.generate_fake_flag(self.rng) for port in selected_flag_ports[1:]}
 
         junk_response_pool = [
-            "Welcome to Dev HTTP Server v1.3\\nPlease login to continue.",
+            "Welcome to Dev HTTP Server v1.3\nPlease login to continue.",
             "🔒 Unauthorized: API key required.",
-            "503 Service Unavailable\\nTry again later.",
+            "503 Service Unavailable\nTry again later.",
             "<html><body><h1>It works!</h1><p>Apache2 default page.</p></body></html>",
             "DEBUG: Connection established successfully.",
             "💡 Tip: Scan only the ports you really need.",
@@ -158,13 +116,13 @@ class NmapScanFlagGenerator:
             "💻 Dev API v0.1 — POST requests only.",
             "403 Forbidden: You don’t have permission to access this resource.",
             "Error 418: I’m a teapot.",
-            "Hello World!\\nTest endpoint active.",
-            "Server under maintenance.\\nPlease retry later."
+            "Hello World!\nTest endpoint active.",
+            "Server under maintenance.\nPlease retry later."
         ]
-        selected_junk_ports = self.random_ports(self.port_range, selected_flag_ports, random.randint(8, 12))
-        junk_responses = {port: random.choice(junk_response_pool) for port in selected_junk_ports}
+        selected_junk_ports = self.random_ports(self.port_range, selected_flag_ports, self.rng.randint(8, 12))
+        junk_responses = {port: self.rng.choice(junk_response_pool) for port in selected_junk_ports}
 
-        self.patch_services_file(real_flag, fake_flags, real_port, junk_responses)
+        self.update_catalog(real_flag, fake_flags, real_port, junk_responses)
 
         print(f"🏁 Real flag: {real_flag} on port {real_port}")
         for port, flag in fake_flags.items():
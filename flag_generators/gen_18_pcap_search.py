@@ -1,27 +1,35 @@
 #!/usr/bin/env python3
 
-try:
-    from scapy.all import IP, TCP, Raw, wrpcap
-except ImportError:
-    print("❌ Scapy is not installed. Run: sudo apt install python3-scapy")
-    exit(1)
-
+import os
 import random
 import sys
 from pathlib import Path
 from flag_generators.flag_helpers import FlagUtils
+from pcapio import PcapWriter, tcp_frame
 
 
 class PcapSearchFlagGenerator:
     """
     Generator for the PCAP Search challenge.
     Creates a traffic.pcap file with embedded real and fake flags.
+    Packets are streamed to disk by pcapio.PcapWriter in a shuffled order, rebuilt
+    on demand from their index, so noise_conversations can scale to millions.
+    scapy is only used when asked for (use_scapy=True or CCRI_PCAP_WRITER=scapy).
     Stores unlock metadata in memory.
     """
 
-    def __init__(self, project_root: Path = None, mode="guided"):
+    NOISE_CONVERSATIONS = 150
+
+    def __init__(self, project_root: Path = None, mode="guided", seed=None,
+                 noise_conversations=None, use_scapy=None):
         self.project_root = project_root or self.find_project_root()
         self.mode = mode  # guided or solo
+        self.rng = random.Random(seed)  # own stream; seed=None seeds from the OS
+        self.artifact_time = FlagUtils.artifact_time(seed)  # None: wall clock
+        self.noise_conversations = noise_conversations or self.NOISE_CONVERSATIONS
+        if use_scapy is None:
+            use_scapy = os.environ.get("CCRI_PCAP_WRITER", "").lower() == "scapy"
+        self.use_scapy = use_scapy
         self.metadata = {}
 
     @staticmethod
@@ -33,20 +41,18 @@ class PcapSearchFlagGenerator:
         print("❌ ERROR: Could not find .ccri_ctf_root marker.", file=sys.stderr)
         sys.exit(1)
 
-    def http_packet(self, src, dst, sport, dport, payload):
-        ip = IP(src=src, dst=dst)
-        tcp = TCP(sport=sport, dport=dport, flags="PA", seq=random.randint(1000, 5000))
-        raw = Raw(load=payload)
-        return ip / tcp / raw
+    def http_packet(self, rng, src, dst, sport, dport, payload):
+        """One PSH/ACK segment as (src, dst, sport, dport, payload, seq)."""
+        return (src, dst, sport, dport, payload, rng.randint(1000, 5000))
 
-    def http_conversation(self, src, dst, flag=None, noise=False, real_flag=False):
-        sport = random.randint(1024, 65535)
+    def http_conversation(self, rng, src, dst, flag=None, noise=False, real_flag=False):
+        sport = rng.randint(1024, 65535)
         dport = 80
         packets = []
 
         # Client sends HTTP GET
         packets.append(self.http_packet(
-            src, dst, sport, dport,
+            rng, src, dst, sport, dport,
             f"GET / HTTP/1.1\r\nHost: {dst}\r\nUser-Agent: Mozilla/5.0\r\nAccept: */*\r\n\r\n".encode()
         ))
 
@@ -56,7 +62,7 @@ class PcapSearchFlagGenerator:
             "Server: nginx/1.18.0\r\n"
             "Content-Type: text/html\r\n"
             "Set-Cookie: sessionid=" +
-            ''.join(random.choices('abcdef1234567890', k=10)) + "; HttpOnly\r\n"
+            ''.join(rng.choices('abcdef1234567890', k=10)) + "; HttpOnly\r\n"
         )
 
         if real_flag:
@@ -70,9 +76,47 @@ class PcapSearchFlagGenerator:
             body = "<html><body><p>Hello, authorized user.</p></body></html>"
 
         response = f"{server_headers}\r\n{body}".encode()
-        packets.append(self.http_packet(dst, src, dport, sport, response))
+        packets.append(self.http_packet(rng, dst, src, dport, sport, response))
         return packets
 
+    @staticmethod
+    def random_ip(rng, prefix, octets):
+        parts = [str(rng.randint(0, 255)) for _ in range(octets - 1)] + [str(rng.randint(1, 254))]
+        return ".".join([prefix] + parts)
+
+    def conversation(self, index):
+        """Both packets of conversation `index`, rebuilt deterministically from its own seed."""
+        if index < self.noise_conversations:
+            rng = random.Random(self.noise_seed + index)
+            src, dst = self.random_ip(rng, "10", 3), self.random_ip(rng, "10", 3)
+            return self.http_conversation(rng, src, dst, noise=True)
+        src, dst, flag, real, conv_seed = self.flag_conversations[index - self.noise_conversations]
+        return self.http_conversation(random.Random(conv_seed), src, dst, flag=flag, real_flag=real)
+
+    def packet(self, index):
+        """Packet `index` (conversation index // 2, request or response) as a tuple."""
+        conv = index // 2
+        if self._last_conversation[0] != conv:
+            self._last_conversation = (conv, self.conversation(conv))
+        return self._last_conversation[1][index % 2]
+
+    def write_scapy(self, output_file: Path, order):
+        """Explicitly requested fallback: build scapy packets and wrpcap them."""
+        try:
+            from scapy.all import Ether, IP, TCP, Raw, wrpcap
+        except ImportError:
+            print("❌ Scapy is not installed. Run: sudo apt install python3-scapy")
+            sys.exit(1)
+        packets = []
+        for index in order:
+            src, dst, sport, dport, payload, seq = self.packet(index)
+            packet = (Ether() / IP(src=src, dst=dst) /
+                      TCP(sport=sport, dport=dport, flags="PA", seq=seq) / Raw(load=payload))
+            if self.artifact_time is not None:
+                packet.time = self.artifact_time + len(packets) * 0.001
+            packets.append(packet)
+        wrpcap(str(output_file), packets)
+
     def embed_pcap(self, challenge_folder: Path, real_flag: str, fake_flags: list):
         challenge_folder.mkdir(parents=True, exist_ok=True)
 
@@ -84,19 +128,16 @@ class PcapSearchFlagGenerator:
             except Exception as e:
                 print(f"⚠️ Could not delete old traffic.pcap: {e}", file=sys.stderr)
 
-        packets = []
-
-        # Noise
-        for _ in range(150):
-            src = f"10.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,254)}"
-            dst = f"10.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,254)}"
-            packets.extend(self.http_conversation(src, dst, noise=True))
+        # Noise conversations are derived from one seed; only the flag ones are kept
+        self.noise_seed = self.rng.getrandbits(64)
+        self.flag_conversations = []
+        self._last_conversation = (None, None)
 
         # Fake flags
         for fake in fake_flags:
-            src = f"172.16.{random.randint(0,255)}.{random.randint(1,254)}"
-            dst = f"172.16.{random.randint(0,255)}.{random.randint(1,254)}"
-            packets.extend(self.http_conversation(src, dst, flag=fake))
+            src = self.random_ip(self.rng, "172.16", 2)
+            dst = self.random_ip(self.rng, "172.16", 2)
+            self.flag_conversations.append((src, dst, fake, False, self.rng.getrandbits(64)))
 
         # Real flag
         if self.mode == "guided":
@@ -106,15 +147,26 @@ class PcapSearchFlagGenerator:
             src = "10.250.0.5"
             dst = "10.250.0.10"
 
-        packets.extend(self.http_conversation(src, dst, flag=real_flag, real_flag=True))
+        self.flag_conversations.append((src, dst, real_flag, True, self.rng.getrandbits(64)))
 
-        random.shuffle(packets)
-        wrpcap(str(output_file), packets)
+        total = 2 * (self.noise_conversations + len(self.flag_conversations))
+
+        if self.use_scapy:
+            order = list(range(total))
+            self.rng.shuffle(order)
+            self.write_scapy(output_file, order)
+        else:
+            def build(index):
+                src, dst, sport, dport, payload, seq = self.packet(index)
+                return tcp_frame(src, dst, sport, dport, payload, seq=seq)
+
+            with PcapWriter(output_file, start_time=self.artifact_time) as pcap:
+                pcap.write_permuted(total, build, self.rng)
 
         print(f"✅ traffic.pcap created: {output_file.relative_to(self.project_root)}")
         print(f"   🏁 Real flag: {real_flag}")
         print(f"   🎭 Fake flags: {', '.join(fake_flags)}")
-        print(f"📦 Total packets: {len(packets)}")
+        print(f"📦 Total packets: {total}")
 
         # Store metadata in memory for master script
         self.metadata = {
@@ -125,10 +177,10 @@ class PcapSearchFlagGenerator:
         }
 
     def generate_flag(self, challenge_folder: Path) -> str:
-        real_flag = FlagUtils.generate_real_flag()
+        real_flag = FlagUtils.generate_real_flag(self.rng)
         fake_flags = []
         while len(fake_flags) < 4:
-            fake = FlagUtils.generate_fake_flag()
+            fake = FlagUtils.generate_fake_flag(self.rng)
             if fake != real_flag and fake not in fake_flags:
                 fake_flags.append(fake)
 
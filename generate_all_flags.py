@@ -2,8 +2,16 @@
 
 import argparse
 import sys
+import io
+import os
+import time
+import random
 import shutil
 import json
+import hashlib
+import inspect
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import base64
 
@@ -31,6 +39,7 @@ from flag_generators.gen_15_process_inspection import ProcessInspectionFlagGener
 from flag_generators.gen_16_hex_hunting import HexHuntingFlagGenerator
 from flag_generators.gen_17_nmap_scanning import NmapScanFlagGenerator
 from flag_generators.gen_18_pcap_search import PcapSearchFlagGenerator
+from flag_generators.flag_helpers import SharedInputs
 
 # === Mapping challenge IDs to generator classes ===
 GENERATOR_CLASSES = {
@@ -54,6 +63,31 @@ GENERATOR_CLASSES = {
     "18_PcapSearch": PcapSearchFlagGenerator,
 }
 
+# Template files each generator reads (beyond its own source and flag_helpers.py)
+GENERATOR_TEMPLATES = {
+    "01_Stego": ["squirrel.jpg"],
+    "05_ArchivePassword": ["wordlist.txt"],
+    "06_Hashcat": ["wordlist.txt"],
+    "10_Metadata": ["capybara.jpg"],
+}
+
+# Root-level shared modules each generator builds its artifacts with
+GENERATOR_SHARED_MODULES = {
+    "01_Stego": ["exifjpeg.py"],
+    "05_ArchivePassword": ["zipcrypto.py"],
+    "06_Hashcat": ["zipcrypto.py"],
+    "10_Metadata": ["exifjpeg.py"],
+    "12_QRCodes": ["qrpng.py"],
+    "18_PcapSearch": ["pcapio.py"],
+}
+
+# Generators whose artifacts are expensive to build and live only in their challenge folder
+# (gen_17 also writes fake_services.json, so it always runs)
+CACHEABLE_GENERATORS = {
+    "01_Stego", "05_ArchivePassword", "06_Hashcat", "07_ExtractBinary",
+    "10_Metadata", "12_QRCodes", "18_PcapSearch",
+}
+
 # --- Small helpers ---
 def load_json(path: Path) -> dict:
     if not path.exists():
@@ -66,6 +100,51 @@ def save_json(path: Path, data: dict):
     with path.open("w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
 
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def folder_signatures(folder: Path) -> dict:
+    """{relative_path: (mtime_ns, size)} for every file under folder."""
+    if not folder.is_dir():
+        return {}
+    signatures = {}
+    for path in folder.rglob("*"):
+        if path.is_file():
+            st = path.stat()
+            signatures[path.relative_to(folder).as_posix()] = (st.st_mtime_ns, st.st_size)
+    return signatures
+
+def derive_seed(seed, mode, challenge_id):
+    """Independent per-generator seed from the run seed (None stays None = OS randomness)."""
+    if seed is None:
+        return None
+    digest = hashlib.sha256(f"{seed}:{mode}:{challenge_id}".encode("utf-8")).hexdigest()
+    return int(digest[:16], 16)
+
+def resolve_challenge_ids(requested, known_ids):
+    """
+    Expand --only values ("04", "4", "04_Vigenere", "5,6") to full challenge IDs.
+    Raises ValueError for anything that does not match exactly one challenge.
+    """
+    resolved = []
+    for token in (t.strip() for value in requested for t in value.split(",")):
+        if not token:
+            continue
+        if token in known_ids:
+            matches = [token]
+        else:
+            prefix = token.zfill(2) if token.isdigit() else token
+            matches = [cid for cid in known_ids if cid.split("_", 1)[0] == prefix or cid.lower() == token.lower()]
+        if len(matches) != 1:
+            raise ValueError(f"Unknown challenge for --only: {token}")
+        if matches[0] not in resolved:
+            resolved.append(matches[0])
+    return resolved
+
 def backup_file(path: Path):
     if path.exists():
         backup = path.with_suffix(path.suffix + ".bak")
@@ -73,20 +152,235 @@ def backup_file(path: Path):
         return backup
     return None
 
+# === Content-Addressed Artifact Cache ===
+class ArtifactCache:
+    """
+    Generated artifacts stored under .artifact_cache/<key>/ where the key hashes
+    (generator, version, seed, mode); "version" is the generator's input fingerprint
+    (its source, flag_helpers.py and templates). Each entry holds files/ plus
+    result.json with the flags and unlock data, so a hit skips the generator entirely.
+    Restores hardlink when possible and fall back to copying.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @staticmethod
+    def key(challenge_id, inputs):
+        material = {
+            "generator": challenge_id,
+            "version": inputs["files"],
+            "seed": inputs["seed"],
+            "mode": inputs["mode"],
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def entry_dir(self, key):
+        return self.root / key[:2] / key
+
+    def contains(self, key):
+        return (self.entry_dir(key) / "result.json").is_file()
+
+    def store(self, key, folder: Path, artifacts, result_fields):
+        """Copy artifacts into a temp entry and rename it into place (safe with parallel writers)."""
+        entry = self.entry_dir(key)
+        if entry.exists():
+            return
+        tmp = entry.with_name(f"{key}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        for rel_path in artifacts:
+            dest = tmp / "files" / rel_path
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(folder / rel_path, dest)
+        tmp.mkdir(parents=True, exist_ok=True)
+        save_json(tmp / "result.json", {**result_fields, "artifacts": list(artifacts)})
+        try:
+            tmp.rename(entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # another worker stored it first
+
+    def restore(self, key, folder: Path, stale=()):
+        """Replace the folder's artifacts with the cached ones; returns the cached result fields."""
+        entry = self.entry_dir(key)
+        result = load_json(entry / "result.json")
+        for rel_path in stale:
+            (folder / rel_path).unlink(missing_ok=True)
+        for rel_path in result["artifacts"]:
+            src, dest = entry / "files" / rel_path, folder / rel_path
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.unlink(missing_ok=True)
+            try:
+                os.link(src, dest)
+            except OSError:
+                shutil.copy2(src, dest)
+        return result
+
+    @staticmethod
+    def detach(folder: Path):
+        """Give hardlinked artifacts a private copy so a generator rewriting them can't corrupt the cache."""
+        if not folder.is_dir():
+            return
+        for path in folder.rglob("*"):
+            if path.is_file() and path.stat().st_nlink > 1:
+                tmp = path.with_name(path.name + ".detach")
+                shutil.copy2(path, tmp)
+                os.replace(tmp, path)
+
+# === Per-challenge generation (also the process-pool worker) ===
+def init_worker():
+    # Forked workers inherit the parent's random state; reseed so they don't produce identical flags
+    random.seed()
+
+def run_generator(challenge_id, mode, target_folder, capture=False, seed=None, cache=None, cache_key=None, stale=(),
+                  project_root=None):
+    """
+    Run one challenge's generator and return a picklable result dict:
+    {"id", "real_flag", "fake_flags", "unlock_data", "artifacts", "error", "skipped", "cached", "elapsed", "log"}.
+    With capture=True (pool workers) stdout/stderr are collected into "log" so the
+    parent can print each challenge's output in order instead of interleaved.
+    With a cache and cache_key, a hit restores the artifacts instead of running the
+    generator (stale = previously generated paths to remove first) and a miss is stored.
+    project_root points generators at another tree (variant farm); None = find it from the cwd.
+    """
+    result = {
+        "id": challenge_id, "real_flag": None, "fake_flags": [], "unlock_data": {}, "artifacts": [],
+        "error": None, "skipped": False, "cached": False, "elapsed": 0.0, "log": "",
+    }
+    buffer = io.StringIO()
+    start = time.perf_counter()
+
+    with contextlib.ExitStack() as stack:
+        if capture:
+            stack.enter_context(contextlib.redirect_stdout(buffer))
+            stack.enter_context(contextlib.redirect_stderr(buffer))
+        try:
+            print(f"🚀 Generating flag for {challenge_id}...")
+
+            generator_cls = GENERATOR_CLASSES.get(challenge_id)
+            if not generator_cls:
+                print(f"⚠️ No generator found for {challenge_id}. Skipping.\n")
+                result["skipped"] = True
+            elif cache_key and cache.contains(cache_key):
+                cached = cache.restore(cache_key, Path(target_folder), stale)
+                print(f"♻️ Restored {len(cached['artifacts'])} artifact(s) from cache ({cache_key[:12]})")
+                for field in ("real_flag", "fake_flags", "unlock_data", "artifacts"):
+                    result[field] = cached[field]
+                result["cached"] = True
+            else:
+                folder = Path(target_folder)
+                folder.mkdir(parents=True, exist_ok=True)
+                if cache:
+                    cache.detach(folder)
+                before = folder_signatures(folder)
+                generator = generator_cls(project_root=Path(project_root) if project_root else None, mode=mode, seed=seed)
+                generated = generator.generate_flag(folder)
+                unlock_data = getattr(generator, "metadata", {})
+
+                # Attach common optional metadata if present
+                for attr in ["last_password", "last_zip_password", "last_subdomains", "last_ports"]:
+                    value = getattr(generator, attr, None)
+                    if value:
+                        unlock_data[attr] = value
+
+                result["real_flag"] = generated[0] if isinstance(generated, tuple) else generated
+                result["fake_flags"] = list(getattr(generator, "last_fake_flags", []))
+                result["unlock_data"] = unlock_data
+                # Files the generator created or rewrote
+                result["artifacts"] = sorted(
+                    rel_path for rel_path, signature in folder_signatures(folder).items()
+                    if before.get(rel_path) != signature
+                )
+                if cache_key:
+                    cache.store(cache_key, folder, result["artifacts"], {
+                        field: result[field] for field in ("real_flag", "fake_flags", "unlock_data")
+                    })
+        except (Exception, SystemExit) as e:
+            # Generators sys.exit() on missing tools; record it and keep going with the rest
+            if isinstance(e, SystemExit):
+                result["error"] = f"generator exited with status {e.code}"
+            else:
+                result["error"] = str(e) or e.__class__.__name__
+
+    result["elapsed"] = time.perf_counter() - start
+    result["log"] = buffer.getvalue()
+    return result
+
+# === Incremental Generation Manifest ===
+class GenerationManifest:
+    """
+    Per-mode record of what each challenge was last generated from and what it produced:
+    {cid: {"inputs": {...}, "artifacts": {relative_path: sha256}}}.
+    A challenge is up to date when its generator source, flag_helpers.py, templates,
+    shared root modules, mode and seed hash the same as last time AND its artifacts are still untouched.
+    """
+
+    def __init__(self, path: Path, project_root: Path):
+        self.path = path
+        self.project_root = project_root
+        self.entries = load_json(path)
+
+    def fingerprint(self, challenge_id, mode, seed=None):
+        generator_dir = self.project_root / "flag_generators"
+        sources = [Path(inspect.getsourcefile(GENERATOR_CLASSES[challenge_id])), generator_dir / "flag_helpers.py"]
+        sources += [generator_dir / name for name in GENERATOR_TEMPLATES.get(challenge_id, [])]
+        # Keyed by name only: variant trees reach the same sources through a symlink
+        files = {f"flag_generators/{path.name}": sha256_file(path) if path.exists() else None for path in sources}
+        for name in GENERATOR_SHARED_MODULES.get(challenge_id, []):
+            path = Path(__file__).resolve().parent / name  # always the real tree, never a variant root
+            files[name] = sha256_file(path) if path.exists() else None
+        return {"mode": mode, "seed": seed, "files": files}
+
+    def is_current(self, challenge_id, inputs, folder: Path) -> bool:
+        entry = self.entries.get(challenge_id)
+        if not entry or entry.get("inputs") != inputs or not entry.get("artifacts"):
+            return False
+        for rel_path, digest in entry["artifacts"].items():
+            path = folder / rel_path
+            if not path.is_file() or sha256_file(path) != digest:
+                return False
+        return True
+
+    def artifacts(self, challenge_id):
+        return list(self.entries.get(challenge_id, {}).get("artifacts", {}))
+
+    def record(self, challenge_id, inputs, folder: Path, artifacts):
+        """Store inputs plus hashes of the files the generator created or rewrote."""
+        self.entries[challenge_id] = {
+            "inputs": inputs,
+            "artifacts": {rel_path: sha256_file(folder / rel_path) for rel_path in sorted(artifacts)},
+        }
+
+    def save(self):
+        save_json(self.path, self.entries)
+        print(f"🧾 Generation manifest saved: {self.path.relative_to(self.project_root)}")
+
 # === Master Flag Generation Class ===
 class FlagGenerationManager:
-    def __init__(self, dry_run=False, mode="guided"):
-        self.project_root = self.find_project_root()
+    def __init__(self, dry_run=False, mode="guided", only=None, incremental=False, seed=None, use_cache=True,
+                 project_root=None, validate=False, fail_fast=True, validate_timeout=None):
+        self.project_root = Path(project_root) if project_root else self.find_project_root()
         self.web_admin_dir = self.project_root / "web_version_admin"
         self.dryrun_dir = self.project_root / "dryrun_output"
         self.dry_run = dry_run
         self.mode = mode  # guided or solo
+        self.only = only or []          # --only: restrict to these challenge IDs
+        self.incremental = incremental  # skip challenges whose inputs and artifacts are unchanged
+        self.seed = seed                # run seed; each generator gets derive_seed(seed, mode, id)
+        # Caching only makes sense for reproducible (seeded) runs
+        self.artifact_cache = ArtifactCache(self.project_root / ".artifact_cache") if seed is not None and use_cache else None
+        self.validate = validate                  # validate each challenge as soon as it is generated
+        self.fail_fast = fail_fast                # stop generating at the first validation failure
+        self.validate_timeout = validate_timeout  # seconds per validator (None = no limit)
 
         filename_map = {"guided": "challenges.json", "solo": "challenges_solo.json"}
 
         # Admin files (we ONLY update admin side here)
         self.challenges_file = self.web_admin_dir / filename_map[self.mode]  # decoded flags
         self.unlocks_file = self.web_admin_dir / f"validation_unlocks{'_solo' if self.mode == 'solo' else ''}.json"
+        self.manifest = GenerationManifest(
+            self.web_admin_dir / f"generation_manifest{'_solo' if self.mode == 'solo' else ''}.json",
+            self.project_root,
+        )
 
         # Challenge folders destination (so generators can drop artifacts)
         self.challenges_dir = self.project_root / ("challenges" if self.mode == "guided" else "challenges_solo")
@@ -156,7 +450,112 @@ class FlagGenerationManager:
         for fake in fake_flags:
             print(f"   🎭 Fake flag: {fake}")
 
-    def generate_flags(self):
+    def target_folder_for(self, challenge):
+        folder_name = Path(challenge.getFolder()).name
+        return (
+            self.dryrun_dir / self.mode / folder_name
+            if self.dry_run else self.challenges_dir / folder_name
+        )
+
+    def job_options(self, cid, inputs):
+        """Keyword arguments for run_generator(): the generator's seed and its cache slot."""
+        options = {"seed": derive_seed(self.seed, self.mode, cid), "project_root": str(self.project_root)}
+        if self.artifact_cache and cid in CACHEABLE_GENERATORS and cid in inputs:
+            options.update(
+                cache=self.artifact_cache,
+                cache_key=ArtifactCache.key(cid, inputs[cid]),
+                stale=self.manifest.artifacts(cid),
+            )
+        return options
+
+    def run_parallel(self, targets, inputs, jobs):
+        """
+        Run generators in a process pool; results come back in challenge order
+        (not completion order) so the merged JSON is identical to a serial run.
+        """
+        print(f"⚙️ Running {len(targets)} generators across {jobs} worker processes...\n")
+        # Fill the template/tool cache before forking so workers inherit it (no-op if already loaded)
+        SharedInputs.preload(self.project_root / "flag_generators")
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as pool:
+            futures = [
+                pool.submit(run_generator, cid, self.mode, str(folder), True, **self.job_options(cid, inputs))
+                for cid, folder in targets.items()
+            ]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                # Caller stopped early (--validate fail-fast): drop generators that haven't started
+                for future in futures:
+                    future.cancel()
+
+    def select_targets(self):
+        """
+        Decide which challenges to (re)generate.
+        Returns (targets {cid: folder}, unchanged [cid], inputs {cid: fingerprint}).
+        Challenges left out keep their existing flag and unlock entry untouched.
+        """
+        all_targets = {c.getId(): self.target_folder_for(c) for c in self.challenge_list.get_challenges()}
+        if self.only:
+            wanted = set(resolve_challenge_ids(self.only, list(all_targets)))
+            all_targets = {cid: folder for cid, folder in all_targets.items() if cid in wanted}
+
+        targets, unchanged, inputs = {}, [], {}
+        for cid, folder in all_targets.items():
+            if cid in GENERATOR_CLASSES:
+                inputs[cid] = self.manifest.fingerprint(cid, self.mode, derive_seed(self.seed, self.mode, cid))
+            if (
+                self.incremental and not self.dry_run and cid in inputs
+                and cid in self.validation_unlocks
+                and self.admin_challenges_data.get(cid, {}).get("flag")
+                and self.manifest.is_current(cid, inputs[cid], folder)
+            ):
+                unchanged.append(cid)
+            else:
+                targets[cid] = folder
+        return targets, unchanged, inputs
+
+    def start_validation(self, jobs):
+        """ValidatorPool fed as generators finish, or None when not pipelining (--validate)."""
+        if not self.validate:
+            return None
+        if self.dry_run:
+            print("📝 --validate is ignored during a dry run (nothing is written to validate).")
+            return None
+        import validate_all_flags
+        if validate_all_flags.BASE_DIR != self.project_root:
+            print("⚠️ --validate only works on the main project tree; skipping validation.")
+            return None
+        self.skip_validation = validate_all_flags.LIVE_SERVICE_CHECKS
+        print(f"🧪 Pipelined validation: each challenge is validated as soon as it is generated"
+              f"{' (fail-fast)' if self.fail_fast else ''}")
+        return validate_all_flags.ValidatorPool(self.mode, jobs, self.validate_timeout, unlocks=self.validation_unlocks)
+
+    def report_validations(self, results, generator_logs):
+        """Print finished validations; returns the ids that failed."""
+        failed = []
+        for result in results:
+            cid = result["id"]
+            if result["passed"]:
+                print(f"🧪 {cid}: validated ✅ ({result['elapsed']:.2f}s)")
+                continue
+            failed.append(cid)
+            reason = "timed out" if result["timed_out"] else "failed validation"
+            print(f"\n🛑 {cid}: freshly generated artifacts {reason}")
+            print("----- generator output -----")
+            print(generator_logs.get(cid, "").rstrip() or "(none)")
+            print("----- validator output -----")
+            print(result["log"].rstrip() or "(none)")
+            print("----------------------------\n")
+        return failed
+
+    def print_timings(self, timings):
+        print(f"\n⏱️ Per-challenge wall time ({self.mode.upper()}):")
+        for cid, elapsed in timings.items():
+            print(f"   {cid:<22} {elapsed:6.2f}s")
+
+    def generate_flags(self, jobs=1):
+        """Generate every challenge for this mode; returns a summary dict for combined reporting."""
         print(f"\n🌐 Generating flags for {self.mode.upper()} mode...")
 
         if self.dry_run:
@@ -167,67 +566,366 @@ class FlagGenerationManager:
 
         success_count = 0
         fail_count = 0
-
-        for challenge in self.challenge_list.get_challenges():
-            try:
-                folder_name = Path(challenge.getFolder()).name
-                target_folder = (
-                    self.dryrun_dir / self.mode / folder_name
-                    if self.dry_run else self.challenges_dir / folder_name
-                )
-                target_folder.mkdir(parents=True, exist_ok=True)
-
-                print(f"🚀 Generating flag for {challenge.getId()}...")
-
-                generator_cls = GENERATOR_CLASSES.get(challenge.getId())
-                if not generator_cls:
-                    print(f"⚠️ No generator found for {challenge.getId()}. Skipping.\n")
+        cached_count = 0
+        timings = {}
+        generation_failed = []
+        flags = {}
+        started = time.perf_counter()
+
+        targets, unchanged, inputs = self.select_targets()
+        if self.incremental and self.dry_run:
+            print("📝 Incremental mode is ignored during a dry run.")
+        for cid in unchanged:
+            print(f"⏭️ {cid}: inputs and artifacts unchanged, keeping existing flag.")
+        if unchanged:
+            print()
+        if self.seed is not None:
+            print(f"🎲 Seed: {self.seed}" + (" (artifact cache enabled)" if self.artifact_cache else ""))
+
+        validation_pool = self.start_validation(jobs)
+        validated, validation_failed, generator_logs = [], [], {}
+
+        if not targets:
+            results = iter(())
+        elif jobs > 1 or validation_pool:
+            # Pipelined validation needs generator output captured in worker processes,
+            # since validator threads share this process's stdout
+            results = self.run_parallel(targets, inputs, jobs)
+        else:
+            results = (
+                run_generator(cid, self.mode, folder, **self.job_options(cid, inputs))
+                for cid, folder in targets.items()
+            )
+
+        with validation_pool or contextlib.nullcontext():
+            for result in results:
+                cid = result["id"]
+                timings[cid] = result["elapsed"]
+                if result["log"]:
+                    print(result["log"], end="")
+
+                if result["skipped"]:
+                    continue
+                if result["error"]:
+                    print(f"❌ ERROR in {cid}: {result['error']}\n")
+                    fail_count += 1
+                    generation_failed.append(cid)
                     continue
 
-                generator = generator_cls(mode=self.mode)
-                result = generator.generate_flag(target_folder)
-                real_flag = result[0] if isinstance(result, tuple) else result
-                fake_flags = getattr(generator, "last_fake_flags", [])
-                unlock_data = getattr(generator, "metadata", {})
-
-                # Attach common optional metadata if present
-                for attr in ["last_password", "last_zip_password", "last_subdomains", "last_ports"]:
-                    value = getattr(generator, attr, None)
-                    if value:
-                        unlock_data[attr] = value
+                real_flag = result["real_flag"]
+                cached_count += result["cached"]
+                flags[cid] = {"real": real_flag, "fake": list(result["fake_flags"])}
 
                 # Record decoded flag for admin file update
-                self.decoded_flags_by_id[challenge.getId()] = real_flag
+                self.decoded_flags_by_id[cid] = real_flag
 
                 if not self.dry_run:
                     # Update unlocks (admin)
-                    self.validation_unlocks[challenge.getId()] = unlock_data
-                    print(f"✅ {challenge.getId()}: Real flag = {real_flag}\n")
+                    self.validation_unlocks[cid] = result["unlock_data"]
+                    self.manifest.record(cid, inputs[cid], targets[cid], result["artifacts"])
+                    print(f"✅ {cid}: Real flag = {real_flag}\n")
                 else:
-                    print(f"✅ [Dry-Run] {challenge.getId()}: Real flag = {real_flag}")
-                    print(f"📂 Would write files to: {target_folder.relative_to(self.project_root)}\n")
+                    print(f"✅ [Dry-Run] {cid}: Real flag = {real_flag}")
+                    print(f"📂 Would write files to: {targets[cid].relative_to(self.project_root)}\n")
 
-                self.print_flag_report(real_flag, fake_flags)
+                self.print_flag_report(real_flag, result["fake_flags"])
                 success_count += 1
 
-            except Exception as e:
-                print(f"❌ ERROR in {challenge.getId()}: {e}\n")
-                fail_count += 1
+                if validation_pool:
+                    if cid in self.skip_validation:
+                        print(f"⏭️ {cid}: checks the running web hub's services; not validated here")
+                    else:
+                        generator_logs[cid] = result["log"]
+                        validation_pool.submit(cid)
+                    finished = validation_pool.collect()
+                    validated += [r["id"] for r in finished if r["passed"]]
+                    validation_failed += self.report_validations(finished, generator_logs)
+                    if validation_failed and self.fail_fast:
+                        break
+
+            if validation_pool:
+                if not (validation_failed and self.fail_fast):
+                    finished = validation_pool.collect(wait=True)
+                    validated += [r["id"] for r in finished if r["passed"]]
+                    validation_failed += self.report_validations(finished, generator_logs)
+                if validation_failed and self.fail_fast:
+                    results.close()
+                    print(f"🛑 Fail-fast: stopped after {', '.join(validation_failed)} failed validation; "
+                          f"saving what was generated so far.")
 
         if not self.dry_run:
             # Persist admin challenges (decoded flags) and unlocks
             self.save_admin_challenges_with_flags()
             self.save_unlocks()
+            self.manifest.save()
             print(f"🎉 All flags generated and admin files updated for {self.mode.upper()}.")
 
-        print(f"\n📊 Summary ({self.mode.upper()}): {success_count} successful | {fail_count} failed")
+        elapsed = time.perf_counter() - started
+        self.print_timings(timings)
+        print(f"\n📊 Summary ({self.mode.upper()}): {success_count} successful | {fail_count} failed "
+              f"| {len(unchanged)} unchanged | {cached_count} from cache | {elapsed:.2f}s total")
+        if validation_pool:
+            print(f"🧪 Validation ({self.mode.upper()}): {len(validated)} passed | {len(validation_failed)} failed")
+        return {
+            "mode": self.mode, "success": success_count, "failed": fail_count,
+            "unchanged": len(unchanged), "cached": cached_count, "elapsed": elapsed,
+            "flags": flags, "generation_failed": generation_failed, "validation_failed": validation_failed,
+        }
+
+# === Running both modes at once ===
+def preload_shared_inputs(project_root: Path):
+    """Read templates and probe tools once, before any mode/worker process is forked."""
+    tools = SharedInputs.preload(project_root / "flag_generators")
+    missing = [tool for tool, available in tools.items() if not available]
+    print(f"📚 Shared inputs loaded: {', '.join(SharedInputs.TEMPLATE_FILES)}")
+    if missing:
+        print(f"⚠️ Tools not found (matching generators will fail): {', '.join(missing)}")
+
+def run_mode(mode, jobs, manager_options):
+    """Process entry point for one mode; returns (captured_output, summary)."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        random.seed()
+        summary = FlagGenerationManager(mode=mode, **manager_options).generate_flags(jobs=jobs)
+    return buffer.getvalue(), summary
+
+def generate_both_modes(jobs=1, **manager_options):
+    """
+    Run the guided and solo pipelines concurrently in two processes. They write
+    to separate challenge trees and JSON files; gen_17 locks the one file they share
+    (fake_services.json). Each mode's output is printed as a block once it finishes.
+    """
+    modes = ["guided", "solo"]
+    preload_shared_inputs(FlagGenerationManager.find_project_root())
+    print(f"⏳ Generating {' + '.join(m.upper() for m in modes)} concurrently...")
+
+    started = time.perf_counter()
+    summaries = []
+    with ProcessPoolExecutor(max_workers=len(modes)) as pool:
+        futures = [pool.submit(run_mode, mode, jobs, manager_options) for mode in modes]
+        for future in futures:
+            log, summary = future.result()
+            print(log, end="")
+            summaries.append(summary)
+    wall = time.perf_counter() - started
+
+    print("\n📊 Combined Summary:")
+    for summary in summaries:
+        print(f"   {summary['mode'].upper():<7} {summary['success']} successful | {summary['failed']} failed "
+              f"| {summary['unchanged']} unchanged | {summary['cached']} from cache | {summary['elapsed']:.2f}s")
+        if summary["validation_failed"]:
+            print(f"   🛑 {summary['mode'].upper()} failed validation: {', '.join(summary['validation_failed'])}")
+    print(f"   ⏱️ Wall time: {wall:.2f}s (back-to-back would be ~{sum(s['elapsed'] for s in summaries):.2f}s)")
+    return summaries
+
+# === Variant Farm (unique flag set per workstation) ===
+VARIANT_ADMIN_FILES = [
+    "challenges.json", "challenges_solo.json",
+    "validation_unlocks.json", "validation_unlocks_solo.json", "fake_services.json",
+]
+VARIANT_MODES = ["guided", "solo"]
+MAX_UNIQUENESS_ROUNDS = 5
+
+def prepare_variant_tree(project_root: Path, variant_dir: Path):
+    """
+    Lay out a minimal project root a FlagGenerationManager can work in:
+    marker, challenge trees, admin JSON, and a symlink to the shared flag_generators/
+    (so templates resolve to the same paths and hit the SharedInputs cache).
+    """
+    if variant_dir.exists():
+        shutil.rmtree(variant_dir)
+    (variant_dir / "web_version_admin").mkdir(parents=True)
+    (variant_dir / ".ccri_ctf_root").touch()
+    for name in ("challenges", "challenges_solo"):
+        if (project_root / name).is_dir():
+            shutil.copytree(project_root / name, variant_dir / name, ignore=shutil.ignore_patterns("__pycache__"))
+    (variant_dir / "flag_generators").symlink_to(project_root / "flag_generators", target_is_directory=True)
+    for name in VARIANT_ADMIN_FILES:
+        src = project_root / "web_version_admin" / name
+        if src.exists():
+            shutil.copy2(src, variant_dir / "web_version_admin" / name)
+
+def run_variant_mode(variant_dir, mode, seed, only=None):
+    """Pool task: generate one mode inside one variant tree; the log goes to generation_<mode>.log."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        summary = FlagGenerationManager(
+            mode=mode, seed=seed, only=only, use_cache=False, project_root=variant_dir,
+        ).generate_flags(jobs=1)
+    with open(Path(variant_dir) / f"generation_{mode}.log", "a", encoding="utf-8") as f:
+        f.write(buffer.getvalue())
+    return str(variant_dir), mode, summary
+
+def read_variant_flags(variant_dir: Path, mode, generated):
+    """
+    Every flag a variant's admin JSON holds for one mode: {cid: {"real", "fake"}}.
+    Challenges that were never regenerated still carry the copied main-tree flags, so
+    they count too. Fake flags come from this run's generator results (`generated`)
+    plus any fake_flags stored in the unlock data.
+    """
+    suffix = "_solo" if mode == "solo" else ""
+    admin_dir = Path(variant_dir) / "web_version_admin"
+    challenges = load_json(admin_dir / f"challenges{suffix}.json") or {}
+    unlocks = load_json(admin_dir / f"validation_unlocks{suffix}.json") or {}
+
+    flags = {}
+    for cid in sorted(set(challenges) | set(unlocks) | set(generated)):
+        unlock = unlocks.get(cid, {})
+        real = unlock.get("real_flag") or challenges.get(cid, {}).get("flag")
+        fake = list(generated.get(cid, {}).get("fake", []))
+        fake += [flag for flag in unlock.get("fake_flags", []) if flag not in fake]
+        if real or fake:
+            flags[cid] = {"real": real, "fake": fake}
+    return flags
+
+def find_duplicate_flags(variant_flags):
+    """
+    variant_flags: {(variant, mode): {cid: {"real", "fake"}}} in farm order.
+    The first owner of a flag keeps it; returns {(variant, mode): {cid, ...}} that must be redrawn.
+    """
+    owners = {}
+    redo = {}
+    for key, flags in variant_flags.items():
+        for cid, entry in flags.items():
+            for flag in [entry["real"]] + list(entry["fake"]):
+                owner = owners.setdefault(flag, (key, cid))
+                if owner != (key, cid):
+                    redo.setdefault(key, set()).add(cid)
+    return redo
+
+def write_variant_student_json(variant_dir: Path):
+    """Encoded web_version/challenges*.json for the variant, same format as build_web_version.py."""
+    from build_web_version import encode_guided_challenges, encode_solo_challenges
+
+    student_dir = variant_dir / "web_version"
+    student_dir.mkdir(exist_ok=True)
+    for name, encode in (("challenges.json", encode_guided_challenges), ("challenges_solo.json", encode_solo_challenges)):
+        admin_data = load_json(variant_dir / "web_version_admin" / name)
+        if admin_data:
+            with (student_dir / name).open("w", encoding="utf-8") as f:
+                json.dump(encode(admin_data), f, indent=4, ensure_ascii=False)
+
+def generate_variant_farm(count, out_dir=None, jobs=1, seed=None):
+    """
+    Build `count` complete variant trees under out_dir (default: variants/) in one run.
+    Templates, tool checks and generator imports happen once in this process and are
+    inherited by the forked workers; every (variant, mode) pair is a separate pool task.
+    Any flag (real or fake) seen in an earlier variant is redrawn until the whole farm is unique;
+    failed generator runs are retried the same way, and the farm aborts if any still fail.
+    """
+    project_root = FlagGenerationManager.find_project_root()
+    out_dir = Path(out_dir).resolve() if out_dir else project_root / "variants"
+    sys.path.insert(0, str(project_root / "web_version_admin" / "create_website"))  # build_web_version encoders
+    preload_shared_inputs(project_root)
+
+    width = max(2, len(str(count)))
+    variant_dirs = [out_dir / f"variant_{n:0{width}d}" for n in range(1, count + 1)]
+    print(f"🏭 Preparing {count} variant trees in {out_dir}...")
+    for variant_dir in variant_dirs:
+        prepare_variant_tree(project_root, variant_dir)
+
+    def variant_seed(variant_dir, round_no):
+        if seed is None:
+            return None
+        return f"{seed}:{variant_dir.name}" + (f":retry{round_no}" if round_no else "")
+
+    started = time.perf_counter()
+    generated = {(str(v), mode): {} for v in variant_dirs for mode in VARIANT_MODES}
+    failed = {}       # (variant, mode) -> challenge ids whose latest run failed
+    failed_runs = 0   # every failed generator run, across all rounds
+    tasks = [(v, mode, None) for v in variant_dirs for mode in VARIANT_MODES]
+
+    for round_no in range(MAX_UNIQUENESS_ROUNDS + 1):
+        print(f"⚙️ Round {round_no + 1}: {len(tasks)} task(s) across {jobs} worker process(es)...")
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as pool:
+            futures = [
+                pool.submit(run_variant_mode, str(v), mode, variant_seed(v, round_no), only)
+                for v, mode, only in tasks
+            ]
+            for future in futures:
+                variant, mode, summary = future.result()
+                key = (variant, mode)
+                generated[key].update(summary["flags"])
+                failed[key] = (failed.get(key, set()) - set(summary["flags"])) | set(summary["generation_failed"])
+                failed_runs += summary["failed"]
+                print(f"   ✅ {Path(variant).name} {mode.upper():<6} {summary['success']} ok | "
+                      f"{summary['failed']} failed | {summary['elapsed']:.2f}s")
+
+        # Uniqueness is checked over the full admin JSON, so a challenge that failed (and still
+        # holds the main tree's flags) collides across variants instead of slipping through
+        variant_flags = {
+            key: read_variant_flags(key[0], key[1], generated[key]) for key in generated
+        }
+        redo = find_duplicate_flags(variant_flags)
+        for key, cids in failed.items():
+            if cids:
+                redo.setdefault(key, set()).update(cids)
+        if not redo:
+            break
+        if round_no == MAX_UNIQUENESS_ROUNDS:
+            still_failed = sorted(f"{Path(v).name}/{mode}/{cid}" for (v, mode), cids in failed.items() for cid in cids)
+            if still_failed:
+                print(f"❌ ERROR: Generator(s) kept failing: {', '.join(still_failed)}", file=sys.stderr)
+            print("❌ ERROR: Could not make every variant's flags unique.", file=sys.stderr)
+            sys.exit(1)
+        total = sum(len(cids) for cids in redo.values())
+        retries = sum(len(cids) for cids in failed.values())
+        print(f"🔁 Redrawing {total} challenge(s): {retries} failed, "
+              f"{total - retries} share a flag with an earlier variant...")
+        tasks = [(Path(v), mode, sorted(cids)) for (v, mode), cids in redo.items()]
+
+    index = {}
+    for variant_dir in variant_dirs:
+        write_variant_student_json(variant_dir)
+        index[variant_dir.name] = {
+            mode: {cid: entry["real"] for cid, entry in variant_flags[(str(variant_dir), mode)].items()}
+            for mode in VARIANT_MODES
+        }
+    save_json(out_dir / "variant_index.json", index)
+
+    print(f"\n📊 Variant Farm: {count} variants | {failed_runs} failed generator run(s) retried "
+          f"| all flags unique | {time.perf_counter() - started:.2f}s")
+    print(f"🗂️ Flag index: {out_dir / 'variant_index.json'}")
+    return index
 
 # === Entry Point ===
 if __name__ == "__main__":
     try:
         parser = argparse.ArgumentParser()
         parser.add_argument("--dry-run", action="store_true", help="Generate flags without modifying JSON files")
+        parser.add_argument("--jobs", "-j", type=int, default=1,
+                            help="Run generators in N worker processes (0 = one per CPU core)")
+        parser.add_argument("--only", nargs="+", metavar="ID",
+                            help="Regenerate only these challenges (e.g. --only 04 17_NmapScanning or --only 5,6)")
+        parser.add_argument("--incremental", action="store_true",
+                            help="Skip challenges whose generator, templates and artifacts are unchanged")
+        parser.add_argument("--seed", help="Seed for reproducible flags/artifacts (enables the artifact cache)")
+        parser.add_argument("--no-cache", action="store_true",
+                            help="With --seed, always rebuild artifacts instead of using .artifact_cache/")
+        parser.add_argument("--variants", type=int, metavar="N",
+                            help="Batch mode: build N complete variant trees with globally unique flags (full rebuild only)")
+        parser.add_argument("--variants-dir", help="Where to put variant trees (default: variants/)")
+        parser.add_argument("--validate", action="store_true",
+                            help="Validate each challenge as soon as its generator finishes (overlaps with generation)")
+        parser.add_argument("--keep-going", action="store_true",
+                            help="With --validate, keep generating after a validation failure instead of stopping")
+        parser.add_argument("--validate-timeout", type=float, default=60,
+                            help="With --validate, seconds before a validator counts as failed (0 = no limit)")
         args = parser.parse_args()
+        if args.jobs < 1:
+            args.jobs = os.cpu_count() or 1
+
+        if args.variants:
+            # Every variant is a full fresh build; partial, dry, cached or validated farms aren't supported
+            unsupported = [flag for flag, given in (
+                ("--only", args.only), ("--incremental", args.incremental), ("--no-cache", args.no_cache),
+                ("--dry-run", args.dry_run), ("--validate", args.validate),
+            ) if given]
+            if unsupported:
+                parser.error(f"--variants always rebuilds every challenge; it cannot be combined with "
+                             f"{', '.join(unsupported)}")
+            generate_variant_farm(args.variants, out_dir=args.variants_dir, jobs=args.jobs, seed=args.seed)
+            sys.exit(0)
 
         print("🌐 Which mode do you want to generate?")
         print("1️⃣ Guided mode only")
@@ -240,17 +938,25 @@ if __name__ == "__main__":
             if confirm == "y":
                 args.dry_run = True
 
+        manager_options = {
+            "dry_run": args.dry_run, "only": args.only, "incremental": args.incremental,
+            "seed": args.seed, "use_cache": not args.no_cache,
+            "validate": args.validate, "fail_fast": not args.keep_going,
+            "validate_timeout": args.validate_timeout or None,
+        }
         if mode_choice == "1":
-            FlagGenerationManager(dry_run=args.dry_run, mode="guided").generate_flags()
+            summaries = [FlagGenerationManager(mode="guided", **manager_options).generate_flags(jobs=args.jobs)]
         elif mode_choice == "2":
-            FlagGenerationManager(dry_run=args.dry_run, mode="solo").generate_flags()
+            summaries = [FlagGenerationManager(mode="solo", **manager_options).generate_flags(jobs=args.jobs)]
         elif mode_choice == "3":
-            for m in ["guided", "solo"]:
-                FlagGenerationManager(dry_run=args.dry_run, mode=m).generate_flags()
+            summaries = generate_both_modes(jobs=args.jobs, **manager_options)
         else:
             print("❌ Invalid choice. Exiting.")
             sys.exit(1)
 
+        if any(summary["validation_failed"] for summary in summaries):
+            sys.exit(1)
+
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
         input("🔴 Press Enter to close...")
\ No newline at end of file
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Minimal libpcap-format I/O without scapy or tshark.
+
+PcapWriter streams Ethernet/IPv4/TCP records straight to disk: headers are packed
+with struct, IP and TCP checksums are computed, and nothing but the current record
+is held in memory. write_permuted() writes N packets in a shuffled order from just
+an index permutation (4 bytes per packet), so captures with millions of packets
+are built in bounded memory.
+
+PcapReader memory-maps a capture and walks its records once. tcp_streams()
+groups TCP segments into conversations numbered like tshark's tcp.stream and
+reassembles each direction by sequence number; search_streams() runs a regex
+over every reassembled stream and reports (stream id, match) pairs. Payloads
+stay as views into the mapping, so nothing is copied until a stream is searched.
+Used by val_18 and challenges/18_PcapSearch/.explore.py (shipped to student VMs).
+"""
+
+import array
+import mmap
+import re
+import socket
+import struct
+import time
+from pathlib import Path
+
+__all__ = [
+    "LINKTYPE_ETHERNET", "LINKTYPE_RAW", "LINKTYPE_IPV4", "LINKTYPE_LINUX_SLL",
+    "TCP_FLAGS", "PcapError", "PcapWriter", "PcapReader", "TcpStream",
+    "ipv4_checksum", "tcp_frame", "tcp_streams", "search_streams",
+]
+
+PCAP_MAGIC = 0xA1B2C3D4
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_IPV4 = 228
+LINKTYPE_LINUX_SLL = 113
+
+ETHERTYPE_IPV4 = 0x0800
+IPPROTO_TCP = 6
+TCP_FLAGS = {"F": 0x01, "S": 0x02, "R": 0x04, "P": 0x08, "A": 0x10, "U": 0x20, "E": 0x40, "C": 0x80}
+
+WRITE_BUFFER = 1 << 20
+
+
+class PcapError(ValueError):
+    """Not a classic pcap file (pcapng is not supported), or a truncated one."""
+
+
+def ipv4_checksum(data: bytes) -> int:
+    """RFC 1071 one's-complement checksum."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def _mac_for(ip: bytes) -> bytes:
+    """Stable locally-administered MAC derived from an IPv4 address."""
+    return b"\x02\x00" + ip
+
+
+def tcp_frame(src: str, dst: str, sport: int, dport: int, payload: bytes = b"",
+              seq: int = 0, ack: int = 0, flags: str = "PA", window: int = 8192,
+              ttl: int = 64, ip_id: int = 1, ethernet: bool = True) -> bytes:
+    """Build one Ethernet (optional) + IPv4 + TCP frame with valid checksums."""
+    src_ip, dst_ip = socket.inet_aton(src), socket.inet_aton(dst)
+    flag_bits = 0
+    for letter in flags:
+        flag_bits |= TCP_FLAGS[letter]
+
+    tcp_header = struct.pack("!HHIIBBHHH", sport, dport, seq & 0xFFFFFFFF, ack & 0xFFFFFFFF,
+                             5 << 4, flag_bits, window, 0, 0)
+    pseudo = src_ip + dst_ip + struct.pack("!BBH", 0, IPPROTO_TCP, len(tcp_header) + len(payload))
+    tcp_sum = ipv4_checksum(pseudo + tcp_header + payload)
+    tcp_header = tcp_header[:16] + struct.pack("!H", tcp_sum) + tcp_header[18:]
+
+    total_length = 20 + len(tcp_header) + len(payload)
+    ip_header = struct.pack("!BBHHHBBH4s4s", 0x45, 0, total_length, ip_id & 0xFFFF, 0,
+                            ttl, IPPROTO_TCP, 0, src_ip, dst_ip)
+    ip_header = ip_header[:10] + struct.pack("!H", ipv4_checksum(ip_header)) + ip_header[12:]
+
+    frame = ip_header + tcp_header + payload
+    if ethernet:
+        frame = _mac_for(dst_ip) + _mac_for(src_ip) + struct.pack("!H", ETHERTYPE_IPV4) + frame
+    return frame
+
+
+class PcapWriter:
+    """
+    Stream packets into a classic (microsecond) pcap file.
+
+        with PcapWriter(path) as pcap:
+            pcap.write(tcp_frame(...))
+    """
+
+    def __init__(self, path, linktype=LINKTYPE_ETHERNET, snaplen=65535, start_time=None, interval=0.001):
+        self.path = Path(path)
+        self.linktype = linktype
+        self.snaplen = snaplen
+        self.clock = time.time() if start_time is None else start_time
+        self.interval = interval
+        self.count = 0
+        self._file = open(self.path, "wb", buffering=WRITE_BUFFER)
+        self._file.write(struct.pack("<IHHiIII", PCAP_MAGIC, 2, 4, 0, 0, snaplen, linktype))
+
+    def write(self, frame: bytes, ts: float = None):
+        """Append one record; without ts, records are spaced `interval` seconds apart."""
+        if ts is None:
+            ts = self.clock
+            self.clock += self.interval
+        seconds = int(ts)
+        micros = int(round((ts - seconds) * 1_000_000))
+        if micros >= 1_000_000:
+            seconds, micros = seconds + 1, micros - 1_000_000
+        captured = frame[:self.snaplen]
+        self._file.write(struct.pack("<IIII", seconds, micros, len(captured), len(frame)))
+        self._file.write(captured)
+        self.count += 1
+
+    def write_tcp(self, src, dst, sport, dport, payload=b"", **fields):
+        """Shortcut for write(tcp_frame(...)) in this file's link type."""
+        self.write(tcp_frame(src, dst, sport, dport, payload,
+                             ethernet=self.linktype == LINKTYPE_ETHERNET, **fields))
+
+    def write_permuted(self, total: int, build, rng):
+        """
+        Write packets 0..total-1 in a random order: build(index) -> frame is called
+        once per packet, in the shuffled order. Only the index permutation is kept.
+        """
+        order = array.array("I" if total < 1 << 32 else "Q", range(total))
+        rng.shuffle(order)
+        for index in order:
+            self.write(build(index))
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# === Reading ===
+class PcapReader:
+    """
+    Memory-mapped reader for classic pcap files (either byte order, usec or nsec).
+
+        with PcapReader(path) as pcap:
+            for ts, frame in pcap:
+                ...
+
+    Frames are memoryviews into the mapping; they are valid until close().
+    """
+
+    MAGICS = {
+        b"\xd4\xc3\xb2\xa1": ("<", 1e-6), b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+        b"\x4d\x3c\xb2\xa1": ("<", 1e-9), b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+    }
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        if size < 24:
+            self._file.close()
+            raise PcapError(f"{self.path.name} is too short to be a pcap file")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic = bytes(self._view[:4])
+        if magic not in self.MAGICS:
+            self.close()
+            if magic == b"\x0a\x0d\x0d\x0a":
+                raise PcapError(f"{self.path.name} is pcapng; save it as classic pcap (editcap -F pcap)")
+            raise PcapError(f"{self.path.name} is not a pcap file")
+        self.order, self.resolution = self.MAGICS[magic]
+        self.snaplen, self.linktype = struct.unpack(self.order + "II", self._view[16:24])
+
+    def __iter__(self):
+        view, order, resolution = self._view, self.order, self.resolution
+        header = struct.Struct(order + "IIII")
+        pos, end = 24, len(view)
+        while pos + 16 <= end:
+            seconds, fraction, captured, _ = header.unpack_from(view, pos)
+            pos += 16
+            if pos + captured > end:
+                raise PcapError(f"{self.path.name} is truncated at offset {pos}")
+            yield seconds + fraction * resolution, view[pos:pos + captured]
+            pos += captured
+
+    def close(self):
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # frame views are still alive somewhere; the mapping goes away with them
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _ipv4_offset(frame, linktype):
+    """Offset of the IPv4 header inside a frame, or None for anything else."""
+    if linktype in (LINKTYPE_RAW, LINKTYPE_IPV4):
+        offset = 0
+    elif linktype == LINKTYPE_ETHERNET:
+        offset, ethertype = 14, struct.unpack_from("!H", frame, 12)[0] if len(frame) >= 14 else 0
+        while ethertype in (0x8100, 0x88A8) and len(frame) >= offset + 4:  # VLAN tags
+            ethertype = struct.unpack_from("!H", frame, offset + 2)[0]
+            offset += 4
+        if ethertype != ETHERTYPE_IPV4:
+            return None
+    elif linktype == LINKTYPE_LINUX_SLL:
+        if len(frame) < 16 or struct.unpack_from("!H", frame, 14)[0] != ETHERTYPE_IPV4:
+            return None
+        offset = 16
+    else:
+        return None
+    if len(frame) < offset + 20 or frame[offset] >> 4 != 4:
+        return None
+    return offset
+
+
+class TcpStream:
+    """One TCP conversation (both directions), numbered in order of first appearance."""
+
+    __slots__ = ("id", "client", "server", "_segments")
+
+    def __init__(self, stream_id, client, server):
+        self.id = stream_id
+        self.client = client  # (ip, port) that sent the first segment
+        self.server = server
+        self._segments = ([], [])  # per direction: [(seq, payload view), ...]
+
+    def add(self, direction, seq, payload):
+        self._segments[direction].append((seq, payload))
+
+    def data(self, direction) -> bytes:
+        """Reassembled bytes of one direction (0 = client->server), ordered by sequence number."""
+        segments = sorted(self._segments[direction], key=lambda item: item[0])
+        out = bytearray()
+        next_seq = None
+        for seq, payload in segments:
+            if next_seq is not None and seq < next_seq:
+                skip = next_seq - seq  # retransmission / overlap
+                if skip >= len(payload):
+                    continue
+                payload = payload[skip:]
+                seq = next_seq
+            out += payload
+            next_seq = seq + len(payload)
+        return bytes(out)
+
+    def payload(self) -> bytes:
+        """Both directions, client data first (enough for searching)."""
+        return self.data(0) + b"\n" + self.data(1)
+
+
+def tcp_streams(reader: PcapReader) -> list:
+    """
+    One pass over an open capture: every TCP conversation, in order of first
+    appearance, holding views into the reader's mapping (drop them before close()).
+    """
+    streams, by_key = [], {}
+    linktype = reader.linktype
+    for _, frame in reader:
+        ip = _ipv4_offset(frame, linktype)
+        if ip is None or frame[ip + 9] != IPPROTO_TCP:
+            continue
+        tcp = ip + (frame[ip] & 0x0F) * 4
+        if len(frame) < tcp + 20:
+            continue
+        sport, dport, seq = struct.unpack_from("!HHI", frame, tcp)
+        total_length = struct.unpack_from("!H", frame, ip + 2)[0]
+        end = min(len(frame), ip + total_length) if total_length else len(frame)  # drop Ethernet padding
+        payload = frame[tcp + (frame[tcp + 12] >> 4) * 4:end]
+
+        src = (socket.inet_ntoa(frame[ip + 12:ip + 16]), sport)
+        dst = (socket.inet_ntoa(frame[ip + 16:ip + 20]), dport)
+        key = (src, dst) if src <= dst else (dst, src)
+        stream = by_key.get(key)
+        if stream is None:
+            stream = by_key[key] = TcpStream(len(streams), src, dst)
+            streams.append(stream)
+        if len(payload):
+            stream.add(0 if src == stream.client else 1, seq, payload)
+    return streams
+
+
+def search_streams(path, pattern) -> list:
+    """
+    Reassemble every TCP stream in a capture and search it.
+    pattern: bytes/str literal or a compiled regex (bytes or str).
+    Returns [(stream id, matched text), ...] sorted by stream id; each distinct
+    match is listed once per stream.
+    """
+    if isinstance(pattern, str):
+        pattern = re.compile(re.escape(pattern.encode()))
+    elif isinstance(pattern, (bytes, bytearray)):
+        pattern = re.compile(re.escape(bytes(pattern)))
+    elif isinstance(pattern.pattern, str):
+        pattern = re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+
+    with PcapReader(path) as reader:
+        try:
+            return _search(tcp_streams(reader), pattern)
+        except PcapError as e:
+            # Re-raise without the traceback, whose frames still hold views of the mapping
+            error = PcapError(str(e))
+    raise error
+
+
+def _search(streams, pattern):
+    # Separate frame so the stream views are gone before the reader unmaps the file
+    results = []
+    for stream in streams:
+        seen = set()
+        for match in pattern.finditer(stream.payload()):
+            text = match.group(0).decode("latin-1")
+            if text not in seen:
+                seen.add(text)
+                results.append((stream.id, text))
+    return results
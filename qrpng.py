@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Pure-Python QR codes as PNG files: encode + render, and read + decode.
+
+Used by the QR Codes challenge (12_QRCodes): gen_12 renders all five qr_NN.png
+files in one batch without spawning qrencode, and val_12 decodes them without
+zbarimg. Defaults follow `qrencode -o file.png TEXT` (ECC level L, 3 px modules,
+4-module quiet zone, 1-bit PNG). NumPy speeds up rendering when it is installed.
+
+The decoder is meant for clean, axis-aligned images such as these (not camera
+photos): it samples the module grid, reads the format bits, unmasks the data and
+checks every Reed-Solomon block before parsing the segments.
+Versions 1-10 are supported (up to 174 alphanumeric / 119 byte characters at L).
+"""
+
+import struct
+import zlib
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # Optional: pure-Python rendering works everywhere
+    np = None
+
+__all__ = ["QRError", "encode", "render_png", "write_png", "write_batch", "decode_png", "decode_file"]
+
+ALPHANUMERIC = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+ECC_FORMAT_BITS = {"L": 1, "M": 0, "Q": 3, "H": 2}
+MAX_VERSION = 10
+
+# version -> level -> (EC codewords per block, [(block count, data codewords per block), ...])
+EC_BLOCKS = {
+    1: {"L": (7, [(1, 19)]), "M": (10, [(1, 16)]), "Q": (13, [(1, 13)]), "H": (17, [(1, 9)])},
+    2: {"L": (10, [(1, 34)]), "M": (16, [(1, 28)]), "Q": (22, [(1, 22)]), "H": (28, [(1, 16)])},
+    3: {"L": (15, [(1, 55)]), "M": (26, [(1, 44)]), "Q": (18, [(2, 17)]), "H": (22, [(2, 13)])},
+    4: {"L": (20, [(1, 80)]), "M": (18, [(2, 32)]), "Q": (26, [(2, 24)]), "H": (16, [(4, 9)])},
+    5: {"L": (26, [(1, 108)]), "M": (24, [(2, 43)]), "Q": (18, [(2, 15), (2, 16)]), "H": (22, [(2, 11), (2, 12)])},
+    6: {"L": (18, [(2, 68)]), "M": (16, [(4, 27)]), "Q": (24, [(4, 19)]), "H": (28, [(4, 15)])},
+    7: {"L": (20, [(2, 78)]), "M": (18, [(4, 31)]), "Q": (18, [(2, 14), (4, 15)]), "H": (26, [(4, 13), (1, 14)])},
+    8: {"L": (24, [(2, 97)]), "M": (22, [(2, 38), (2, 39)]), "Q": (22, [(4, 18), (2, 19)]), "H": (26, [(4, 14), (2, 15)])},
+    9: {"L": (30, [(2, 116)]), "M": (22, [(3, 36), (2, 37)]), "Q": (20, [(4, 16), (4, 17)]), "H": (24, [(4, 12), (4, 13)])},
+    10: {"L": (18, [(2, 68), (2, 69)]), "M": (26, [(4, 43), (1, 44)]), "Q": (24, [(6, 19), (2, 20)]), "H": (28, [(6, 15), (2, 16)])},
+}
+ALIGNMENT_CENTERS = {
+    1: [], 2: [6, 18], 3: [6, 22], 4: [6, 26], 5: [6, 30],
+    6: [6, 34], 7: [6, 22, 38], 8: [6, 24, 42], 9: [6, 26, 46], 10: [6, 28, 50],
+}
+MODE_NUMERIC, MODE_ALPHANUMERIC, MODE_BYTE = 1, 2, 4
+COUNT_BITS = {MODE_NUMERIC: (10, 12), MODE_ALPHANUMERIC: (9, 11), MODE_BYTE: (8, 16)}  # v1-9, v10
+
+MASKS = [
+    lambda x, y: (x + y) % 2 == 0,
+    lambda x, y: y % 2 == 0,
+    lambda x, y: x % 3 == 0,
+    lambda x, y: (x + y) % 3 == 0,
+    lambda x, y: (x // 3 + y // 2) % 2 == 0,
+    lambda x, y: x * y % 2 + x * y % 3 == 0,
+    lambda x, y: (x * y % 2 + x * y % 3) % 2 == 0,
+    lambda x, y: ((x + y) % 2 + x * y % 3) % 2 == 0,
+]
+
+
+class QRError(ValueError):
+    """Data that does not fit, or an image that cannot be decoded."""
+
+
+# === Reed-Solomon over GF(256), polynomial 0x11D ===
+_EXP = [0] * 512
+_LOG = [0] * 256
+_value = 1
+for _i in range(255):
+    _EXP[_i] = _value
+    _LOG[_value] = _i
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11D
+for _i in range(255, 512):
+    _EXP[_i] = _EXP[_i - 255]
+
+
+def _gf_mul(a, b):
+    return 0 if a == 0 or b == 0 else _EXP[_LOG[a] + _LOG[b]]
+
+
+def _rs_generator(degree):
+    poly = [1]
+    for i in range(degree):
+        nxt = [0] * (len(poly) + 1)
+        for j, coef in enumerate(poly):
+            nxt[j] ^= coef
+            nxt[j + 1] ^= _gf_mul(coef, _EXP[i])
+        poly = nxt
+    return poly
+
+
+def _rs_remainder(data, degree):
+    generator = _rs_generator(degree)
+    remainder = [0] * degree
+    for byte in data:
+        factor = byte ^ remainder.pop(0)
+        remainder.append(0)
+        for i in range(degree):
+            remainder[i] ^= _gf_mul(generator[i + 1], factor)
+    return remainder
+
+
+def _rs_syndromes_ok(block, degree):
+    """True if every syndrome of a data+EC block is zero (no detectable errors)."""
+    for i in range(degree):
+        acc = 0
+        root = _EXP[i]
+        for byte in block:
+            acc = _gf_mul(acc, root) ^ byte
+        if acc:
+            return False
+    return True
+
+
+# === Matrix construction ===
+def _bch(value, generator, bits):
+    remainder = value << bits
+    top = generator.bit_length() - 1
+    for shift in range(remainder.bit_length() - 1, top - 1, -1):
+        if remainder >> shift & 1:
+            remainder ^= generator << (shift - top)
+    return (value << bits) | remainder
+
+
+def _format_bits(level, mask):
+    return _bch(ECC_FORMAT_BITS[level] << 3 | mask, 0x537, 10) ^ 0x5412
+
+
+def _format_positions(size):
+    """Both copies of the 15 format bits as (x, y) lists, bit 0 first."""
+    first = [(8, i) for i in range(6)] + [(8, 7), (8, 8), (7, 8)] + [(14 - i, 8) for i in range(9, 15)]
+    second = [(size - 1 - i, 8) for i in range(8)] + [(8, size - 15 + i) for i in range(8, 15)]
+    return first, second
+
+
+class _Matrix:
+    """Module grid plus the map of function (non-data) modules for one version."""
+
+    def __init__(self, version):
+        self.version = version
+        self.size = version * 4 + 17
+        self.dark = [[False] * self.size for _ in range(self.size)]
+        self.function = [[False] * self.size for _ in range(self.size)]
+        self._draw_function_patterns()
+
+    def set(self, x, y, dark):
+        self.dark[y][x] = dark
+        self.function[y][x] = True
+
+    def _draw_function_patterns(self):
+        size = self.size
+        for i in range(size):
+            self.set(6, i, i % 2 == 0)
+            self.set(i, 6, i % 2 == 0)
+
+        for cx, cy in ((3, 3), (size - 4, 3), (3, size - 4)):
+            for dy in range(-4, 5):
+                for dx in range(-4, 5):
+                    x, y = cx + dx, cy + dy
+                    if 0 <= x < size and 0 <= y < size:
+                        self.set(x, y, max(abs(dx), abs(dy)) not in (2, 4))
+
+        centers = ALIGNMENT_CENTERS[self.version]
+        last = len(centers) - 1
+        for i, cx in enumerate(centers):
+            for j, cy in enumerate(centers):
+                if (i, j) in ((0, 0), (0, last), (last, 0)):
+                    continue
+                for dy in range(-2, 3):
+                    for dx in range(-2, 3):
+                        self.set(cx + dx, cy + dy, max(abs(dx), abs(dy)) != 1)
+
+        self.draw_format(0)  # reserve; real bits are written after masking
+        self.set(8, size - 8, True)
+
+        if self.version >= 7:
+            bits = _bch(self.version, 0x1F25, 12)
+            for i in range(18):
+                dark = bool(bits >> i & 1)
+                a, b = size - 11 + i % 3, i // 3
+                self.set(a, b, dark)
+                self.set(b, a, dark)
+
+    def draw_format(self, bits):
+        for positions in _format_positions(self.size):
+            for i, (x, y) in enumerate(positions):
+                self.set(x, y, bool(bits >> i & 1))
+
+    def data_positions(self):
+        """Yield (x, y) of every data module in placement (zigzag) order."""
+        size = self.size
+        right = size - 1
+        while right >= 1:
+            if right == 6:
+                right = 5
+            upward = (right + 1) & 2 == 0
+            for vert in range(size):
+                y = size - 1 - vert if upward else vert
+                for x in (right, right - 1):
+                    if not self.function[y][x]:
+                        yield x, y
+            right -= 2
+
+    def apply_mask(self, mask):
+        test = MASKS[mask]
+        for y in range(self.size):
+            row, function = self.dark[y], self.function[y]
+            for x in range(self.size):
+                if not function[x] and test(x, y):
+                    row[x] = not row[x]
+
+
+def _penalty(grid):
+    size = len(grid)
+    score = 0
+    lines = grid + [list(col) for col in zip(*grid)]
+    finder_like = ([1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0], [0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1])
+    for line in lines:
+        run = 1
+        for i in range(1, size):
+            if line[i] == line[i - 1]:
+                run += 1
+            else:
+                if run >= 5:
+                    score += run - 2
+                run = 1
+        if run >= 5:
+            score += run - 2
+        bits = [int(v) for v in line]
+        for i in range(size - 10):
+            if bits[i:i + 11] in finder_like:
+                score += 40
+    for y in range(size - 1):
+        for x in range(size - 1):
+            if grid[y][x] == grid[y][x + 1] == grid[y + 1][x] == grid[y + 1][x + 1]:
+                score += 3
+    total = size * size
+    dark = sum(sum(row) for row in grid)
+    score += ((abs(dark * 20 - total * 10) + total - 1) // total - 1) * 10
+    return score
+
+
+# === Encoding ===
+def _segment(text):
+    if text.isdigit() and text.isascii():
+        return MODE_NUMERIC, len(text), text
+    if all(c in ALPHANUMERIC for c in text):
+        return MODE_ALPHANUMERIC, len(text), text
+    data = text.encode("utf-8")
+    return MODE_BYTE, len(data), data
+
+
+def _segment_bits(mode, count, payload, version):
+    bits = [(mode, 4), (count, COUNT_BITS[mode][0 if version <= 9 else 1])]
+    if mode == MODE_NUMERIC:
+        for i in range(0, len(payload), 3):
+            chunk = payload[i:i + 3]
+            bits.append((int(chunk), len(chunk) * 3 + 1))
+    elif mode == MODE_ALPHANUMERIC:
+        for i in range(0, len(payload) - 1, 2):
+            bits.append((ALPHANUMERIC.index(payload[i]) * 45 + ALPHANUMERIC.index(payload[i + 1]), 11))
+        if len(payload) % 2:
+            bits.append((ALPHANUMERIC.index(payload[-1]), 6))
+    else:
+        bits.extend((byte, 8) for byte in payload)
+    return bits
+
+
+def _data_capacity(version, level):
+    return sum(count * size for count, size in EC_BLOCKS[version][level][1])
+
+
+def encode(text, level="L"):
+    """Return the QR symbol for text as a list of rows of booleans (True = dark)."""
+    level = level.upper()
+    mode, count, payload = _segment(text)
+
+    for version in range(1, MAX_VERSION + 1):
+        fields = _segment_bits(mode, count, payload, version)
+        used = sum(width for _, width in fields)
+        capacity = _data_capacity(version, level) * 8
+        if used <= capacity and count < 1 << COUNT_BITS[mode][0 if version <= 9 else 1]:
+            break
+    else:
+        raise QRError(f"{len(text)} characters do not fit in a version {MAX_VERSION}-{level} QR code")
+
+    bitstring = "".join(format(value, f"0{width}b") for value, width in fields)
+    bitstring += "0" * min(4, capacity - len(bitstring))
+    bitstring += "0" * (-len(bitstring) % 8)
+    data = [int(bitstring[i:i + 8], 2) for i in range(0, len(bitstring), 8)]
+    pad = 0xEC
+    while len(data) < capacity // 8:
+        data.append(pad)
+        pad ^= 0xEC ^ 0x11
+
+    ec_len, groups = EC_BLOCKS[version][level]
+    blocks, ec_blocks, offset = [], [], 0
+    for block_count, block_size in groups:
+        for _ in range(block_count):
+            block = data[offset:offset + block_size]
+            offset += block_size
+            blocks.append(block)
+            ec_blocks.append(_rs_remainder(block, ec_len))
+
+    codewords = []
+    for i in range(max(len(b) for b in blocks)):
+        codewords.extend(b[i] for b in blocks if i < len(b))
+    for i in range(ec_len):
+        codewords.extend(b[i] for b in ec_blocks)
+
+    matrix = _Matrix(version)
+    bits = "".join(format(byte, "08b") for byte in codewords)
+    for i, (x, y) in enumerate(matrix.data_positions()):
+        matrix.dark[y][x] = i < len(bits) and bits[i] == "1"
+
+    best = None
+    for mask in range(8):
+        matrix.apply_mask(mask)
+        matrix.draw_format(_format_bits(level, mask))
+        score = _penalty(matrix.dark)
+        if best is None or score < best[0]:
+            best = (score, mask)
+        matrix.apply_mask(mask)  # XOR again to undo
+
+    matrix.apply_mask(best[1])
+    matrix.draw_format(_format_bits(level, best[1]))
+    return matrix.dark
+
+
+# === PNG rendering ===
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def render_png(modules, scale=3, margin=4) -> bytes:
+    """1-bit grayscale PNG bytes for a module grid (what qrencode writes by default)."""
+    count = len(modules) + 2 * margin
+    width = count * scale
+
+    if np is not None:
+        grid = np.zeros((count, count), dtype=bool)
+        grid[margin:margin + len(modules), margin:margin + len(modules)] = np.array(modules, dtype=bool)
+        pixels = np.repeat(np.repeat(~grid, scale, axis=0), scale, axis=1)
+        rows = np.packbits(pixels, axis=1)
+        raw = np.hstack([np.zeros((width, 1), dtype=np.uint8), rows]).tobytes()
+    else:
+        row_bytes = (width + 7) // 8
+        blank = b"\x00" + b"\xff" * row_bytes
+        lines = [blank] * (margin * scale)
+        for row in modules:
+            bits = "1" * (margin * scale)
+            bits += "".join("0" * scale if dark else "1" * scale for dark in row)
+            bits += "1" * (margin * scale + row_bytes * 8 - width)
+            line = b"\x00" + int(bits, 2).to_bytes(row_bytes, "big")
+            lines.extend([line] * scale)
+        lines.extend([blank] * (margin * scale))
+        raw = b"".join(lines)
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, width, 1, 0, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(raw, 9))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def write_png(path, text, level="L", scale=3, margin=4) -> Path:
+    """Encode text and write it as a QR PNG, like `qrencode -o path text`."""
+    path = Path(path)
+    path.write_bytes(render_png(encode(text, level), scale, margin))
+    return path
+
+
+def write_batch(items, level="L", scale=3, margin=4) -> list:
+    """Render a batch of (path, text) pairs in one pass; returns the written paths."""
+    return [write_png(path, text, level, scale, margin) for path, text in items]
+
+
+# === PNG reading ===
+def _read_png_gray(data):
+    """Return (width, height, rows) with rows of 0-255 luminance values (transparent = white)."""
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise QRError("not a PNG file")
+    pos, idat, palette, transparency = 8, [], None, None
+    header = None
+    while pos < len(data):
+        length, tag = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if tag == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif tag == b"PLTE":
+            palette = [tuple(body[i:i + 3]) for i in range(0, len(body), 3)]
+        elif tag == b"tRNS":
+            transparency = body
+        elif tag == b"IDAT":
+            idat.append(body)
+        elif tag == b"IEND":
+            break
+    if header is None:
+        raise QRError("PNG has no IHDR chunk")
+
+    width, height, depth, color, _, _, interlace = header
+    if interlace:
+        raise QRError("interlaced PNGs are not supported")
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color]
+    bits_per_pixel = channels * depth
+    stride = (width * bits_per_pixel + 7) // 8
+    bpp = max(1, bits_per_pixel // 8)
+    raw = zlib.decompress(b"".join(idat))
+
+    rows, previous = [], bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        kind = raw[start]
+        line = bytearray(raw[start + 1:start + 1 + stride])
+        for i in range(stride):
+            left = line[i - bpp] if i >= bpp else 0
+            up = previous[i]
+            if kind == 1:
+                line[i] = (line[i] + left) & 0xFF
+            elif kind == 2:
+                line[i] = (line[i] + up) & 0xFF
+            elif kind == 3:
+                line[i] = (line[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                upleft = previous[i - bpp] if i >= bpp else 0
+                p = left + up - upleft
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - upleft)
+                line[i] = (line[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else upleft)) & 0xFF
+        previous = line
+
+        if depth < 8:
+            per_byte = 8 // depth
+            top = (1 << depth) - 1
+            samples = [(line[x // per_byte] >> (8 - depth * (x % per_byte + 1))) & top for x in range(width)]
+        elif depth == 16:
+            samples = list(line[0::2])
+            top = 255
+        else:
+            samples = list(line)
+            top = 255
+
+        values = []
+        for x in range(width):
+            if color == 3:
+                index = samples[x]
+                r, g, b = palette[index]
+                alpha = transparency[index] if transparency and index < len(transparency) else 255
+                lum = (r * 299 + g * 587 + b * 114) // 1000
+            elif color in (0, 4):
+                lum = samples[x * channels] * 255 // top
+                alpha = samples[x * channels + 1] if color == 4 else 255
+            else:
+                r, g, b = samples[x * channels:x * channels + 3]
+                lum = (r * 299 + g * 587 + b * 114) // 1000
+                alpha = samples[x * channels + 3] if color == 6 else 255
+            values.append(255 - (255 - lum) * alpha // 255)
+        rows.append(values)
+    return width, height, rows
+
+
+# === Decoding ===
+def _sample_grid(width, height, rows):
+    dark = [[value < 128 for value in row] for row in rows]
+    dark_rows = [y for y in range(height) if any(dark[y])]
+    if not dark_rows:
+        raise QRError("no dark modules found")
+    top, bottom = dark_rows[0], dark_rows[-1]
+    dark_cols = [x for x in range(width) if any(dark[y][x] for y in dark_rows)]
+    left, right = dark_cols[0], dark_cols[-1]
+
+    run = 0
+    while left + run <= right and dark[top][left + run]:
+        run += 1
+    module = run / 7.0
+    size = round((right - left + 1) / module)
+    if size < 21 or (size - 17) % 4 or round((bottom - top + 1) / module) != size:
+        raise QRError(f"could not locate a QR symbol (estimated {size} modules)")
+    module = (right - left + 1) / size
+
+    return [
+        [dark[int(top + (y + 0.5) * module)][int(left + (x + 0.5) * module)] for x in range(size)]
+        for y in range(size)
+    ]
+
+
+def _read_format(grid):
+    size = len(grid)
+    candidates = [(level, mask, _format_bits(level, mask)) for level in ECC_FORMAT_BITS for mask in range(8)]
+    best = None
+    for positions in _format_positions(size):
+        value = sum(int(grid[y][x]) << i for i, (x, y) in enumerate(positions))
+        for level, mask, bits in candidates:
+            distance = bin(value ^ bits).count("1")
+            if best is None or distance < best[0]:
+                best = (distance, level, mask)
+    if best[0] > 3:
+        raise QRError("format information is unreadable")
+    return best[1], best[2]
+
+
+def _parse_segments(data, version):
+    bits = "".join(format(byte, "08b") for byte in data)
+    pos, text = 0, []
+
+    def take(count):
+        nonlocal pos
+        chunk = bits[pos:pos + count]
+        pos += count
+        if len(chunk) < count:
+            raise QRError("data segment runs past the end of the symbol")
+        return int(chunk, 2)
+
+    while pos + 4 <= len(bits):
+        mode = take(4)
+        if mode == 0:
+            break
+        if mode not in COUNT_BITS:
+            raise QRError(f"unsupported segment mode {mode}")
+        count = take(COUNT_BITS[mode][0 if version <= 9 else 1])
+        if mode == MODE_NUMERIC:
+            digits = []
+            for i in range(0, count, 3):
+                width = min(3, count - i)
+                digits.append(str(take(width * 3 + 1)).zfill(width))
+            text.append("".join(digits))
+        elif mode == MODE_ALPHANUMERIC:
+            chars = []
+            for _ in range(count // 2):
+                value = take(11)
+                chars.append(ALPHANUMERIC[value // 45] + ALPHANUMERIC[value % 45])
+            if count % 2:
+                chars.append(ALPHANUMERIC[take(6)])
+            text.append("".join(chars))
+        else:
+            text.append(bytes(take(8) for _ in range(count)).decode("utf-8", errors="replace"))
+    return "".join(text)
+
+
+def decode_png(data: bytes) -> str:
+    """Decode the QR symbol in PNG bytes and return its text; raises QRError."""
+    grid = _sample_grid(*_read_png_gray(data))
+    version = (len(grid) - 17) // 4
+    if version > MAX_VERSION:
+        raise QRError(f"version {version} symbols are not supported")
+    level, mask = _read_format(grid)
+
+    matrix = _Matrix(version)
+    test = MASKS[mask]
+    bits = [grid[y][x] != test(x, y) for x, y in matrix.data_positions()]
+    codewords = [
+        int("".join("1" if b else "0" for b in bits[i:i + 8]), 2)
+        for i in range(0, len(bits) - 7, 8)
+    ]
+
+    ec_len, groups = EC_BLOCKS[version][level]
+    sizes = [size for count, size in groups for _ in range(count)]
+    blocks = [[] for _ in sizes]
+    pos = 0
+    for i in range(max(sizes)):
+        for b, size in enumerate(sizes):
+            if i < size:
+                blocks[b].append(codewords[pos])
+                pos += 1
+    for i in range(ec_len):
+        for block in blocks:
+            block.append(codewords[pos])
+            pos += 1
+
+    data = []
+    for block, size in zip(blocks, sizes):
+        if not _rs_syndromes_ok(block, ec_len):
+            raise QRError("Reed-Solomon check failed (damaged or misread symbol)")
+        data.extend(block[:size])
+    return _parse_segments(data, version)
+
+
+def decode_file(path) -> str:
+    """decode_png() for a file on disk."""
+    return decode_png(Path(path).read_bytes())
@@ -326,7 +326,7 @@ def main():
     apt_packages = [
         "git", "python3", "python3-pip", "python3-venv", "gcc", "build-essential",
         "fonts-noto-color-emoji",
-        "python3-markdown", "python3-scapy",
+        "python3-markdown", "python3-scapy", "python3-waitress",
         "curl", "lsof", "xdg-utils", "libglib2.0-bin",
         "gnome-terminal",
         "exiftool", "zbar-tools", "hashcat", "unzip", "libmcrypt4",
@@ -348,6 +348,7 @@ def main():
 
     print("\n✅ Base environment ready.")
     print("   • Admin run (dev):   python3 web_version_admin/server.py")
+    print("   • Admin run (prod):  python3 web_version_admin/server.py --production")
     print("   • Student run:       python3 ccri_ctf.pyz")
     print("   • Desktop launcher:  Updated with custom icon! Double-click to run.")
     print("\n🎉 Setup complete!")
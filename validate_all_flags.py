@@ -4,10 +4,25 @@ import os
 import subprocess
 import json
 import shutil
+import argparse
+import hashlib
+import importlib
+import io
+import queue
+import socket
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # not on Linux/macOS: sandboxes fall back to hardlinks/copies
+    fcntl = None
+
 # === Paths ===
-BASE_DIR = Path.cwd()
+BASE_DIR = Path(__file__).resolve().parent
 CHALLENGES_ROOT = BASE_DIR / "challenges"
 CHALLENGES_JSON = BASE_DIR / "web_version_admin/challenges.json"
 CHALLENGES_JSON_SOLO = BASE_DIR / "web_version_admin/challenges_solo.json"
@@ -15,6 +30,10 @@ UNLOCKS_GUIDED = BASE_DIR / "web_version_admin/validation_unlocks.json"
 UNLOCKS_SOLO = BASE_DIR / "web_version_admin/validation_unlocks_solo.json"
 VALIDATION_MODULES = BASE_DIR / "validation_helpers"
 SANDBOX_ROOT = BASE_DIR / ".validation_sandbox"
+REPORT_DIR = BASE_DIR / "validation_reports"
+VALIDATION_CACHE = BASE_DIR / "web_version_admin/validation_cache.json"
+VALIDATION_CACHE_SOLO = BASE_DIR / "web_version_admin/validation_cache_solo.json"
+DEFAULT_TIMEOUT = 60  # seconds per challenge
 
 # === Mapping: challenge_id -> validation_helpers/module.py ===
 CHALLENGE_TO_MODULE = {
@@ -38,6 +57,32 @@ CHALLENGE_TO_MODULE = {
     "18_PcapSearch": "val_18_pcap_search"
 }
 
+# === Root-level modules a validator imports (part of its cache fingerprint) ===
+VALIDATOR_SHARED_MODULES = {
+    "05_ArchivePassword": ["zipcrypto.py"],
+    "06_Hashcat": ["zipcrypto.py"],
+    "10_Metadata": ["exifjpeg.py"],
+    "12_QRCodes": ["qrpng.py"],
+    "18_PcapSearch": ["pcapio.py"],
+}
+
+# Validators that probe the running web hub's services rather than files on disk:
+# never cached, and skipped by generate_all_flags.py --validate
+LIVE_SERVICE_CHECKS = {"17_NmapScanning"}
+
+# === Which sandbox files may share data with the real challenge folder ===
+# Reflinks are copy-on-write, so any file can be one. A hardlink shares the real file's
+# inode, so only large binary artifacts (which validators and their tools only read)
+# are hardlinked; everything else is copied. In this interpreter, break_sandbox_link()
+# also detaches a hardlink before the file is opened for writing.
+HARDLINK_MIN_SIZE = 256 * 1024
+HARDLINK_SUFFIXES = {".pcap", ".jpg", ".jpeg", ".png", ".zip"}
+ELF_MAGIC = b"\x7fELF"
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_TRUNC
+
+# Linux FICLONE ioctl (copy-on-write clone on btrfs/XFS); fcntl only exposes it from Python 3.12
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
 def choose_mode():
     print("\n🎛️ Choose validation mode:")
     print("[1] Guided (default)")
@@ -55,24 +100,118 @@ def load_unlock_data(mode):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+class SandboxLinker:
+    """
+    Populates sandboxes without copying large artifacts: each file is reflinked when
+    the filesystem supports it, else hardlinked if it is a large binary artifact,
+    else copied. The first method that fails with "not supported" is not retried
+    for later files.
+    """
+
+    def __init__(self):
+        self.reflink = fcntl is not None
+        self.hardlink = True
+        self.counts = {"reflink": 0, "hardlink": 0, "copy": 0, "detached": 0}
+
+    @staticmethod
+    def linkable(src: Path) -> bool:
+        """Large pcap/image/zip/ELF files; small or text files are always copied."""
+        if src.stat().st_size < HARDLINK_MIN_SIZE:
+            return False
+        if src.suffix.lower() in HARDLINK_SUFFIXES:
+            return True
+        with open(src, "rb") as f:
+            return f.read(4) == ELF_MAGIC
+
+    def _reflink(self, src: Path, dst: Path) -> bool:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return True
+            except OSError:
+                self.reflink = False
+        dst.unlink()
+        return False
+
+    def place(self, src: Path, dst: Path):
+        """Put src at dst; only linkable() artifacts may end up sharing an inode with src."""
+        if self.reflink and self._reflink(src, dst):
+            shutil.copystat(src, dst)
+            self.counts["reflink"] += 1
+            return
+        if self.hardlink and self.linkable(src):
+            try:
+                os.link(src, dst)
+                self.counts["hardlink"] += 1
+                return
+            except OSError:
+                self.hardlink = False
+        shutil.copy2(src, dst)
+        self.counts["copy"] += 1
+
+LINKER = SandboxLinker()
+
+def sandbox_root(mode) -> Path:
+    """
+    .validation_sandbox/<mode>-<pid>: one tree per mode and process, so the guided and
+    solo pools of generate_all_flags.py --validate (or two runs at once) never build or
+    delete each other's sandboxes.
+    """
+    return SANDBOX_ROOT / f"{mode}-{os.getpid()}"
+
+def _process_running(pid) -> bool:
+    if pid == os.getpid() or os.name != "posix":
+        return True  # signal 0 only probes on POSIX; elsewhere never treat a tree as stale
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def prune_sandboxes():
+    """Remove sandbox trees left behind by processes that are no longer running."""
+    if not SANDBOX_ROOT.is_dir():
+        return
+    for entry in SANDBOX_ROOT.iterdir():
+        owner = entry.name.rpartition("-")[2]
+        if owner.isdigit() and _process_running(int(owner)):
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink()
+
 def setup_sandbox(challenge_id, mode):
-    """Copy challenge folder into a temp sandbox for validation."""
+    """
+    Mirror the challenge folder into .validation_sandbox/<mode>-<pid>/<id> for validation.
+    Directories are recreated (so new files stay private to the sandbox); files are
+    reflinked, hardlinked (large binary artifacts only) or copied by SandboxLinker.
+    """
     folder_name = "challenges_solo" if mode == "solo" else "challenges"
     src = BASE_DIR / folder_name / challenge_id
-    sandbox_dir = SANDBOX_ROOT / challenge_id
+    sandbox_dir = sandbox_root(mode) / challenge_id
 
     if sandbox_dir.exists():
         shutil.rmtree(sandbox_dir)
     sandbox_dir.parent.mkdir(parents=True, exist_ok=True)
 
-    if src.exists():
-        shutil.copytree(src, sandbox_dir)
-    else:
+    if not src.exists():
         print(f"⚠️ Challenge folder not found: {src}")
+        return sandbox_dir
+
+    for dirpath, dirnames, filenames in os.walk(src, followlinks=True):
+        rel_dir = Path(dirpath).relative_to(src)
+        target_dir = sandbox_dir / rel_dir
+        target_dir.mkdir(exist_ok=True)
+        for name in filenames:
+            LINKER.place(Path(dirpath) / name, target_dir / name)
 
     return sandbox_dir
 
-def run_validator(challenge_id, mode):
+def run_validator(challenge_id, mode, timeout=None):
+    """Run one validator in its own interpreter (--isolated)."""
     module_name = CHALLENGE_TO_MODULE.get(challenge_id)
     if not module_name:
         print(f"⚠️  Skipped: No module mapping for {challenge_id}")
@@ -97,45 +236,437 @@ def run_validator(challenge_id, mode):
             cwd=VALIDATION_MODULES,
             env=env,
             stdout=sys.stdout,
-            stderr=sys.stderr
+            stderr=sys.stderr,
+            timeout=timeout
         )
         return result.returncode == 0
+    except subprocess.TimeoutExpired:
+        print(f"⏱️ {challenge_id} timed out after {timeout}s")
+        return False
+    except Exception as e:
+        print(f"❌ Exception running validator: {e}")
+        return False
+
+# === In-process runner ===
+# Per-worker-thread state: "buffer" (captured output) and "tools" (programs started)
+CAPTURE = threading.local()
+
+def record_tool(event, args):
+    """Audit hook: note every program a validator thread starts via subprocess."""
+    if event != "subprocess.Popen":
+        return
+    tools = getattr(CAPTURE, "tools", None)
+    if tools is None:
+        return
+    argv = args[1]
+    if isinstance(argv, (str, bytes)):
+        argv = [argv]
+    argv = [os.fsdecode(arg) for arg in argv]
+    if len(argv) > 2 and argv[1] == "-c" and Path(argv[0]).name in ("sh", "bash"):
+        argv = argv[2].split()  # shell=True: report the command, not /bin/sh
+    if argv:
+        tools.add(Path(argv[0]).name)
+
+def break_sandbox_link(event, args):
+    """
+    Audit hook: before a hardlinked sandbox file is opened for writing in this
+    interpreter, replace it with a private copy so the real challenge file is untouched.
+    """
+    if event != "open" or not isinstance(args[2], int) or not args[2] & WRITE_FLAGS:
+        return
+    path = args[0]
+    if isinstance(path, int):
+        return
+    path = os.path.abspath(os.fsdecode(path))
+    if not path.startswith(str(SANDBOX_ROOT) + os.sep):
+        return
+    try:
+        if os.stat(path).st_nlink < 2:
+            return
+    except OSError:
+        return
+    private = f"{path}.detach-{threading.get_ident()}"
+    shutil.copy2(path, private)
+    os.replace(private, path)
+    LINKER.counts["detached"] += 1
+
+sys.addaudithook(record_tool)
+sys.addaudithook(break_sandbox_link)
+
+class ThreadOutput(io.TextIOBase):
+    """
+    Stands in for sys.stdout / sys.stderr while validators run in threads: text
+    written by a worker goes to that worker's capture buffer, everything else to
+    the real stream. Lets each challenge's output be printed as one block.
+    """
+
+    def __init__(self, stream, capture):
+        self.stream = stream
+        self.capture = capture  # threading.local shared by stdout and stderr
+
+    def write(self, text):
+        buffer = getattr(self.capture, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def import_validators():
+    """Import every validator module once; returns {challenge_id: module}."""
+    if str(VALIDATION_MODULES) not in sys.path:
+        sys.path.insert(0, str(VALIDATION_MODULES))
+    modules = {}
+    for challenge_id, module_name in CHALLENGE_TO_MODULE.items():
+        try:
+            modules[challenge_id] = importlib.import_module(module_name)
+        except (Exception, SystemExit) as e:
+            print(f"⚠️  Could not import {module_name}: {e}")
+    return modules
+
+def validate_in_thread(challenge_id, mode, module, unlocks):
+    """Worker body: sandbox + validate() with this thread's mode/sandbox/unlocks. Returns a result dict."""
+    import common  # validation_helpers/common.py, importable after import_validators()
+
+    result = {"id": challenge_id, "passed": False, "elapsed": 0.0, "timed_out": False, "log": "", "tools": []}
+    CAPTURE.buffer = io.StringIO()
+    CAPTURE.tools = set()
+    start = time.perf_counter()
+    try:
+        print(f"🔍 Validating {challenge_id} using {module.__name__}...")
+        sandbox = setup_sandbox(challenge_id, mode)
+        with common.validation_context(mode, sandbox, unlocks):
+            result["passed"] = bool(module.validate(mode=mode, challenge_id=challenge_id))
+    except SystemExit as e:
+        # Shared helpers still sys.exit() on fatal errors (e.g. find_project_root)
+        result["passed"] = e.code in (0, None)
     except Exception as e:
         print(f"❌ Exception running validator: {e}")
+    finally:
+        result["elapsed"] = time.perf_counter() - start
+        result["log"] = CAPTURE.buffer.getvalue()
+        result["tools"] = sorted(CAPTURE.tools)
+        CAPTURE.buffer = CAPTURE.tools = None
+    return result
+
+class ValidatorPool:
+    """
+    Validators running on daemon worker threads in this interpreter. Modules are
+    imported once and every worker shares one unlocks dict (which may keep growing,
+    as in generate_all_flags.py --validate). submit() queues a challenge; collect()
+    returns the results that have finished since the last call. A validator that
+    runs past `timeout` seconds is reported as failed and abandoned, and its worker
+    is replaced rather than awaited.
+
+        with ValidatorPool(mode, jobs) as pool:
+            pool.submit("02_Base64")
+            results = pool.collect(wait=True)
+    """
+
+    def __init__(self, mode, jobs, timeout=None, unlocks=None):
+        self.mode = mode
+        self.jobs = max(1, jobs)
+        self.timeout = timeout
+        self.modules = import_validators()
+        prune_sandboxes()
+        self.unlocks = load_unlock_data(mode) if unlocks is None else unlocks
+        self.tasks, self.done = queue.Queue(), queue.Queue()
+        self.started = {}    # challenge_id -> time a worker picked it up
+        self.pending = set()  # submitted, not yet collected
+        self.workers = 0
+        self.streams = None
+
+    def __enter__(self):
+        self.streams = (sys.stdout, sys.stderr)
+        sys.stdout, sys.stderr = ThreadOutput(sys.stdout, CAPTURE), ThreadOutput(sys.stderr, CAPTURE)
+        return self
+
+    def __exit__(self, *exc):
+        sys.stdout, sys.stderr = self.streams
+        for _ in range(self.workers):
+            self.tasks.put(None)
         return False
 
+    def _worker(self):
+        while True:
+            challenge_id = self.tasks.get()
+            if challenge_id is None:
+                return
+            self.started[challenge_id] = time.perf_counter()
+            self.done.put(validate_in_thread(challenge_id, self.mode, self.modules[challenge_id], self.unlocks))
+
+    def _start_worker(self):
+        threading.Thread(target=self._worker, daemon=True).start()
+        self.workers += 1
+
+    def submit(self, challenge_id):
+        self.pending.add(challenge_id)
+        if challenge_id not in self.modules:
+            self.done.put({"id": challenge_id, "passed": False, "elapsed": 0.0, "timed_out": False,
+                           "log": f"⚠️  Skipped: No validator module for {challenge_id}\n", "tools": []})
+            return
+        self.tasks.put(challenge_id)
+        if self.workers < self.jobs:
+            self._start_worker()
+
+    def collect(self, wait=False):
+        """Finished results (timeouts included); with wait=True, block until nothing is pending."""
+        results = []
+        while self.pending:
+            try:
+                result = self.done.get(timeout=0.1 if wait else 0)
+                if result["id"] in self.pending:  # late results from abandoned workers are dropped
+                    self.pending.discard(result["id"])
+                    results.append(result)
+            except queue.Empty:
+                pass
+            if self.timeout:
+                now = time.perf_counter()
+                for challenge_id, began in list(self.started.items()):
+                    if challenge_id in self.pending and now - began > self.timeout:
+                        self.pending.discard(challenge_id)
+                        results.append({"id": challenge_id, "passed": False, "elapsed": now - began,
+                                        "timed_out": True, "tools": [],
+                                        "log": f"⏱️ {challenge_id} timed out after {self.timeout}s; abandoned\n"})
+                        self._start_worker()
+            if not wait and self.done.empty():
+                break
+        return results
+
+def run_in_process(challenge_ids, mode, jobs, timeout=None, unlocks=None):
+    """Validate challenges with a ValidatorPool, printing each one's output as it finishes. Returns results in challenge order."""
+    results = {}
+    with ValidatorPool(mode, min(jobs, len(challenge_ids)) or 1, timeout, unlocks) as pool:
+        for challenge_id in challenge_ids:
+            pool.submit(challenge_id)
+        while pool.pending:
+            for result in pool.collect(wait=True):
+                results[result["id"]] = result
+                pool.streams[0].write("\n" + result["log"])
+                pool.streams[0].flush()
+    return [results[challenge_id] for challenge_id in challenge_ids]
+
+# === Result cache & reports ===
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def unlocks_path(mode) -> Path:
+    return UNLOCKS_SOLO if mode == "solo" else UNLOCKS_GUIDED
+
+class ValidationCache:
+    """
+    Per-mode record of challenges that passed: {cid: {"fingerprint": {...}, "tools": [...]}}.
+    The fingerprint covers the validator, common.py and shared module sources, the
+    challenge's unlock entry and flag source, and the sha256 of every file in its
+    challenge folder. A challenge whose fingerprint matches its last pass is
+    reported as a cached pass without running the validator again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries = {}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def fingerprint(challenge_id, mode, unlocks) -> dict:
+        folder = BASE_DIR / ("challenges_solo" if mode == "solo" else "challenges") / challenge_id
+        artifacts = {}
+        if folder.is_dir():
+            for path in sorted(folder.rglob("*")):
+                if path.is_file() and "__pycache__" not in path.parts:
+                    artifacts[path.relative_to(folder).as_posix()] = sha256_file(path)
+
+        sources = [VALIDATION_MODULES / f"{CHALLENGE_TO_MODULE.get(challenge_id, '')}.py",
+                   VALIDATION_MODULES / "common.py"]
+        sources += [BASE_DIR / name for name in VALIDATOR_SHARED_MODULES.get(challenge_id, [])]
+        return {
+            "mode": mode,
+            "flag_source": unlocks_path(mode).relative_to(BASE_DIR).as_posix(),
+            "unlock": unlocks.get(challenge_id),
+            "sources": {path.relative_to(BASE_DIR).as_posix(): sha256_file(path) if path.is_file() else None
+                        for path in sources},
+            "artifacts": artifacts,
+        }
+
+    def lookup(self, challenge_id, fingerprint):
+        """The recorded pass for this exact fingerprint, or None."""
+        if challenge_id in LIVE_SERVICE_CHECKS:
+            return None
+        entry = self.entries.get(challenge_id)
+        return entry if entry and entry.get("fingerprint") == fingerprint else None
+
+    def record(self, result, fingerprint):
+        if result["passed"] and result["id"] not in LIVE_SERVICE_CHECKS:
+            self.entries[result["id"]] = {"fingerprint": fingerprint, "tools": result.get("tools")}
+        else:
+            self.entries.pop(result["id"], None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2)
+
+def result_status(result) -> str:
+    if result.get("cached"):
+        return "cached"
+    if result["timed_out"]:
+        return "timed_out"
+    return "passed" if result["passed"] else "failed"
+
+def write_reports(results, fingerprints, mode, runner, wall_time, report_dir: Path):
+    """Write validation_<mode>.json and validation_<mode>.xml (JUnit) for this run."""
+    report_dir.mkdir(parents=True, exist_ok=True)
+    host = socket.gethostname()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    flag_source = unlocks_path(mode).relative_to(BASE_DIR).as_posix()
+
+    challenges = []
+    for result in results:
+        fingerprint = fingerprints.get(result["id"], {})
+        challenges.append({
+            "id": result["id"],
+            "status": result_status(result),
+            "duration": round(result["elapsed"], 4),
+            "tools": result.get("tools"),  # None = not recorded (--isolated)
+            "flag_source": fingerprint.get("flag_source", flag_source),
+            "artifacts": fingerprint.get("artifacts", {}),
+            "log": result.get("log", ""),
+        })
+    report = {
+        "host": host,
+        "timestamp": timestamp,
+        "mode": mode,
+        "runner": runner,
+        "flag_source": flag_source,
+        "duration": round(wall_time, 4),
+        "summary": {status: sum(1 for c in challenges if c["status"] == status)
+                    for status in ("passed", "cached", "failed", "timed_out")},
+        "challenges": challenges,
+    }
+    json_path = report_dir / f"validation_{mode}.json"
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    failures = sum(1 for c in challenges if c["status"] in ("failed", "timed_out"))
+    suite = ET.Element("testsuite", {
+        "name": f"ccri-validation-{mode}", "hostname": host, "timestamp": timestamp,
+        "tests": str(len(challenges)), "failures": str(failures), "errors": "0", "skipped": "0",
+        "time": f"{wall_time:.3f}",
+    })
+    for challenge in challenges:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": f"validate_all_flags.{mode}", "name": challenge["id"], "time": f"{challenge['duration']:.3f}",
+        })
+        properties = ET.SubElement(case, "properties")
+        for name, value in (("status", challenge["status"]), ("flag_source", challenge["flag_source"]),
+                            ("tools", ",".join(challenge["tools"] or []))):
+            ET.SubElement(properties, "property", {"name": name, "value": value})
+        for rel_path, digest in challenge["artifacts"].items():
+            ET.SubElement(properties, "property", {"name": f"sha256:{rel_path}", "value": digest})
+        if challenge["status"] in ("failed", "timed_out"):
+            failure = ET.SubElement(case, "failure", {"message": challenge["status"].replace("_", " ")})
+            failure.text = challenge["log"]
+        elif challenge["log"]:
+            ET.SubElement(case, "system-out").text = challenge["log"]
+    tree = ET.ElementTree(ET.Element("testsuites"))
+    tree.getroot().append(suite)
+    ET.indent(tree)
+    xml_path = report_dir / f"validation_{mode}.xml"
+    tree.write(xml_path, encoding="utf-8", xml_declaration=True)
+    return json_path, xml_path
+
+def print_summary(results):
+    print("\n⏱️ Per-challenge time:")
+    for result in results:
+        status = {"cached": "♻️", "timed_out": "⏱️", "passed": "✅", "failed": "❌"}[result_status(result)]
+        print(f"   {status} {result['id']:<22} {result['elapsed']:6.2f}s")
+
 def main():
+    parser = argparse.ArgumentParser(description="Validate every generated flag.")
+    parser.add_argument("mode", nargs="?", help="guided or solo (asked interactively if omitted)")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Validators to run at once (default 0 = one per CPU core)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before a challenge counts as failed (default {DEFAULT_TIMEOUT}, 0 = none)")
+    parser.add_argument("--isolated", action="store_true",
+                        help="Run each validator in its own interpreter, one after another")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Run every validator even if its inputs match a previous pass")
+    parser.add_argument("--report-dir", default=str(REPORT_DIR),
+                        help="Where to write validation_<mode>.json / .xml (default: validation_reports/)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        args.jobs = os.cpu_count() or 1
+
     print("🚦 CCRI STEMDay Master Validator\n" + "=" * 40)
-    mode = sys.argv[1].lower() if len(sys.argv) > 1 else choose_mode()
+    mode = args.mode.lower() if args.mode else choose_mode()
 
     if mode not in ("guided", "solo"):
         print("❌ Invalid mode. Use: validate_all_flags.py [guided|solo]")
         sys.exit(1)
 
-    # Clean sandbox
-    if SANDBOX_ROOT.exists():
-        shutil.rmtree(SANDBOX_ROOT)
-    SANDBOX_ROOT.mkdir()
+    # Clean up after earlier runs, leaving any that are still validating alone
+    prune_sandboxes()
 
     print(f"🛠️ Mode: {mode.upper()}")
-    challenges = load_challenges(mode)
+    challenges = list(load_challenges(mode))
+    started = time.perf_counter()
 
-    success = 0
-    fail = 0
+    unlocks = load_unlock_data(mode)
+    cache = ValidationCache(VALIDATION_CACHE_SOLO if mode == "solo" else VALIDATION_CACHE)
+    fingerprints = {challenge_id: ValidationCache.fingerprint(challenge_id, mode, unlocks)
+                    for challenge_id in challenges}
+    cached = {}
+    if not args.no_cache:
+        for challenge_id in challenges:
+            entry = cache.lookup(challenge_id, fingerprints[challenge_id])
+            if entry:
+                print(f"♻️ {challenge_id}: unchanged since its last pass (cached pass)")
+                cached[challenge_id] = {"id": challenge_id, "passed": True, "elapsed": 0.0, "timed_out": False,
+                                        "cached": True, "tools": entry.get("tools"), "log": ""}
+    pending = [challenge_id for challenge_id in challenges if challenge_id not in cached]
 
-    for challenge_id in challenges:
-        if run_validator(challenge_id, mode):
-            success += 1
-        else:
-            fail += 1
+    if args.isolated:
+        runner = "isolated"
+        ran = []
+        for challenge_id in pending:
+            began = time.perf_counter()
+            passed = run_validator(challenge_id, mode, timeout=args.timeout or None)
+            ran.append({"id": challenge_id, "passed": passed, "elapsed": time.perf_counter() - began,
+                        "timed_out": False, "tools": None})
+    else:
+        runner = "in-process"
+        print(f"⚙️ Running {len(pending)} validators in-process ({args.jobs} at a time)")
+        ran = run_in_process(pending, mode, args.jobs, timeout=args.timeout or None, unlocks=unlocks)
+
+    for result in ran:
+        cache.record(result, fingerprints[result["id"]])
+    cache.save()
+    by_id = {**cached, **{result["id"]: result for result in ran}}
+    results = [by_id[challenge_id] for challenge_id in challenges]
+
+    success = sum(1 for result in results if result["passed"])
+    fail = len(results) - success
+    print_summary(results)
+    print(f"🔗 Sandbox files: {LINKER.counts['reflink']} reflinked | {LINKER.counts['hardlink']} hardlinked "
+          f"| {LINKER.counts['copy']} copied | {LINKER.counts['detached']} detached before a write")
 
     print("\n📊 Validation Summary:")
-    print(f"✅ {success} passed")
+    print(f"✅ {success} passed ({len(cached)} cached)")
     print(f"❌ {fail} failed")
+    wall_time = time.perf_counter() - started
+    print(f"⏱️ Wall time: {wall_time:.2f}s")
+    json_path, xml_path = write_reports(results, fingerprints, mode, runner, wall_time, Path(args.report_dir))
+    print(f"🧾 Reports: {json_path} | {xml_path}")
     if fail == 0:
         print("\n🎉 All challenges validated successfully!")
     else:
         print("\n🚨 Some challenges failed. Check messages above.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,8 +1,30 @@
 import os
 import sys
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+# Per-thread overrides set by validate_all_flags.py when it runs validators in-process
+_context = threading.local()
+
+@contextmanager
+def validation_context(mode: str, sandbox=None, unlocks: dict = None):
+    """
+    Run validators in this thread as if CCRI_MODE / CCRI_SANDBOX were set, using an
+    already-loaded unlocks dict instead of re-reading the JSON file.
+    """
+    previous = getattr(_context, "values", None)
+    _context.values = {"mode": mode, "sandbox": str(sandbox) if sandbox else None, "unlocks": unlocks}
+    try:
+        yield
+    finally:
+        _context.values = previous
+
+def _context_value(key):
+    values = getattr(_context, "values", None)
+    return values.get(key) if values else None
+
 def find_project_root() -> Path:
     dir_path = Path(__file__).resolve().parent
     while dir_path != Path("/"):
@@ -13,12 +35,19 @@ def find_project_root() -> Path:
     sys.exit(1)
 
 def get_ctf_mode() -> str:
-    env = os.environ.get("CCRI_MODE")
+    env = _context_value("mode") or os.environ.get("CCRI_MODE")
     if env in ("guided", "solo"):
         return env
     return "guided"  # Default to guided if not explicitly set
 
+def get_sandbox():
+    """Sandbox copy of the challenge folder to validate, or None to use the real one."""
+    return _context_value("sandbox") or os.environ.get("CCRI_SANDBOX")
+
 def load_unlock_data(project_root: Path, challenge_id: str) -> dict:
+    preloaded = _context_value("unlocks")
+    if preloaded is not None:
+        return preloaded.get(challenge_id, {})
     mode = get_ctf_mode()
     filename = "validation_unlocks_solo.json" if mode == "solo" else "validation_unlocks.json"
     path = project_root / "web_version_admin" / filename
@@ -38,3 +67,10 @@ def get_challenge_file(project_root: Path, challenge_id: str, unlock_data: dict)
     else:
         file_rel = f"challenges_solo/{challenge_id}/encoded.txt"
     return project_root / file_rel
+
+def add_project_root_to_path() -> Path:
+    """Make the root-level shared modules (e.g. zipcrypto.py) importable from a validator."""
+    root = find_project_root()
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    return root
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
-import os
 import sys
 import subprocess
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "01_Stego"
 
@@ -38,7 +37,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     default_rel = f"{base_path}/{challenge_id}/squirrel.jpg"
     file_rel = unlock.get("challenge_file", default_rel)
 
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         image_path = Path(sandbox_override) / "squirrel.jpg"
     else:
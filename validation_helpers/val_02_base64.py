@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
 import base64
-import os
 import sys
 from pathlib import Path
-from common import find_project_root, load_unlock_data
+from common import find_project_root, load_unlock_data, get_sandbox
 
 def decode_file(input_path: Path) -> str:
     try:
@@ -23,7 +22,7 @@ def validate(mode="guided", challenge_id="02_Base64") -> bool:
     else:
         file_rel = f"challenges_solo/{challenge_id}/encoded.txt"
 
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         input_path = Path(sandbox_override) / "encoded.txt"
     else:
@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
 import sys
-import os
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "03_ROT13"
 
@@ -26,7 +25,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     base_path = "challenges_solo" if mode == "solo" else "challenges"
 
     # 🧪 Check for sandbox override
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         input_path = Path(sandbox_override) / "cipher.txt"
     else:
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
 import sys
-import os
 import re
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "04_Vigenere"
 
@@ -43,7 +42,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     file_rel = f"challenges_solo/{challenge_id}/cipher.txt" if mode == "solo" else data.get("challenge_file", f"challenges/{challenge_id}/cipher.txt")
 
     # 🧪 Sandbox override support
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         input_path = Path(sandbox_override) / "cipher.txt"
     else:
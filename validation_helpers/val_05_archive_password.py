@@ -1,38 +1,28 @@
 #!/usr/bin/env python3
 import sys
-import os
+import base64
+import binascii
 import shutil
-import subprocess
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, add_project_root_to_path, get_sandbox
 
-def decode_base64(path: Path) -> str:
+add_project_root_to_path()
+from zipcrypto import read_encrypted_zip, ZipCryptoError
+
+def decode_base64(data: bytes) -> str:
     try:
-        result = subprocess.run(
-            ["base64", "--decode", str(path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print("❌ Base64 decoding failed.", file=sys.stderr)
-        print(e.stderr, file=sys.stderr)
+        return base64.b64decode(data).decode("utf-8").strip()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        print(f"❌ Base64 decoding failed: {e}", file=sys.stderr)
         return None
 
-def unzip_with_password(zip_path: Path, password: str, extract_to: Path) -> bool:
+def unzip_with_password(zip_path: Path, password: str) -> dict:
+    """Decrypt the archive in memory; returns {name: bytes} or None."""
     try:
-        subprocess.run(
-            ["unzip", "-o", "-P", password, str(zip_path), "-d", str(extract_to)],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True
-        )
-        return True
-    except subprocess.CalledProcessError:
-        print(f"❌ Failed to extract {zip_path.name} with given password.", file=sys.stderr)
-        return False
+        return read_encrypted_zip(zip_path, password)
+    except ZipCryptoError as e:
+        print(f"❌ Failed to extract {zip_path.name} with given password: {e}", file=sys.stderr)
+        return None
 
 def validate(mode="guided", challenge_id="05_ArchivePassword") -> bool:
     root = find_project_root()
@@ -41,7 +31,7 @@ def validate(mode="guided", challenge_id="05_ArchivePassword") -> bool:
     zip_password = data.get("last_zip_password")
 
     base_folder = "challenges_solo" if mode == "solo" else "challenges"
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
@@ -53,21 +43,20 @@ def validate(mode="guided", challenge_id="05_ArchivePassword") -> bool:
         challenge_dir = root / base_folder / challenge_id
 
     zip_path = challenge_dir / "secret.zip"
-    extract_dir = challenge_dir
-    extracted_b64 = extract_dir / "message_encoded.txt"
 
     if not zip_path.exists():
         print(f"❌ Zip file missing: {zip_path}", file=sys.stderr)
         return False
 
-    if not unzip_with_password(zip_path, zip_password, extract_dir):
+    members = unzip_with_password(zip_path, zip_password)
+    if members is None:
         return False
 
-    if not extracted_b64.exists():
-        print(f"❌ Extracted file missing: {extracted_b64}", file=sys.stderr)
+    if "message_encoded.txt" not in members:
+        print("❌ Archive member missing: message_encoded.txt", file=sys.stderr)
         return False
 
-    decoded = decode_base64(extracted_b64)
+    decoded = decode_base64(members["message_encoded.txt"])
     if decoded is None:
         return False
 
@@ -1,72 +1,46 @@
 #!/usr/bin/env python3
 import sys
-import subprocess
-import shutil
-import os
+import base64
+import binascii
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, add_project_root_to_path, get_sandbox
+
+add_project_root_to_path()
+from zipcrypto import read_encrypted_zip, ZipCryptoError
 
 CHALLENGE_ID = "06_Hashcat"
 
-def decode_base64(input_path: Path, output_path: Path):
+def decode_base64(data: bytes):
     try:
-        result = subprocess.run(
-            ["base64", "--decode", str(input_path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        output_path.write_text(result.stdout, encoding="utf-8")
-        return result.stdout.strip()
-    except subprocess.CalledProcessError:
+        return base64.b64decode(data).decode("utf-8").strip()
+    except (binascii.Error, UnicodeDecodeError):
         return None
 
-def flatten_directory(directory: Path):
-    for root, _, files in os.walk(directory):
-        for f in files:
-            src = Path(root) / f
-            dst = directory / f
-            if src != dst:
-                if dst.exists():
-                    dst.unlink()
-                src.rename(dst)
-
-def extract_and_decode(passwords, segments_dir: Path, extracted_dir: Path, decoded_dir: Path):
-    extracted_dir.mkdir(exist_ok=True)
-    decoded_dir.mkdir(exist_ok=True)
-
+def extract_and_decode(passwords, segments_dir: Path) -> list[list[str]]:
+    """Decrypt part1.zip, part2.zip, ... in memory and return each segment's decoded lines."""
+    lines_per_part = []
     for idx, password in enumerate(passwords, 1):
         zip_file = segments_dir / f"part{idx}.zip"
         if not zip_file.exists():
             print(f"⚠️ Missing segment: {zip_file}", file=sys.stderr)
             continue
-        subprocess.run(
-            ["unzip", "-P", password, str(zip_file), "-d", str(extracted_dir)],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        flatten_directory(extracted_dir)
-        for f in extracted_dir.iterdir():
-            if f.name.startswith("encoded_"):
-                out_path = decoded_dir / f"decoded_{f.name}"
-                decode_base64(f, out_path)
-
-def assemble_flag(decoded_dir: Path, output_file: Path) -> list[str]:
-    decoded_files = sorted(
-        [f for f in decoded_dir.iterdir() if f.name.endswith(".txt")],
-        key=lambda f: int(''.join(filter(str.isdigit, f.name)))
-    )
-    lines_per_file = [f.read_text(encoding="utf-8").splitlines() for f in decoded_files]
+        try:
+            members = read_encrypted_zip(zip_file, password)
+        except ZipCryptoError as e:
+            print(f"⚠️ Could not extract {zip_file.name}: {e}", file=sys.stderr)
+            continue
+        for name in sorted(members):
+            if name.startswith("encoded_"):
+                decoded = decode_base64(members[name])
+                if decoded is not None:
+                    lines_per_part.append(decoded.splitlines())
+    return lines_per_part
+
+def assemble_flag(lines_per_part: list[list[str]]) -> list[str]:
     candidate_flags = []
-
-    with output_file.open("w", encoding="utf-8") as f_out:
-        for i in range(5):
-            parts = [(lines[i] if i < len(lines) else "MISSING") for lines in lines_per_file]
-            flag = "-".join(parts)
-            candidate_flags.append(flag)
-            f_out.write(flag + "\n")
-
+    for i in range(5):
+        parts = [(lines[i] if i < len(lines) else "MISSING") for lines in lines_per_part]
+        candidate_flags.append("-".join(parts))
     return candidate_flags
 
 def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
@@ -88,26 +62,18 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     sorted_parts = sorted(zip_to_password.items(), key=lambda x: int(''.join(filter(str.isdigit, x[0]))))
     passwords = [pw for _, pw in sorted_parts]
 
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
     else:
         base_path = "challenges_solo" if mode == "solo" else "challenges"
         challenge_dir = root / base_path / challenge_id
 
-    segments = challenge_dir / "segments"
-    extracted = challenge_dir / "extracted"
-    decoded = challenge_dir / "decoded_segments"
-    assembled = challenge_dir / "assembled_flag.txt"
-
+    flags = assemble_flag(extract_and_decode(passwords, challenge_dir / "segments"))
 
-    for d in [extracted, decoded]:
-        if d.exists():
-            shutil.rmtree(d)
-        d.mkdir(parents=True, exist_ok=True)
-
-    extract_and_decode(passwords, segments, extracted, decoded)
-    flags = assemble_flag(decoded, assembled)
+    # Only write output in the sandbox, for debugging or verification
+    if sandbox_override:
+        (challenge_dir / "assembled_flag.txt").write_text("\n".join(flags) + "\n", encoding="utf-8")
 
     if flag in flags:
         print(f"✅ Validation success: flag {flag} found")
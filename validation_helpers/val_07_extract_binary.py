@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
-import os
 import sys
 import subprocess
 import re
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "07_ExtractBinary"
 REGEX_PATTERN = r'\b([A-Z0-9]{4}-){2}[A-Z0-9]{4}\b'
@@ -36,7 +35,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
 
     base_folder = "challenges_solo" if mode == "solo" else "challenges"
     binary_path = root / base_folder / challenge_id / "hidden_flag"
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         extracted_path = Path(sandbox_override) / "extracted_strings.txt"
     else:
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
-import os
 import sys
 import re
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "08_FakeAuthLog"
 REGEX_PATTERN = r"\bCCRI-[A-Z0-9]{4}-\d{4}\b"
@@ -22,7 +21,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     expected_flag = data.get("real_flag")
 
     base_folder = "challenges_solo" if mode == "solo" else "challenges"
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         log_path = Path(sandbox_override) / "auth.log"
     else:
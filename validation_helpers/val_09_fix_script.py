@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
-import os
 import sys
 import subprocess
 import shutil
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "09_FixScript"
 
@@ -43,7 +42,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     correct_op = data.get("correct_operator", "+")
 
     base_path = "challenges_solo" if mode == "solo" else "challenges"
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
-import os
 import sys
-import subprocess
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, add_project_root_to_path, get_sandbox
+
+add_project_root_to_path()
+from exifjpeg import read_file_tags, ExifError
 
 CHALLENGE_ID = "10_Metadata"
 
@@ -13,7 +14,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     expected_flag = data.get("real_flag")
 
     base_path = "challenges_solo" if mode == "solo" else "challenges"
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
 
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
@@ -28,21 +29,16 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
         return False
 
     try:
-        result = subprocess.run(
-            ["exiftool", str(target_image)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        if expected_flag in result.stdout:
-            print(f"✅ Validation success: found flag {expected_flag}")
-            return True
-        else:
-            print(f"❌ Validation failed: flag {expected_flag} not found in metadata.", file=sys.stderr)
-            return False
-    except subprocess.CalledProcessError:
-        print("❌ ERROR: exiftool failed to run.", file=sys.stderr)
+        tags = read_file_tags(target_image)
+    except (ExifError, OSError) as e:
+        print(f"❌ ERROR: Could not read EXIF metadata: {e}", file=sys.stderr)
+        return False
+
+    if any(isinstance(value, str) and expected_flag in value for value in tags.values()):
+        print(f"✅ Validation success: found flag {expected_flag}")
+        return True
+    else:
+        print(f"❌ Validation failed: flag {expected_flag} not found in metadata.", file=sys.stderr)
         return False
 
 if __name__ == "__main__":
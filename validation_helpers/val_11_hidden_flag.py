@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
-import os
 import sys
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "11_HiddenFlag"
 
@@ -24,7 +23,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     data = load_unlock_data(root, challenge_id)
     flag = data.get("real_flag")
 
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
 
     if sandbox_override:
         junk_dir = Path(sandbox_override) / "junk"
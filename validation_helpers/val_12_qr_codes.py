@@ -1,23 +1,19 @@
 #!/usr/bin/env python3
-import os
 import sys
-import subprocess
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, add_project_root_to_path, get_sandbox
+
+add_project_root_to_path()
+from qrpng import decode_file, QRError
 
 CHALLENGE_ID = "12_QRCodes"
 
 def decode_qr(file_path: Path) -> str:
+    """Decode a QR PNG in-process (no zbarimg); returns "" if it cannot be read."""
     try:
-        result = subprocess.run(
-            ["zbarimg", str(file_path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True
-        )
-        return result.stdout.strip()
-    except FileNotFoundError:
-        print("❌ ERROR: zbarimg is not installed.", file=sys.stderr)
+        return decode_file(file_path)
+    except (QRError, OSError) as e:
+        print(f"⚠️ Could not decode {file_path.name}: {e}", file=sys.stderr)
         return ""
 
 def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
@@ -25,7 +21,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     data = load_unlock_data(root, challenge_id)
     expected_flag = data.get("real_flag")
 
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
     else:
@@ -1,15 +1,9 @@
 #!/usr/bin/env python3
-import os
 import sys
 import json
 import base64
 from pathlib import Path
-try:
-    from validation_helpers.common import find_project_root, load_unlock_data, get_ctf_mode
-except ImportError:
-    # Fallback if running directly from the validation_helpers directory
-    sys.path.append(str(Path(__file__).resolve().parent.parent))
-    from validation_helpers.common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "13_HTTPHeaders"
 
@@ -55,7 +49,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
         
     flag = data.get("real_flag")
 
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
     else:
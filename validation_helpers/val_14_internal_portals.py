@@ -1,52 +1,37 @@
 #!/usr/bin/env python3
 import sys
 import json
-import os
 import base64
 import re
 from pathlib import Path
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "14_InternalPortals"
 
-def load_unlock_data():
-    mode = os.environ.get("CCRI_MODE", "guided")
-    base_dir = Path(__file__).resolve().parent.parent
-    filename = "validation_unlocks_solo.json" if mode == "solo" else "validation_unlocks.json"
-    path = base_dir / "web_version_admin" / filename
-    
-    if not path.exists():
-        print(f"❌ Error: Unlock file not found at {path}")
-        sys.exit(1)
-        
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data[CHALLENGE_ID]
-    except Exception as e:
-        print(f"❌ Error loading unlock data: {e}")
-        sys.exit(1)
-
-def validate():
-    print(f"🕵️  FORENSIC ANALYZER: {CHALLENGE_ID}")
+def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
+    print(f"🕵️  FORENSIC ANALYZER: {challenge_id}")
     
     # 1. Get Expected Flag
-    unlock_data = load_unlock_data()
-    expected_flag = unlock_data["real_flag"]
+    root = find_project_root()
+    unlock_data = load_unlock_data(root, challenge_id)
+    expected_flag = unlock_data.get("real_flag")
+    if not expected_flag:
+        print(f"❌ Error: no unlock data for {challenge_id}")
+        return False
     print(f"🎯 Expected Flag: {expected_flag}")
 
     # 2. Find File
-    sandbox_path = os.environ.get("CCRI_SANDBOX")
+    sandbox_path = get_sandbox()
     if sandbox_path:
         challenge_dir = Path(sandbox_path)
     else:
-        mode = os.environ.get("CCRI_MODE", "guided")
         folder = "challenges_solo" if mode == "solo" else "challenges"
-        challenge_dir = Path(__file__).resolve().parent.parent / folder / CHALLENGE_ID
+        challenge_dir = root / folder / challenge_id
 
     server_data_file = challenge_dir / ".server_data"
     if not server_data_file.exists():
         print(f"❌ File missing: {server_data_file}")
-        sys.exit(1)
+        return False
 
     # 3. Decode
     try:
@@ -56,7 +41,7 @@ def validate():
         print(f"✅ Decoded {len(data_map)} portals: {list(data_map.keys())}")
     except Exception as e:
         print(f"❌ Decode failed: {e}")
-        sys.exit(1)
+        return False
 
     # 4. Search for flag in DOM elements
     # Pattern looks for the flag inside the debug-info span or anywhere in HTML
@@ -72,7 +57,7 @@ def validate():
                 start = max(0, idx - 40)
                 end = min(len(html), idx + 40)
                 print(f"   Context: ...{html[start:end]}...")
-                sys.exit(0)
+                return True
 
         # Fallback: check for standard flag pattern anywhere
         flag_pattern = re.compile(r"CCRI-[A-Z0-9]{4}-\d{4}")
@@ -96,7 +81,9 @@ def validate():
     print("-" * 40)
     print(data_map[first_site][:500])
     print("-" * 40)
-    sys.exit(1)
+    return False
 
 if __name__ == "__main__":
-    validate()
\ No newline at end of file
+    mode = get_ctf_mode()
+    success = validate(mode=mode)
+    sys.exit(0 if success else 1)
\ No newline at end of file
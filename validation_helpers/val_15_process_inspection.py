@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
-import os
 import sys
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "15_ProcessInspection"
 
@@ -28,7 +27,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     base_path = "challenges_solo" if mode == "solo" else "challenges"
 
     # 🧪 Sandbox override support
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
     else:
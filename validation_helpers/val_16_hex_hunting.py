@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
-import os
 import sys
 import subprocess
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, get_sandbox
 
 CHALLENGE_ID = "16_HexHunting"
 BINARY_NAME = "hex_flag.bin"
@@ -40,7 +39,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     data = load_unlock_data(root, challenge_id)
     flag = data.get("real_flag")
 
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         binary_path = Path(sandbox_override) / BINARY_NAME
     else:
@@ -1,39 +1,155 @@
 #!/usr/bin/env python3
-import os
 import sys
-import subprocess
+import json
+import asyncio
+import time
 from common import find_project_root, load_unlock_data, get_ctf_mode
 
 CHALLENGE_ID = "17_NmapScanning"
+HOST = "127.0.0.1"
+CATALOG_FILE = "fake_services.json"
 
-def fetch_port_response(port: int) -> str:
+# Port window probed for each catalog section (gen_17 picks ports from the first 100)
+PORT_RANGES = {"guided": range(8000, 8101), "solo": range(9000, 9101)}
+DEADLINE = 1.0        # seconds for the whole scan, both ranges
+MAX_RESPONSE = 64 * 1024
+
+def load_catalog(root) -> dict:
+    """fake_services.json with integer port keys: {mode: {"real_port", "flags", "junk_responses", "service_names"}}."""
+    with open(root / "web_version_admin" / CATALOG_FILE, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    catalog = {}
+    for mode, section in raw.items():
+        catalog[mode] = {
+            "real_port": section.get("real_port"),
+            **{key: {int(port): value for port, value in section.get(key, {}).items()}
+               for key in ("flags", "junk_responses", "service_names")},
+        }
+    return catalog
+
+def expected_reply(section, port):
+    """(service name, body) the hub serves for a port; mirrors fake_services.build_port_response."""
+    response = section["flags"].get(port, section["junk_responses"].get(port))
+    service_name = section["service_names"].get(port, "http")
+    return service_name, f"👋 Welcome to {service_name} Service\n\n{response}"
+
+async def probe(port):
+    """Return None if the port is closed, else (headers dict, body text)."""
+    try:
+        reader, writer = await asyncio.open_connection(HOST, port)
+    except OSError:
+        return None
     try:
-        result = subprocess.run(
-            ["curl", "-s", f"http://localhost:{port}"],
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL
-        )
-        return result.stdout.strip()
-    except Exception as e:
-        print(f"❌ Curl failed: {e}", file=sys.stderr)
-        return ""
-
-def validate_flag(expected_flag: str, expected_port: int) -> bool:
-    print(f"🔎 Validating port {expected_port} for expected flag...")
-    response = fetch_port_response(expected_port)
-
-    # Keep the containment check if your server includes extra text with the flag
-    if expected_flag in response:
-        print(f"✅ Validation success: found real flag {expected_flag} on port {expected_port}")
-        return True
-    else:
-        preview = (response[:200] + "…") if len(response) > 200 else response
-        print("❌ Flag not found in response.")
-        print(f"   Expected flag: {expected_flag}")
-        print(f"   Response preview: {preview}")
+        writer.write(f"GET / HTTP/1.0\r\nHost: localhost:{port}\r\n\r\n".encode())
+        await writer.drain()
+        raw = await reader.read(MAX_RESPONSE)
+        while raw and len(raw) < MAX_RESPONSE:
+            chunk = await reader.read(MAX_RESPONSE - len(raw))
+            if not chunk:
+                break
+            raw += chunk
+    finally:
+        writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    headers = {}
+    for line in head.decode("utf-8", errors="replace").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return headers, body.decode("utf-8", errors="replace")
+
+async def scan(ports, deadline):
+    """Probe every port at once; ports still pending at the deadline map to "timeout"."""
+    tasks = {port: asyncio.ensure_future(probe(port)) for port in ports}
+    await asyncio.wait(tasks.values(), timeout=deadline)
+    results = {}
+    for port, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            results[port] = "timeout"
+        elif task.exception():
+            results[port] = "timeout"
+        else:
+            results[port] = task.result()
+    return results
+
+def check_section(section, results, ports):
+    """Compare one catalog section with the scan. Returns (problems, counts)."""
+    problems = []
+    counts = {"flags": 0, "junk": 0}
+    for port in ports:
+        result = results[port]
+        listed = port in section["flags"] or port in section["junk_responses"]
+        if result == "timeout":
+            problems.append(f"port {port}: no response before the deadline")
+        elif result is None:
+            if listed:
+                problems.append(f"port {port}: expected open ({'flag' if port in section['flags'] else 'junk'}), but closed")
+        elif not listed:
+            problems.append(f"port {port}: unexpectedly open")
+        else:
+            headers, body = result
+            service_name, expected_body = expected_reply(section, port)
+            if headers.get("server") != service_name or headers.get("x-service-name") != service_name:
+                problems.append(f"port {port}: service headers {headers.get('server')!r}/{headers.get('x-service-name')!r}, "
+                                f"expected {service_name!r}")
+            elif body != expected_body:
+                preview = body[:80].replace("\n", " ")
+                problems.append(f"port {port}: unexpected response {preview!r}")
+            else:
+                counts["flags" if port in section["flags"] else "junk"] += 1
+    return problems, counts
+
+def validate_services(catalog, mode, expected_flag, expected_port) -> bool:
+    section = catalog.get(mode)
+    if not section:
+        print(f"❌ {CATALOG_FILE} has no '{mode}' section.", file=sys.stderr)
+        return False
+    if section["real_port"] != expected_port or section["flags"].get(expected_port) != expected_flag:
+        print(f"❌ {CATALOG_FILE} disagrees with the unlock data: real port {section['real_port']} "
+              f"serves {section['flags'].get(section['real_port'])!r}, expected {expected_flag} on {expected_port}",
+              file=sys.stderr)
         return False
 
+    all_ports = [port for ports in PORT_RANGES.values() for port in ports]
+    print(f"🔎 Probing {len(all_ports)} ports ({', '.join(f'{r[0]}–{r[-1]}' for r in PORT_RANGES.values())}) "
+          f"with a {DEADLINE:.1f}s deadline...")
+    started = time.perf_counter()
+    results = asyncio.run(scan(all_ports, DEADLINE))
+    print(f"   {sum(1 for r in results.values() if r not in (None, 'timeout'))} open "
+          f"| scan took {time.perf_counter() - started:.2f}s")
+
+    ok = True
+    for section_mode, ports in PORT_RANGES.items():
+        other = catalog.get(section_mode)
+        if other is None:
+            continue
+        problems, counts = check_section(other, results, ports)
+        open_ports = [port for port in ports if results[port] not in (None, "timeout")]
+        if section_mode != mode and not open_ports:
+            print(f"ℹ️  {section_mode} services are not running (hub serves {mode} only)")
+            continue
+
+        if section_mode == mode:
+            if not open_ports:
+                print(f"❌ No {mode} services are answering. Is the web hub running?", file=sys.stderr)
+                ok = False
+                continue
+            real = results[expected_port]
+            if real in (None, "timeout"):
+                print(f"❌ Real flag port {expected_port} is not answering.", file=sys.stderr)
+                ok = False
+            elif expected_flag in real[1]:
+                print(f"✅ Real flag {expected_flag} served on port {expected_port}")
+
+        for problem in problems:
+            print(f"❌ [{section_mode}] {problem}", file=sys.stderr)
+        if problems:
+            ok = False
+        else:
+            print(f"✅ [{section_mode}] {counts['flags']} flag port(s) and {counts['junk']} junk service(s) match "
+                  f"{CATALOG_FILE}; every other port is closed")
+    return ok
+
 def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     root = find_project_root()
     data = load_unlock_data(root, challenge_id)
@@ -44,10 +160,15 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
         print("❌ Missing required validation data (flag or port).", file=sys.stderr)
         return False
 
-    return validate_flag(expected_flag, expected_port)
+    try:
+        catalog = load_catalog(root)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read {CATALOG_FILE}: {e}", file=sys.stderr)
+        return False
+
+    return validate_services(catalog, mode, expected_flag, int(expected_port))
 
 if __name__ == "__main__":
-    from common import get_ctf_mode
     mode = get_ctf_mode()
     success = validate(mode=mode)
-    import sys; sys.exit(0 if success else 1)
+    sys.exit(0 if success else 1)
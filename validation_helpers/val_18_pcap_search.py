@@ -1,23 +1,21 @@
 #!/usr/bin/env python3
-import os
 import sys
-import subprocess
 from pathlib import Path
-from common import find_project_root, load_unlock_data, get_ctf_mode
+from common import find_project_root, load_unlock_data, get_ctf_mode, add_project_root_to_path, get_sandbox
+
+add_project_root_to_path()
+from pcapio import search_streams, PcapError
 
 CHALLENGE_ID = "18_PcapSearch"
 PCAP_FILE = "traffic.pcap"
 
 def fast_search_flag(pcap: Path, flag: str) -> bool:
-    cmd = f"tshark -r {pcap} -Y 'tcp' -T fields -e tcp.payload | xxd -r -p | strings"
-    result = subprocess.run(
-        cmd,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.DEVNULL,
-        text=True
-    )
-    return flag in result.stdout
+    try:
+        matches = search_streams(pcap, flag)
+    except (OSError, PcapError) as e:
+        print(f"❌ Could not read {pcap.name}: {e}", file=sys.stderr)
+        return False
+    return bool(matches)
 
 def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     root = find_project_root()
@@ -27,7 +25,7 @@ def validate(mode="guided", challenge_id=CHALLENGE_ID) -> bool:
     base_path = "challenges_solo" if mode == "solo" else "challenges"
 
     # 🔐 Sandbox override support
-    sandbox_override = os.environ.get("CCRI_SANDBOX")
+    sandbox_override = get_sandbox()
     if sandbox_override:
         challenge_dir = Path(sandbox_override)
     else:
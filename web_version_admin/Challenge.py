@@ -5,6 +5,9 @@ import config  # Now imports path logic from your new config module
 class Challenge:
     """Represents a single CTF challenge."""
 
+    # Fixed attribute layout keeps large challenge banks compact in memory
+    __slots__ = ("id", "ch_number", "name", "complete", "has_coach", "folder", "script", "flag")
+
     def __init__(self, id, ch_number, name, folder, flag, script=None, solo_mode=False, has_coach=False):
         self.id = id                      # Unique identifier
         self.ch_number = ch_number        # Challenge number for display
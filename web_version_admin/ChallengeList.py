@@ -18,6 +18,7 @@ class ChallengeList:
         """
         self.challenges = []
         self.completed_challenges = []
+        self._by_id = {}  # id -> Challenge
         self.numOfChallenges = 0
         self._encoded_flags = {}  # id -> encoded flag exactly as read from JSON
 
@@ -115,6 +116,7 @@ class ChallengeList:
 
             print(f"➡️  Challenge #{order}: {challenge.getName()} (ID={key})")
             self.challenges.append(challenge)
+            self._by_id[key] = challenge
             order += 1
 
         self.numOfChallenges = len(self.challenges)
@@ -125,12 +127,12 @@ class ChallengeList:
         return self.challenges
 
     def get_challenge_by_id(self, challenge_id):
-        """Retrieve a Challenge object by its ID."""
-        return next((c for c in self.challenges if c.getId() == challenge_id), None)
+        """Retrieve a Challenge object by its ID (O(1) via the id index)."""
+        return self._by_id.get(challenge_id)
 
     def get_list_of_ids(self):
         """Return a list of all challenge IDs."""
-        return [c.getId() for c in self.challenges]
+        return list(self._by_id.keys())
 
     def save_challenges(self):
         """
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark challenge file downloads: the old plain send_from_directory() route
+("before") against routes.send_challenge_file() ("after").
+
+A throwaway 100 MB pcap is served by a local WSGI server and fetched over
+keep-alive HTTP in three patterns students actually produce:
+  full   - repeated complete downloads
+  reget  - re-downloads that send the ETag/Last-Modified from the first response
+  range  - random 1 MB Range requests (resumed / partial downloads)
+
+Usage:
+    python3 bench_downloads.py [--size-mb 100] [--rounds 5] [--server dev|waitress]
+"""
+
+import os
+import sys
+import time
+import random
+import struct
+import argparse
+import tempfile
+import threading
+import http.client
+
+sys.dont_write_bytecode = True
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, send_from_directory
+from routes import send_challenge_file
+
+PCAP_NAME = "traffic.pcap"
+RANGE_SIZE = 1024 * 1024
+
+
+def write_test_pcap(path, size_mb):
+    """Write a syntactically valid pcap of roughly size_mb megabytes."""
+    target = size_mb * 1024 * 1024
+    payload = os.urandom(1400)
+    ts = int(time.time())
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        written = 24
+        i = 0
+        while written < target:
+            f.write(struct.pack("<IIII", ts + i // 1000, i % 1000, len(payload), len(payload)))
+            f.write(payload)
+            written += 16 + len(payload)
+            i += 1
+
+
+def build_app(folder):
+    app = Flask(__name__)
+
+    @app.route("/before/<path:filename>")
+    def before(filename):
+        return send_from_directory(folder, filename)
+
+    @app.route("/after/<path:filename>")
+    def after(filename):
+        return send_challenge_file(folder, filename)
+
+    return app
+
+
+def start_server(app, backend):
+    if backend == "waitress":
+        from waitress.server import create_server
+        server = create_server(app, host="127.0.0.1", port=0, threads=8)
+        port = server.effective_port
+        threading.Thread(target=server.run, daemon=True).start()
+        return port, server.close
+
+    from werkzeug.serving import make_server
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def fetch(conn, path, headers=None):
+    conn.request("GET", path, headers=headers or {})
+    resp = conn.getresponse()
+    total = 0
+    while True:
+        chunk = resp.read(1024 * 1024)
+        if not chunk:
+            break
+        total += len(chunk)
+    return resp.status, dict(resp.getheaders()), total
+
+
+def run_case(port, prefix, file_size, rounds):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    url = f"/{prefix}/{PCAP_NAME}"
+    results = {}
+
+    start = time.perf_counter()
+    moved = 0
+    for _ in range(rounds):
+        status, headers, n = fetch(conn, url)
+        moved += n
+    elapsed = time.perf_counter() - start
+    results["full"] = (elapsed, moved, status)
+
+    validators = {}
+    if "ETag" in headers:
+        validators["If-None-Match"] = headers["ETag"]
+    if "Last-Modified" in headers:
+        validators["If-Modified-Since"] = headers["Last-Modified"]
+    start = time.perf_counter()
+    moved = 0
+    for _ in range(rounds):
+        status, _, n = fetch(conn, url, validators)
+        moved += n
+    elapsed = time.perf_counter() - start
+    results["reget"] = (elapsed, moved, status)
+
+    rng = random.Random(0)
+    start = time.perf_counter()
+    moved = 0
+    for _ in range(rounds * 20):
+        offset = rng.randrange(0, file_size - RANGE_SIZE)
+        status, _, n = fetch(conn, url, {"Range": f"bytes={offset}-{offset + RANGE_SIZE - 1}"})
+        moved += n
+    elapsed = time.perf_counter() - start
+    results["range"] = (elapsed, moved, status)
+
+    conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark challenge file downloads.")
+    parser.add_argument("--size-mb", type=int, default=100, help="Size of the test pcap (default: 100)")
+    parser.add_argument("--rounds", type=int, default=5, help="Requests per pattern (default: 5)")
+    parser.add_argument("--server", choices=("dev", "waitress"), default="dev", help="WSGI server to serve with")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ccri_bench_") as folder:
+        pcap_path = os.path.join(folder, PCAP_NAME)
+        print(f"🧪 Writing {args.size_mb} MB test pcap...")
+        write_test_pcap(pcap_path, args.size_mb)
+        file_size = os.path.getsize(pcap_path)
+
+        port, stop = start_server(build_app(folder), args.server)
+        print(f"🚀 Serving from {args.server} server on port {port}\n")
+
+        try:
+            for prefix in ("before", "after"):
+                results = run_case(port, prefix, file_size, args.rounds)
+                print(f"== {prefix.upper()} ==")
+                for pattern, (elapsed, moved, status) in results.items():
+                    rate = moved / elapsed / (1024 * 1024) if elapsed else 0.0
+                    print(f"   {pattern:<6} last status {status}  {moved / (1024 * 1024):9.1f} MB "
+                          f"in {elapsed:7.3f}s  ({rate:8.1f} MB/s)")
+                print()
+        finally:
+            stop()
+
+
+if __name__ == "__main__":
+    main()
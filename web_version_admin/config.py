@@ -54,4 +54,22 @@ def detect_available_modes():
     return modes
 
 AVAILABLE_MODES = detect_available_modes()
-DEFAULT_MODE = "regular" if "regular" in AVAILABLE_MODES else ("solo" if "solo" in AVAILABLE_MODES else None)
\ No newline at end of file
+DEFAULT_MODE = "regular" if "regular" in AVAILABLE_MODES else ("solo" if "solo" in AVAILABLE_MODES else None)
+
+# ---------- SERVER CONFIGURATION ----------
+# CCRI_SERVER: "dev" (Werkzeug, default) or "production" (waitress, or gunicorn when CCRI_WORKERS > 1)
+SERVER_BACKEND = os.environ.get("CCRI_SERVER", "dev").strip().lower()
+SERVER_HOST = os.environ.get("CCRI_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("CCRI_PORT", "5000"))
+SERVER_WORKERS = int(os.environ.get("CCRI_WORKERS", "1"))      # processes (gunicorn only)
+SERVER_THREADS = int(os.environ.get("CCRI_THREADS", "16"))     # threads per worker
+# gunicorn: worker timeout (a worker silent this long is restarted) / keep-alive idle time.
+# waitress: SERVER_TIMEOUT is its idle-connection channel_timeout; it has no per-request limit.
+SERVER_TIMEOUT = int(os.environ.get("CCRI_TIMEOUT", "30"))
+SERVER_KEEPALIVE = int(os.environ.get("CCRI_KEEPALIVE", "5"))  # gunicorn only
+
+# ---------- DOWNLOAD CONFIGURATION ----------
+# Challenge files are always revalidated (ETag/Last-Modified -> 304), so 0 is safe across regenerations
+DOWNLOAD_MAX_AGE = int(os.environ.get("CCRI_DOWNLOAD_MAX_AGE", "0"))
+# Set when a front-end proxy (nginx/Apache with mod_xsendfile) should stream files instead of Python
+USE_X_SENDFILE = os.environ.get("CCRI_X_SENDFILE", "0") == "1"
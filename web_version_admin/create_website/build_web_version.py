@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import base64
+import hashlib
 import os
 import shutil
 import stat
@@ -11,6 +13,11 @@ import zipapp
 
 ENCODE_KEY = "CTF4EVER"
 
+# Must match WELCOME_MD_EXTENSIONS / README_MD_EXTENSIONS in web_version_admin/utils.py
+WELCOME_MD_EXTENSIONS = ["fenced_code", "sane_lists", "tables"]
+README_MD_EXTENSIONS = ["tables"]
+PRERENDERED_FILE = "prerendered_markdown.json"
+
 def abort(msg):
     print(f"❌ {msg}")
     sys.exit(1)
@@ -21,6 +28,48 @@ def xor_encode(plaintext: str, key: str) -> str:
         bytes([ord(c) ^ ord(key[i % len(key)]) for i, c in enumerate(plaintext)])
     ).decode()
 
+def encode_guided_challenges(admin_data):
+    """Student-side Guided entries: XOR-encoded flag plus the metadata the hub needs."""
+    guided_data = {}
+    for cid, meta in admin_data.items():
+        entry = {
+            "name": meta["name"],
+            "folder": meta["folder"],
+            "flag": xor_encode(meta["flag"], ENCODE_KEY),
+        }
+        # Copy Script metadata
+        if meta.get("script"):
+            entry["script"] = meta["script"]
+        # Copy Coach metadata (CRITICAL FIX)
+        if meta.get("has_coach"):
+            entry["has_coach"] = meta["has_coach"]
+            
+        guided_data[cid] = entry
+    return guided_data
+
+def encode_solo_challenges(admin_solo):
+    """Student-side Solo entries (flag may be stored as real_flag); aborts on a missing flag."""
+    solo_data = {}
+    for cid, meta in admin_solo.items():
+        raw_flag = meta.get("real_flag", meta.get("flag"))
+        if not raw_flag:
+            abort(f"Solo entry {cid} has no flag/real_flag")
+        entry = {
+            "name": meta["name"],
+            "folder": meta["folder"],
+            "flag": xor_encode(raw_flag, ENCODE_KEY),
+        }
+        if meta.get("script"):
+            entry["script"] = meta["script"]
+        if "hint" in meta:
+            entry["hint"] = meta["hint"]
+        # Copy Coach metadata for Solo (if it exists)
+        if meta.get("has_coach"):
+            entry["has_coach"] = meta["has_coach"]
+
+        solo_data[cid] = entry
+    return solo_data
+
 def make_scripts_executable(challenges_data, base_dir):
     """Set chmod +x on helper scripts AND coach scripts."""
     print("🔧 Setting executable permissions on scripts...")
@@ -69,6 +118,43 @@ def sanitize_templates(template_dir):
                 f.write(content)
             print(f"✅ Sanitized {path}")
 
+def prerender_markdown(base_dir, student_dir, guided_data, solo_data):
+    """
+    Render welcome.md and every challenge README.md ahead of time into
+    <student_dir>/prerendered_markdown.json. The hub serves these instead of
+    running markdown at request time (entries are matched by source sha256).
+    """
+    try:
+        import markdown
+    except ImportError:
+        print("⚠️ markdown not installed; skipping README pre-rendering.")
+        return
+
+    print("🖋️ Pre-rendering Markdown pages...")
+    sources = [(os.path.join(student_dir, "static", "welcome.md"), WELCOME_MD_EXTENSIONS)]
+    for folder_name, data in (("challenges", guided_data), ("challenges_solo", solo_data)):
+        for meta in data.values():
+            readme = os.path.join(base_dir, folder_name, os.path.basename(meta["folder"]), "README.md")
+            sources.append((readme, README_MD_EXTENSIONS))
+
+    rendered = {}
+    for path, extensions in sources:
+        if not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        key = os.path.relpath(path, base_dir).replace(os.sep, "/")
+        rendered[key] = {
+            "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "extensions": extensions,
+            "html": markdown.markdown(text, extensions=extensions),
+        }
+
+    out_path = os.path.join(student_dir, PRERENDERED_FILE)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(rendered, f, ensure_ascii=False)
+    print(f"✅ Pre-rendered {len(rendered)} pages: {out_path}")
+
 def _looks_base64(s: str) -> bool:
     try:
         base64.b64decode(s.encode(), validate=True)
@@ -76,7 +162,7 @@ def _looks_base64(s: str) -> bool:
     except Exception:
         return False
 
-def prepare_web_version(base_dir):
+def prepare_web_version(base_dir, prerender=True):
     admin_dir = os.path.join(base_dir, "web_version_admin")
     student_dir = os.path.join(base_dir, "web_version")  # assets live here on disk
     
@@ -94,6 +180,8 @@ def prepare_web_version(base_dir):
     utils_py = os.path.join(admin_dir, "utils.py")
     challenge_py = os.path.join(admin_dir, "Challenge.py")
     challenge_list_py = os.path.join(admin_dir, "ChallengeList.py")
+    # Port catalog read by fake_services.py; bundled inside the .pyz only (it holds the Nmap flags)
+    fake_services_json = os.path.join(admin_dir, "fake_services.json")
 
     required_modules = [
         server_source, config_py, fake_services_py, 
@@ -102,7 +190,7 @@ def prepare_web_version(base_dir):
 
     # === Validate admin folder contents ===
     print(f"📂 Using BASE_DIR: {base_dir}")
-    for p in [admin_json, solo_json] + required_modules:
+    for p in [admin_json, solo_json, fake_services_json] + required_modules:
         if not os.path.isfile(p):
             abort(f"Missing required file: {p}")
     for d in (templates_folder, static_folder):
@@ -120,21 +208,7 @@ def prepare_web_version(base_dir):
     with open(admin_json, "r", encoding="utf-8") as f:
         admin_data = json.load(f)
 
-    guided_data = {}
-    for cid, meta in admin_data.items():
-        entry = {
-            "name": meta["name"],
-            "folder": meta["folder"],
-            "flag": xor_encode(meta["flag"], ENCODE_KEY),
-        }
-        # Copy Script metadata
-        if meta.get("script"):
-            entry["script"] = meta["script"]
-        # Copy Coach metadata (CRITICAL FIX)
-        if meta.get("has_coach"):
-            entry["has_coach"] = meta["has_coach"]
-            
-        guided_data[cid] = entry
+    guided_data = encode_guided_challenges(admin_data)
 
     # Ensure scripts (explore and coach) are executable
     make_scripts_executable(admin_data, base_dir)
@@ -149,25 +223,7 @@ def prepare_web_version(base_dir):
     with open(solo_json, "r", encoding="utf-8") as f:
         admin_solo = json.load(f)
 
-    solo_data = {}
-    for cid, meta in admin_solo.items():
-        raw_flag = meta.get("real_flag", meta.get("flag"))
-        if not raw_flag:
-            abort(f"Solo entry {cid} has no flag/real_flag")
-        entry = {
-            "name": meta["name"],
-            "folder": meta["folder"],
-            "flag": xor_encode(raw_flag, ENCODE_KEY),
-        }
-        if meta.get("script"):
-            entry["script"] = meta["script"]
-        if "hint" in meta:
-            entry["hint"] = meta["hint"]
-        # Copy Coach metadata for Solo (if it exists)
-        if meta.get("has_coach"):
-            entry["has_coach"] = meta["has_coach"]
-
-        solo_data[cid] = entry
+    solo_data = encode_solo_challenges(admin_solo)
 
     solo_json_path = os.path.join(student_dir, "challenges_solo.json")
     with open(solo_json_path, "w", encoding="utf-8") as f:
@@ -191,6 +247,10 @@ def prepare_web_version(base_dir):
     # === Sanitize templates ===
     sanitize_templates(os.path.join(student_dir, "templates"))
 
+    # === Optional: pre-render Markdown so the hub never renders at request time ===
+    if prerender:
+        prerender_markdown(base_dir, student_dir, guided_data, solo_data)
+
     # === Build the zipapp (portable; no hardcoded paths) ===
     print("📦 Preparing zipapp source...")
     pyz_src = os.path.join(base_dir, "_pyz_src")
@@ -203,6 +263,8 @@ def prepare_web_version(base_dir):
         dest_name = os.path.basename(module_path)
         shutil.copy2(module_path, os.path.join(pyz_src, dest_name))
         print(f"   - Included {dest_name}")
+    shutil.copy2(fake_services_json, os.path.join(pyz_src, "fake_services.json"))
+    print("   - Included fake_services.json")
 
     # __main__.py: Entry point for the Zipapp
     main_code = r"""\
@@ -218,19 +280,17 @@ def main():
 
     os.environ.setdefault("CCRI_CTF_MODE", "student")
 
-    import config
-    import fake_services
-    import server
+    # "--production" selects the WSGI server (same as CCRI_SERVER=production)
+    if "--production" in sys.argv[1:]:
+        os.environ["CCRI_SERVER"] = "production"
 
-    # Start the fake services (background threads)
-    # We must call this explicitly because we are importing server, not running it as __main__
-    fake_services.start_all_services(config.AVAILABLE_MODES)
+    import server
 
     print(f"📖 Using template folder at: {server.app.template_folder}")
     print(f"🧰 Static folder at: {server.app.static_folder}")
-    print(f"🚀 {os.environ['CCRI_CTF_MODE'].capitalize()} Hub running on http://127.0.0.1:5000")
-    
-    server.app.run(host='127.0.0.1', port=5000, debug=False, threaded=True)
+
+    # run_hub starts the fake services exactly once (in the gunicorn master when multi-worker)
+    server.run_hub()
 
 if __name__ == "__main__":
     main()
@@ -249,9 +309,13 @@ if __name__ == "__main__":
     print("\n🎉 Student web_version build completed successfully!\n")
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-prerender", action="store_true", help="Skip pre-rendering README/welcome Markdown")
+    args = parser.parse_args()
+
     print("🚀 Starting Web Version Build Process (Modular)...")
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-    prepare_web_version(base_dir)
+    prepare_web_version(base_dir, prerender=not args.no_prerender)
     print("✅ Build process finished successfully.")
     input("\n📖 Press ENTER to exit...")
 
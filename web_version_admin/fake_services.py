@@ -1,118 +1,264 @@
+import os
+import json
+import signal
+import asyncio
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import multiprocessing
+import config
 
 # === Simulated Open Ports ===
-GUIDED_FAKE_FLAGS = {
-    8085: "CCRI-UWKT-1905",       # ✅ REAL FLAG
-    8056: "DJRZ-SADS-4449",       # fake
-    8018: "ANHG-ULJA-5510",       # fake
-    8044: "GLZI-8601-HIEG",       # fake
-    8030: "JFXW-THAJ-6456",       # fake
-}
-GUIDED_JUNK_RESPONSES = {
-    8000: "🔒 Unauthorized: API key required.",
-    8003: "System maintenance in progress.",
-    8012: "503 Service Unavailable\nTry again later.",
-    8016: "Hello World!\nTest endpoint active.",
-    8017: "💻 Dev API v0.1 — POST requests only.",
-    8023: "System maintenance in progress.",
-    8026: "System maintenance in progress.",
-    8051: "Python HTTP Server: directory listing not allowed.",
-    8053: "Hello World!\nTest endpoint active.",
-    8069: "DEBUG: Connection established successfully.",
-    8084: "Python HTTP Server: directory listing not allowed.",
-    8092: "Hello World!\nTest endpoint active."
-}
-GUIDED_SERVICE_NAMES = {
-    8000: "epsilon-sync",
-    8003: "beta-hub",
-    8012: "update-agent",
-    8016: "auth-service",
-    8017: "theta-daemon",
-    8018: "delta-proxy",
-    8023: "configd",
-    8026: "alpha-core",
-    8030: "metricsd",
-    8044: "lambda-api",
-    8051: "zeta-cache",
-    8053: "sysmon-api",
-    8056: "delta-sync",
-    8069: "kappa-node",
-    8084: "gamma-relay",
-    8085: "beta-hub",
-    8092: "omega-stream"
-}
-SOLO_FAKE_FLAGS = {
-    9015: "CCRI-LFSB-7333",       # ✅ REAL FLAG
-    9024: "LHTK-1221-CNNQ",       # fake
-    9075: "PAGS-AVZP-3923",       # fake
-    9034: "OUJF-VQKM-7629",       # fake
-    9094: "MNXZ-SZKI-1612",       # fake
-}
-SOLO_JUNK_RESPONSES = {
-    9016: "💻 Dev API v0.1 — POST requests only.",
-    9025: "Python HTTP Server: directory listing not allowed.",
-    9035: "Error 418: I’m a teapot.",
-    9040: "Welcome to Experimental IoT Server (beta build).",
-    9047: "Welcome to Experimental IoT Server (beta build).",
-    9076: "💡 Tip: Scan only the ports you really need.",
-    9081: "Hello World!\nTest endpoint active.",
-    9085: "Hello World!\nTest endpoint active."
-}
-SOLO_SERVICE_NAMES = {
-    9015: "metricsd",
-    9016: "delta-sync",
-    9024: "lambda-api",
-    9025: "theta-daemon",
-    9034: "configd",
-    9035: "sysmon-api",
-    9040: "alpha-core",
-    9047: "kappa-node",
-    9075: "zeta-cache",
-    9076: "update-agent",
-    9081: "auth-service",
-    9085: "omega-stream",
-    9094: "gamma-relay"
-}
-
-GUIDED_ALL_PORTS = {**GUIDED_JUNK_RESPONSES, **GUIDED_FAKE_FLAGS}
-SOLO_ALL_PORTS = {**SOLO_JUNK_RESPONSES, **SOLO_FAKE_FLAGS}
-
-# === Dynamic HTTP Handler Factory ===
-def PortHandlerFactory(response_map, service_map):
-    class CustomPortHandler(BaseHTTPRequestHandler):
-        def do_GET(self):
-            response = response_map.get(self.server.server_port, "Connection refused")
-            service_name = service_map.get(self.server.server_port, "http")
-            banner = f"👋 Welcome to {service_name} Service\n\n"
-            self.send_response(200)
-            self.send_header("Content-type", "text/plain; charset=utf-8")
-            self.send_header("Server", service_name)
-            self.send_header("X-Service-Name", service_name)
-            self.end_headers()
+# The port/flag/service tables live in fake_services.json (written by gen_17_nmap_scanning).
+# Admin hubs read it from the assets dir and watch it for changes; the student zipapp
+# falls back to the copy bundled next to this module.
+CATALOG_FILE = "fake_services.json"
+CATALOG_WATCH_INTERVAL = 2.0  # seconds between catalog mtime checks
+
+# Hub mode names -> catalog section names
+CATALOG_MODES = {"regular": "guided", "solo": "solo"}
+
+def catalog_path():
+    return os.path.join(config.server_dir, CATALOG_FILE)
+
+def _read_catalog_text(path=None):
+    path = path or catalog_path()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    # Bundled copy (works from a zipapp as well as from a source tree)
+    bundled = os.path.join(os.path.dirname(__file__), CATALOG_FILE)
+    return __loader__.get_data(bundled).decode("utf-8")
+
+def load_catalog(path=None):
+    """
+    Return {"guided"|"solo": {"real_port", "flags", "junk_responses", "service_names"}}
+    with integer port keys.
+    """
+    raw = json.loads(_read_catalog_text(path))
+    catalog = {}
+    for mode, section in raw.items():
+        catalog[mode] = {
+            "real_port": section.get("real_port"),
+            "flags": {int(p): v for p, v in section.get("flags", {}).items()},
+            "junk_responses": {int(p): v for p, v in section.get("junk_responses", {}).items()},
+            "service_names": {int(p): v for p, v in section.get("service_names", {}).items()},
+        }
+    return catalog
+
+def ports_for_mode(catalog, mode):
+    """Return (response_map, service_map) for a catalog section ('guided' or 'solo')."""
+    section = catalog.get(mode)
+    if not section:
+        return {}, {}
+    return {**section["junk_responses"], **section["flags"]}, section["service_names"]
+
+REQUEST_TIMEOUT = 5.0  # seconds a client may take to send its request headers
+
+# === Pre-encoded Responses ===
+def build_port_response(port, response_map, service_map):
+    """
+    Pre-encode the HTTP response for one simulated port.
+    Returns (full_response, head_only) bytes with the welcome banner and the
+    Server / X-Service-Name headers naming the fake service.
+    """
+    response = response_map.get(port, "Connection refused")
+    service_name = service_map.get(port, "http")
+    banner = f"👋 Welcome to {service_name} Service\n\n"
+    body = (banner + response).encode("utf-8")
+    head = (
+        "HTTP/1.0 200 OK\r\n"
+        "Content-type: text/plain; charset=utf-8\r\n"
+        f"Server: {service_name}\r\n"
+        f"X-Service-Name: {service_name}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode("utf-8")
+    return head + body, head
+
+NOT_IMPLEMENTED = (
+    b"HTTP/1.0 501 Not Implemented\r\n"
+    b"Content-type: text/plain; charset=utf-8\r\n"
+    b"Content-Length: 20\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+    b"Unsupported method.\n"
+)
+
+# === Single-Loop Service Hub ===
+class FakeServiceHub:
+    """
+    Serves every simulated port from one asyncio event loop running in a daemon thread.
+    Each port's response bytes are built once; connections are handled concurrently.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._servers = {}   # port -> asyncio.Server
+        self._payloads = {}  # port -> (full_response, head_only)
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="fake-services", daemon=True)
+            self._thread.start()
+
+    async def _handle(self, reader, writer, port):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+            if not request_line:
+                return
+            # Drain the request headers; the response never depends on them
+            while True:
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            full_response, head_only = self._payloads.get(port, (NOT_IMPLEMENTED, NOT_IMPLEMENTED))
+            method = request_line.split(b" ", 1)[0].upper()
+            if method == b"GET":
+                writer.write(full_response)
+            elif method == b"HEAD":
+                writer.write(head_only)
+            else:
+                writer.write(NOT_IMPLEMENTED)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _start(self, port):
+        return await asyncio.start_server(
+            lambda r, w: self._handle(r, w, port), host="0.0.0.0", port=port, reuse_address=True
+        )
+
+    def bind(self, port, response_map, service_map):
+        """Serve a port (or refresh its response if it is already bound). Returns True on success."""
+        with self._lock:
+            self._ensure_loop()
+            self._payloads[port] = build_port_response(port, response_map, service_map)
+            if port in self._servers:
+                return True
+            try:
+                server = asyncio.run_coroutine_threadsafe(self._start(port), self._loop).result()
+            except OSError as e:
+                self._payloads.pop(port, None)
+                print(f"❌ Could not bind port {port}: {e}")
+                return False
+            self._servers[port] = server
+        print(f"🚁️  Simulated service running on port {port} ({service_map.get(port, 'http')})")
+        return True
+
+    def release(self, port):
+        """Stop serving a port."""
+        with self._lock:
+            server = self._servers.pop(port, None)
+            self._payloads.pop(port, None)
+            if server is None:
+                return
+
+            async def _close():
+                server.close()
+                await server.wait_closed()
+
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result()
+        print(f"🛑 Simulated service on port {port} stopped")
+
+    def bound_ports(self):
+        with self._lock:
+            return sorted(self._servers)
+
+    def apply_catalog(self, catalog, available_modes):
+        """Bind every port in the catalog for the available modes and release ports no longer listed."""
+        desired = {}
+        for hub_mode, catalog_mode in CATALOG_MODES.items():
+            if hub_mode in available_modes:
+                response_map, service_map = ports_for_mode(catalog, catalog_mode)
+                for port in response_map:
+                    desired[port] = (response_map, service_map)
+
+        for port in set(self.bound_ports()) - set(desired):
+            self.release(port)
+        for port, (response_map, service_map) in sorted(desired.items()):
+            self.bind(port, response_map, service_map)
+
+    async def _watch_catalog(self, path, available_modes):
+        def signature():
+            try:
+                st = os.stat(path)
+                return (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                return None
+
+        last = signature()
+        while True:
+            await asyncio.sleep(CATALOG_WATCH_INTERVAL)
+            current = signature()
+            if current == last or current is None:
+                continue
+            last = current
             try:
-                self.wfile.write((banner + response).encode("utf-8"))
-            except BrokenPipeError:
-                pass
+                catalog = load_catalog(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable {CATALOG_FILE}: {e}")
+                continue
+            print(f"🔄 {CATALOG_FILE} changed; updating simulated services...")
+            # bind/release block on the loop, so run them from a worker thread
+            await asyncio.get_running_loop().run_in_executor(None, self.apply_catalog, catalog, available_modes)
+
+    def watch(self, path, available_modes):
+        """Reload the catalog whenever the file at path changes."""
+        with self._lock:
+            self._ensure_loop()
+            asyncio.run_coroutine_threadsafe(self._watch_catalog(path, available_modes), self._loop)
 
-        def log_message(self, format, *args):
-            return
-    return CustomPortHandler
+
+service_hub = FakeServiceHub()
 
 def start_fake_service(port, response_map, service_map):
-    try:
-        server = HTTPServer(('0.0.0.0', port), PortHandlerFactory(response_map, service_map))
-        threading.Thread(target=server.serve_forever, daemon=True).start()
-        print(f"🚁️  Simulated service running on port {port} ({service_map.get(port, 'http')})")
-    except OSError as e:
-        print(f"❌ Could not bind port {port}: {e}")
+    return service_hub.bind(port, response_map, service_map)
 
 def start_all_services(available_modes):
-    """Starts fake services based on which modes are available."""
-    if "regular" in available_modes:
-        for port in GUIDED_ALL_PORTS.keys():
-            start_fake_service(port, GUIDED_ALL_PORTS, GUIDED_SERVICE_NAMES)
-
-    if "solo" in available_modes:
-        for port in SOLO_ALL_PORTS.keys():
-            start_fake_service(port, SOLO_ALL_PORTS, SOLO_SERVICE_NAMES)
\ No newline at end of file
+    """Starts fake services based on which modes are available, then watches the catalog."""
+    try:
+        catalog = load_catalog()
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not load {CATALOG_FILE}: {e}")
+        return
+
+    service_hub.apply_catalog(catalog, available_modes)
+
+    if os.path.exists(catalog_path()):
+        service_hub.watch(catalog_path(), available_modes)
+
+# Signals a gunicorn master traps; a child forked from it must get the defaults back
+_MASTER_SIGNALS = ("SIGHUP", "SIGQUIT", "SIGINT", "SIGTERM", "SIGTTIN", "SIGTTOU",
+                   "SIGUSR1", "SIGUSR2", "SIGWINCH", "SIGCHLD")
+
+def _services_process_main(available_modes, inherited_sockets):
+    for sock in inherited_sockets:
+        sock.close()
+    for name in _MASTER_SIGNALS:
+        signal.signal(getattr(signal, name), signal.SIG_DFL)
+    signal.set_wakeup_fd(-1)
+    start_all_services(available_modes)
+    threading.Event().wait()  # the hub's loop thread is a daemon; park the main thread
+
+def start_services_process(available_modes, inherited_sockets=()):
+    """
+    Serve the fake ports from a child process forked off a pre-fork server master.
+    Sockets bound in the master itself would be inherited by every worker, so a port
+    released on catalog reload would stay open (and unbindable) in each of them.
+    inherited_sockets (the master's HTTP listeners) are closed in the child.
+    """
+    process = multiprocessing.get_context("fork").Process(
+        target=_services_process_main,
+        args=(list(available_modes), list(inherited_sockets)),
+        name="fake-services",
+        daemon=True,
+    )
+    process.start()
+    print(f"🚁️  Simulated services running in process {process.pid}")
+    return process
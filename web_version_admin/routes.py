@@ -7,36 +7,34 @@ except ImportError:
 import os
 import sys
 import subprocess
-import markdown
-import json
-import base64
+try:
+    from werkzeug.utils import safe_join
+except ImportError:  # Werkzeug < 2.0
+    from werkzeug.security import safe_join
+
 import config
-from utils import load_challenges
+from utils import (
+    load_challenges, challenge_registry, server_data_cache, markdown_cache, folder_cache, file_etag, stat_file_entry,
+    WELCOME_MD_EXTENSIONS, README_MD_EXTENSIONS,
+)
 
 bp = Blueprint('main', __name__, static_folder=config.static_folder, static_url_path='/static')
 
 # --- Helper to read HIDDEN/OBFUSCATED challenge files ---
 def get_challenge_server_data(challenge_id, mode_override=None):
     """
-    Locates the hidden .server_data file, base64 decodes it, and returns the JSON dict.
+    Returns the prebuilt responses from the challenge's hidden .server_data file as
+    {key: (body, status_code, [(header, value), ...])}, served from server_data_cache.
     Allows forcing a specific mode (e.g. for unique Solo routes).
     """
     if mode_override:
         mode = mode_override
     else:
         mode = session.get("mode", config.DEFAULT_MODE if config.DEFAULT_MODE else "regular")
-        
+
     try:
-        challenge_list, _ = load_challenges(mode)
         # Ensure we pass the ID as a string exactly as it appears in challenges.json
-        challenge = challenge_list.get_challenge_by_id(str(challenge_id))
-        if challenge:
-            path = os.path.join(challenge.getFolder(), ".server_data")
-            if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    encoded_content = f.read().strip()
-                    decoded_json = base64.b64decode(encoded_content).decode('utf-8')
-                    return json.loads(decoded_json)
+        return server_data_cache.get(str(challenge_id), mode)
     except Exception as e:
         print(f"Error reading server data for challenge {challenge_id} (Mode: {mode}): {e}")
     return None
@@ -48,12 +46,9 @@ def landing_page():
 
     # Load optional Markdown welcome text from /static/welcome.md
     welcome_md_path = os.path.join(config.static_folder, "welcome.md")
-    if os.path.exists(welcome_md_path):
-        with open(welcome_md_path, "r", encoding="utf-8") as f:
-            welcome_html = Markup(markdown.markdown(
-                f.read(),
-                extensions=["fenced_code", "sane_lists", "tables"]
-            ))
+    rendered = markdown_cache.render(welcome_md_path, WELCOME_MD_EXTENSIONS)
+    if rendered is not None:
+        welcome_html = Markup(rendered)
     else:
         welcome_html = Markup("<p><em>No welcome text found.</em></p>")
 
@@ -145,9 +140,7 @@ def challenge_view(challenge_id):
     readme_path = os.path.join(folder, 'README.md')
     if os.path.exists(readme_path):
         try:
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                raw_readme = f.read()
-                readme_html = Markup(markdown.markdown(raw_readme, extensions=["tables"]))
+            readme_html = Markup(markdown_cache.render(readme_path, README_MD_EXTENSIONS) or "")
         except Exception as e:
             readme_html = f"<p><strong>Error loading README.md:</strong> {e}</p>"
 
@@ -155,12 +148,11 @@ def challenge_view(challenge_id):
     visible_scripts = ["broken_flag.py"]
 
     file_list = [
-        f for f in os.listdir(folder)
-        if os.path.isfile(os.path.join(folder, f))
-        and f != "README.md"
-        and not f.startswith(".")
-        and (not f.endswith(".py") or f in visible_scripts)
-        and f != ".server_data" 
+        entry for name, entry in sorted(folder_cache.get(folder).items())
+        if name != "README.md"
+        and not name.startswith(".")
+        and (not name.endswith(".py") or name in visible_scripts)
+        and name != ".server_data"
     ]
 
     template = "challenge_solo.html" if mode == "solo" else "challenge.html"
@@ -289,11 +281,29 @@ def get_challenge_file(challenge_id, filename):
     if selectedChallenge is None:
         return "Challenge not found", 404
 
-    folder = selectedChallenge.getFolder()
-    filepath = os.path.join(folder, filename)
-    if not os.path.exists(filepath):
+    return send_challenge_file(selectedChallenge.getFolder(), filename)
+
+def send_challenge_file(folder, filename):
+    """
+    Send a challenge artifact with a strong ETag and Last-Modified built from a fresh
+    stat of the file being sent (nanosecond mtime + size), so a regenerated file never
+    matches an old tag. conditional=True lets Werkzeug answer If-None-Match /
+    If-Modified-Since with 304 and Range with 206. Full bodies go out through the WSGI
+    server's file_wrapper (os.sendfile under gunicorn) or X-Sendfile when enabled.
+    """
+    path = safe_join(folder, filename)
+    # Top-level files also refresh the cached folder listing; nested paths are stat-ed directly
+    entry = path and (folder_cache.get_file(folder, filename) or stat_file_entry(path))
+    if not entry:
         return "File not found", 404
-    return send_from_directory(folder, filename)
+    return send_from_directory(
+        folder,
+        filename,
+        conditional=True,
+        etag=file_etag(entry),
+        last_modified=entry.mtime,
+        max_age=config.DOWNLOAD_MAX_AGE,
+    )
 
 # ==========================================
 #  CHALLENGE 13: HTTP Headers Mystery
@@ -302,15 +312,15 @@ def get_challenge_file(challenge_id, filename):
 # --- REGULAR MODE (Coach/Explore) ---
 # Uses /mystery/endpoint_X and keys "endpoint_X"
 def serve_header_challenge(index, mode_override=None, key_prefix="endpoint"):
-    data_map = get_challenge_server_data("13_HTTPHeaders", mode_override=mode_override)
+    responses = get_challenge_server_data("13_HTTPHeaders", mode_override=mode_override)
     endpoint_key = f"{key_prefix}_{index}"
 
-    if not data_map or endpoint_key not in data_map:
+    if not responses or endpoint_key not in responses:
         return make_response("System Error: Challenge data missing or invalid mode.", 404)
 
-    data = data_map[endpoint_key]
-    resp = make_response(data.get("body", ""), data.get("status_code", 200))
-    for k, v in data.get("headers", {}).items():
+    body, status_code, headers = responses[endpoint_key]
+    resp = make_response(body, status_code)
+    for k, v in headers:
         resp.headers[k] = v
     return resp
 
@@ -348,9 +358,9 @@ def solo_header_mystery_5(): return serve_header_challenge(5, mode_override="sol
 @bp.route('/internal/<site_name>')
 def internal_sites(site_name):
     site_name = site_name.lower()
-    data_map = get_challenge_server_data("14_InternalPortals", mode_override="regular")
-    if data_map and site_name in data_map:
-        return data_map[site_name]
+    responses = get_challenge_server_data("14_InternalPortals", mode_override="regular")
+    if responses and site_name in responses:
+        return responses[site_name][0]
     return "404 - Site Not Found", 404
 
 # --- SOLO MODE ---
@@ -359,9 +369,9 @@ def internal_sites(site_name):
 def solo_internal_sites(site_name):
     site_name = site_name.lower()
     # Force load from Solo data
-    data_map = get_challenge_server_data("14_InternalPortals", mode_override="solo")
-    if data_map and site_name in data_map:
-        return data_map[site_name]
+    responses = get_challenge_server_data("14_InternalPortals", mode_override="solo")
+    if responses and site_name in responses:
+        return responses[site_name][0]
     return "404 - Restricted Sector Not Found", 404
 
 @bp.route("/linux-basics")
@@ -372,5 +382,9 @@ def linux_basics():
 def healthz():
     return jsonify({
         "status": "ok",
-        "mode": session.get("mode", "unknown")
+        "mode": session.get("mode", "unknown"),
+        "challenge_cache": challenge_registry.stats(),
+        "server_data_cache": server_data_cache.stats(),
+        "markdown_cache": markdown_cache.stats(),
+        "folder_cache": folder_cache.stats()
     })
\ No newline at end of file
@@ -1,10 +1,11 @@
 import sys
 import logging
 import os
+import argparse
 from flask import Flask
 
 import config
-from fake_services import start_all_services
+from fake_services import start_all_services, start_services_process
 from routes import bp
 
 # ---------- BOOTSTRAP ----------
@@ -24,14 +25,111 @@ print(f"🧭 AVAILABLE_MODES = {config.AVAILABLE_MODES} | DEFAULT_MODE = {config
 # Initialize Flask
 app = Flask(__name__, template_folder=config.template_folder, static_folder=config.static_folder)
 app.secret_key = "super_secret_key"
+app.config["USE_X_SENDFILE"] = config.USE_X_SENDFILE
 
 # Register Blueprints
 app.register_blueprint(bp)
 
-# === Start Server ===
-if __name__ == '__main__':
+# === Serving Backends ===
+def _serve_dev(host, port):
+    app.run(host=host, port=port, debug=False, threaded=True)
+
+def _serve_waitress(host, port):
+    from waitress import serve
+    # waitress has no per-request timeout: channel_timeout closes a connection after
+    # SERVER_TIMEOUT seconds without traffic (idle keep-alive or a stalled client),
+    # and it has no separate keep-alive setting, so SERVER_KEEPALIVE does not apply.
+    serve(
+        app,
+        host=host,
+        port=port,
+        threads=config.SERVER_THREADS,
+        channel_timeout=config.SERVER_TIMEOUT,
+        ident="CCRI-CTF-Hub",
+    )
+
+def _serve_gunicorn(host, port):
+    from gunicorn.app.base import BaseApplication
+
+    class HubApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    # Fake ports live in their own process, started once by the master before the workers fork
+    services = []
+
+    def when_ready(arbiter):
+        services.append(start_services_process(config.AVAILABLE_MODES, arbiter.LISTENERS))
+
+    def on_exit(_arbiter):
+        for process in services:
+            process.terminate()
+            process.join(5)
+
+    HubApplication({
+        "bind": f"{host}:{port}",
+        "workers": config.SERVER_WORKERS,
+        "threads": config.SERVER_THREADS,
+        "worker_class": "gthread",
+        "timeout": config.SERVER_TIMEOUT,
+        "keepalive": config.SERVER_KEEPALIVE,
+        "when_ready": when_ready,
+        "on_exit": on_exit,
+    }).run()
+
+def run_hub(host=None, port=None, backend=None):
+    """
+    Start the fake services exactly once, then serve the hub.
+    backend: "dev" (Werkzeug) or "production" (waitress; gunicorn when SERVER_WORKERS > 1).
+    """
+    host = host or config.SERVER_HOST
+    port = port or config.SERVER_PORT
+    backend = (backend or config.SERVER_BACKEND).lower()
+
+    if backend == "production" and config.SERVER_WORKERS > 1:
+        try:
+            import gunicorn  # noqa: F401
+            print(f"🚀 {config.base_mode.capitalize()} Hub (gunicorn, {config.SERVER_WORKERS} workers x "
+                  f"{config.SERVER_THREADS} threads) on http://{host}:{port}")
+            _serve_gunicorn(host, port)
+            return
+        except ImportError:
+            print("⚠️ gunicorn not installed; using waitress with a single worker instead.")
+
     # Start fake ports (threaded)
     start_all_services(config.AVAILABLE_MODES)
 
-    print(f"🚀 {config.base_mode.capitalize()} Hub running on http://127.0.0.1:5000")
-    app.run(host='127.0.0.1', port=5000, debug=False, threaded=True)
\ No newline at end of file
+    if backend == "production":
+        try:
+            import waitress  # noqa: F401
+            print(f"🚀 {config.base_mode.capitalize()} Hub (waitress, {config.SERVER_THREADS} threads) on http://{host}:{port}")
+            _serve_waitress(host, port)
+            return
+        except ImportError:
+            print("⚠️ waitress not installed (pip install waitress); falling back to the development server.")
+
+    print(f"🚀 {config.base_mode.capitalize()} Hub running on http://{host}:{port}")
+    _serve_dev(host, port)
+
+# === Start Server ===
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--production", action="store_true", help="Serve with a production WSGI server")
+    parser.add_argument("--workers", type=int, help="Worker processes (production, requires gunicorn)")
+    parser.add_argument("--threads", type=int, help="Threads per worker (production)")
+    args = parser.parse_args()
+
+    if args.workers:
+        config.SERVER_WORKERS = args.workers
+    if args.threads:
+        config.SERVER_THREADS = args.threads
+
+    run_hub(backend="production" if args.production else None)
@@ -1,6 +1,13 @@
 import os
 import sys
+import stat
 import json
+import time
+import html
+import base64
+import hashlib
+import threading
+from collections import namedtuple
 import config
 
 # Ensure we can import ChallengeList from BASE_DIR
@@ -9,10 +16,68 @@ if config.BASE_DIR not in sys.path:
 
 from ChallengeList import ChallengeList
 
+
+class ChallengeRegistry:
+    """
+    Process-wide cache of ChallengeList objects, one per mode.
+    Each entry remembers the (mtime, size) of the JSON it was built from and is
+    only rebuilt when that signature changes, so requests are served from memory.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # mode -> (signature, ChallengeList)
+        self.loads = 0
+        self.hits = 0
+
+    @staticmethod
+    def _signature(path):
+        st = os.stat(path)  # Raises FileNotFoundError like ChallengeList would
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, mode, challenges_path):
+        """Return the cached ChallengeList for mode, reloading it if the JSON changed."""
+        with self._lock:
+            signature = self._signature(challenges_path)
+            cached = self._entries.get(mode)
+            if cached and cached[0] == signature:
+                self.hits += 1
+                return cached[1]
+
+            print(f"📖 Loading {mode.upper()} challenges from {challenges_path}")
+            challenge_list = ChallengeList(challenges_file=challenges_path)
+            self._entries[mode] = (signature, challenge_list)
+            self.loads += 1
+
+            list_type = "Exploration" if mode == "regular" else "Solo"
+            user_type = "Admin" if config.base_mode == "admin" else "Student"
+            print(f"✅ {user_type} {list_type} Challenge List loaded ({challenge_list.numOfChallenges} challenges).")
+            return challenge_list
+
+    def invalidate(self, mode=None):
+        """Drop one mode (or every mode) so the next request reloads from disk."""
+        with self._lock:
+            if mode is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(mode, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "hits": self.hits,
+                "cached_modes": sorted(self._entries.keys()),
+            }
+
+
+challenge_registry = ChallengeRegistry()
+
 def load_challenges(mode=None):
     """
     Returns (ChallengeList, challenges_folder_name)
     Tries requested mode, falls back to DEFAULT_MODE, then tries the 'other' mode before failing.
+    Lists are served from the shared challenge_registry and only re-parsed when the JSON changes.
     """
     # normalize and guard
     if mode not in ("regular", "solo"):
@@ -36,13 +101,8 @@ def load_challenges(mode=None):
         other_mode = "solo"
         other_path = os.path.join(config.server_dir, "challenges_solo.json")
 
-    print(f"📖 Loading {mode.upper()} challenges from {challenges_path}")
-
     try:
-        challenge_list = ChallengeList(challenges_file=challenges_path)
-        list_type = "Exploration" if mode == "regular" else "Solo"
-        user_type = "Admin" if config.base_mode == "admin" else "Student"
-        print(f"✅ {user_type} {list_type} Challenge List loaded ({challenge_list.numOfChallenges} challenges).")
+        challenge_list = challenge_registry.get(mode, challenges_path)
         return challenge_list, challenges_folder
     except (FileNotFoundError, json.JSONDecodeError) as err:
         print(f"⚠️ {err.__class__.__name__}: {err}")
@@ -51,4 +111,272 @@ def load_challenges(mode=None):
             print(f"↪️ Falling back to {other_mode.upper()} due to missing/invalid JSON.")
             return load_challenges(other_mode)
         # Final fail
-        raise
\ No newline at end of file
+        raise
+
+
+class ServerDataCache:
+    """
+    Decoded .server_data payloads (challenges 13 and 14), keyed by (challenge_id, mode).
+    Each entry holds ready-to-serve (body, status_code, [(header, value), ...]) tuples.
+    The file's mtime/size is re-checked at most once per CHECK_INTERVAL seconds, so
+    bursts of requests are answered without touching the disk or decoding anything.
+    """
+
+    CHECK_INTERVAL = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # (challenge_id, mode) -> [path, signature, checked_at, responses]
+        self.loads = 0
+        self.hits = 0
+
+    @staticmethod
+    def _build_responses(data_map):
+        """Turn the decoded JSON into prebuilt response tuples."""
+        responses = {}
+        for key, value in data_map.items():
+            if isinstance(value, dict):
+                # Challenge 13: {"headers": {...}, "body": "...", "status_code": 200}
+                headers = list(value.get("headers", {}).items())
+                responses[key] = (value.get("body", ""), value.get("status_code", 200), headers)
+            else:
+                # Challenge 14: raw HTML page per site
+                responses[key] = (value, 200, [])
+        return responses
+
+    @staticmethod
+    def _read(path):
+        with open(path, "r", encoding="utf-8") as f:
+            encoded_content = f.read().strip()
+        return json.loads(base64.b64decode(encoded_content).decode("utf-8"))
+
+    def get(self, challenge_id, mode):
+        """Return {key: (body, status, headers)} for a challenge, or None if it has no .server_data."""
+        key = (str(challenge_id), mode)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[2] < self.CHECK_INTERVAL:
+                self.hits += 1
+                return entry[3]
+
+            if entry:
+                path = entry[0]
+            else:
+                challenge_list, _ = load_challenges(mode)
+                challenge = challenge_list.get_challenge_by_id(key[0])
+                if challenge is None:
+                    return None
+                path = os.path.join(challenge.getFolder(), ".server_data")
+
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self._entries.pop(key, None)
+                return None
+            signature = (st.st_mtime_ns, st.st_size)
+
+            if entry and entry[1] == signature:
+                entry[2] = now
+                self.hits += 1
+                return entry[3]
+
+            responses = self._build_responses(self._read(path))
+            self._entries[key] = [path, signature, now, responses]
+            self.loads += 1
+            return responses
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"loads": self.loads, "hits": self.hits, "entries": len(self._entries)}
+
+
+server_data_cache = ServerDataCache()
+
+
+# Markdown extensions used by the hub pages (the build step records these per entry)
+WELCOME_MD_EXTENSIONS = ("fenced_code", "sane_lists", "tables")
+README_MD_EXTENSIONS = ("tables",)
+
+class MarkdownRenderCache:
+    """
+    Rendered HTML for README.md / welcome.md, keyed by (path, extensions) and
+    invalidated by the source file's mtime/size.
+    On a miss we first look in PRERENDERED_FILE (written by build_web_version.py);
+    an entry is only trusted if the sha256 of the current Markdown matches, so a
+    student build never needs to import or run the markdown library.
+    """
+
+    PRERENDERED_FILE = "prerendered_markdown.json"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # (path, extensions) -> (signature, html)
+        self._prerendered = None
+        self.renders = 0
+        self.prerendered_hits = 0
+        self.hits = 0
+
+    def _load_prerendered(self):
+        if self._prerendered is None:
+            path = os.path.join(config.server_dir, self.PRERENDERED_FILE)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._prerendered = json.load(f)
+                print(f"📄 Loaded {len(self._prerendered)} pre-rendered Markdown pages.")
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._prerendered = {}
+        return self._prerendered
+
+    @staticmethod
+    def prerender_key(path, base_dir):
+        """Key used in PRERENDERED_FILE: path relative to the project root, '/' separated."""
+        return os.path.relpath(os.path.abspath(path), base_dir).replace(os.sep, "/")
+
+    @staticmethod
+    def _render(text, extensions):
+        try:
+            import markdown
+        except ImportError:
+            return f"<pre>{html.escape(text)}</pre>"
+        return markdown.markdown(text, extensions=list(extensions))
+
+    def render(self, path, extensions=()):
+        """Return HTML for a Markdown file, or None if the file does not exist."""
+        extensions = tuple(extensions)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        key = (path, extensions)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] == signature:
+                self.hits += 1
+                return cached[1]
+            prerendered = self._load_prerendered()
+
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+
+        entry = prerendered.get(self.prerender_key(path, config.BASE_DIR))
+        if (
+            entry
+            and tuple(entry.get("extensions", ())) == extensions
+            and entry.get("sha256") == hashlib.sha256(text.encode("utf-8")).hexdigest()
+        ):
+            rendered = entry["html"]
+            from_build = True
+        else:
+            rendered = self._render(text, extensions)
+            from_build = False
+
+        with self._lock:
+            self._entries[key] = (signature, rendered)
+            if from_build:
+                self.prerendered_hits += 1
+            else:
+                self.renders += 1
+        return rendered
+
+    def stats(self):
+        with self._lock:
+            return {
+                "renders": self.renders,
+                "prerendered_hits": self.prerendered_hits,
+                "hits": self.hits,
+                "entries": len(self._entries),
+            }
+
+
+markdown_cache = MarkdownRenderCache()
+
+
+FileEntry = namedtuple("FileEntry", ["name", "size", "mtime", "mtime_ns"])
+
+def file_etag(entry):
+    """Strong ETag for a file; regenerating a challenge changes its mtime/size and so its tag."""
+    return f"{entry.mtime_ns:x}-{entry.size:x}"
+
+def stat_file_entry(path):
+    """FileEntry from a fresh stat of path, or None if it is not a regular file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return FileEntry(os.path.basename(path), st.st_size, st.st_mtime, st.st_mtime_ns)
+
+class FolderListingCache:
+    """
+    Regular files (name, size, mtime) directly inside each challenge folder.
+    A listing is rebuilt only when the folder's own mtime changes, so a page view
+    costs one stat instead of a listdir plus one stat per file. Rewriting a file in
+    place does not touch the folder mtime, so downloads stat the file itself.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # folder -> (dir_mtime_ns, {name: FileEntry})
+        self.scans = 0
+        self.hits = 0
+
+    @staticmethod
+    def _scan(folder):
+        files = {}
+        with os.scandir(folder) as it:
+            for d in it:
+                try:
+                    if d.is_file():
+                        st = d.stat()
+                        files[d.name] = FileEntry(d.name, st.st_size, st.st_mtime, st.st_mtime_ns)
+                except OSError:
+                    continue
+        return files
+
+    def get(self, folder):
+        """Return {name: FileEntry} for a folder (raises FileNotFoundError if missing)."""
+        signature = os.stat(folder).st_mtime_ns
+        with self._lock:
+            cached = self._entries.get(folder)
+            if cached and cached[0] == signature:
+                self.hits += 1
+                return cached[1]
+
+        files = self._scan(folder)
+        with self._lock:
+            self._entries[folder] = (signature, files)
+            self.scans += 1
+        return files
+
+    def get_file(self, folder, filename):
+        """
+        Return a fresh FileEntry for a top-level file, or None if it is missing.
+        A changed (mtime_ns, size) also replaces the stale entry in the cached listing.
+        """
+        if os.path.basename(filename) != filename:
+            return None
+        entry = stat_file_entry(os.path.join(folder, filename))
+        if entry is None:
+            return None
+        with self._lock:
+            cached = self._entries.get(folder)
+            if cached and cached[1].get(filename, entry) != entry:
+                # Swap in a new dict so page views iterating the old one are unaffected
+                self._entries[folder] = (cached[0], {**cached[1], filename: entry})
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {"scans": self.scans, "hits": self.hits, "entries": len(self._entries)}
+
+
+folder_cache = FolderListingCache()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+In-memory password-protected ZIP archives (traditional PKWARE "ZipCrypto").
+
+Used by the archive challenges (05_ArchivePassword, 06_Hashcat): the generators
+build secret.zip / partN.zip straight from buffers, and the validators verify and
+extract them without spawning zip/unzip or writing temporary files.
+Archives are readable by unzip, 7z, fcrackzip and zip2john, same as `zip -P`.
+"""
+
+import io
+import random
+import struct
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+__all__ = [
+    "ZipCryptoError",
+    "build_encrypted_zip",
+    "write_encrypted_zip",
+    "read_encrypted_zip",
+    "check_password",
+]
+
+_CRC_TABLE = []
+for _n in range(256):
+    _c = _n
+    for _ in range(8):
+        _c = (_c >> 1) ^ 0xEDB88320 if _c & 1 else _c >> 1
+    _CRC_TABLE.append(_c)
+
+_FLAG_ENCRYPTED = 0x0001
+_VERSION_NEEDED = 20           # 2.0: deflate + traditional encryption
+_VERSION_MADE_BY = (3 << 8) | 30  # Unix, spec 3.0 (matches Info-ZIP)
+_FILE_ATTRS = 0o100644 << 16
+
+
+class ZipCryptoError(ValueError):
+    """Wrong password, corrupt archive, or a missing member."""
+
+
+class _Cipher:
+    """The three-key ZipCrypto stream cipher (APPNOTE 6.1)."""
+
+    def __init__(self, password: bytes):
+        self.k0, self.k1, self.k2 = 0x12345678, 0x23456789, 0x34567890
+        for byte in password:
+            self._update(byte)
+
+    def _update(self, byte):
+        self.k0 = _CRC_TABLE[(self.k0 ^ byte) & 0xFF] ^ (self.k0 >> 8)
+        self.k1 = ((self.k1 + (self.k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        self.k2 = _CRC_TABLE[(self.k2 ^ (self.k1 >> 24)) & 0xFF] ^ (self.k2 >> 8)
+
+    def encrypt(self, data: bytes) -> bytes:
+        out = bytearray(len(data))
+        for i, plain in enumerate(data):
+            temp = (self.k2 | 2) & 0xFFFF
+            out[i] = plain ^ (((temp * (temp ^ 1)) >> 8) & 0xFF)
+            self._update(plain)
+        return bytes(out)
+
+
+def _dos_datetime(date_time):
+    year, month, day, hour, minute, second = date_time[:6]
+    dos_date = ((max(year, 1980) - 1980) << 9) | (month << 5) | day
+    dos_time = (hour << 11) | (minute << 5) | (second // 2)
+    return dos_time, dos_date
+
+
+def _to_bytes(value) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else bytes(value)
+
+
+def build_encrypted_zip(files, password, rng=None, date_time=None) -> bytes:
+    """
+    Return the bytes of a ZipCrypto-encrypted archive.
+    files: {name: bytes|str} or [(name, data), ...], stored flat in that order.
+    rng seeds the 12-byte encryption headers (pass a generator's random.Random for
+    reproducible archives); date_time defaults to the current local time.
+    """
+    rng = rng or random
+    password = _to_bytes(password)
+    dos_time, dos_date = _dos_datetime(date_time or time.localtime())
+    items = files.items() if isinstance(files, dict) else files
+
+    out = io.BytesIO()
+    central = []
+    for name, data in items:
+        name_bytes = name.encode("utf-8")
+        data = _to_bytes(data)
+        crc = zlib.crc32(data)
+
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        packed = compressor.compress(data) + compressor.flush()
+        method = zipfile.ZIP_DEFLATED
+        if len(packed) >= len(data):
+            packed, method = data, zipfile.ZIP_STORED
+
+        # 11 random bytes + CRC high byte, which unzip uses as the password check
+        header = bytes(rng.getrandbits(8) for _ in range(11)) + bytes([crc >> 24])
+        payload = _Cipher(password).encrypt(header + packed)
+
+        offset = out.tell()
+        out.write(struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, _VERSION_NEEDED, _FLAG_ENCRYPTED, method,
+            dos_time, dos_date, crc, len(payload), len(data), len(name_bytes), 0,
+        ))
+        out.write(name_bytes)
+        out.write(payload)
+        central.append(struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, _VERSION_MADE_BY, _VERSION_NEEDED, _FLAG_ENCRYPTED,
+            method, dos_time, dos_date, crc, len(payload), len(data), len(name_bytes),
+            0, 0, 0, 0, _FILE_ATTRS, offset,
+        ) + name_bytes)
+
+    cd_offset = out.tell()
+    for record in central:
+        out.write(record)
+    cd_size = out.tell() - cd_offset
+    out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central), cd_size, cd_offset, 0))
+    return out.getvalue()
+
+
+def write_encrypted_zip(path, files, password, rng=None, date_time=None) -> Path:
+    """Build an archive with build_encrypted_zip() and write it to path in one go."""
+    path = Path(path)
+    path.write_bytes(build_encrypted_zip(files, password, rng=rng, date_time=date_time))
+    return path
+
+
+def _open(source) -> zipfile.ZipFile:
+    data = source if isinstance(source, (bytes, bytearray)) else Path(source).read_bytes()
+    try:
+        return zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile as e:
+        raise ZipCryptoError(f"not a zip archive: {e}") from e
+
+
+def read_encrypted_zip(source, password) -> dict:
+    """
+    Decrypt and CRC-check every member of an archive (path or bytes).
+    Returns {name: bytes}; raises ZipCryptoError on a wrong password or damage.
+    Directory parts of member names are dropped, like `unzip -j`.
+    """
+    password = _to_bytes(password)
+    members = {}
+    with _open(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            try:
+                data = archive.read(info, pwd=password)
+            except (RuntimeError, zipfile.BadZipFile, zlib.error) as e:
+                raise ZipCryptoError(f"{info.filename}: {e}") from e
+            members[Path(info.filename).name] = data
+    return members
+
+
+def check_password(source, password) -> bool:
+    """True if password decrypts every member of the archive."""
+    try:
+        read_encrypted_zip(source, password)
+        return True
+    except ZipCryptoError:
+        return False